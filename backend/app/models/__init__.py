@@ -8,9 +8,10 @@ All model-related functionality should be imported from here.
 from typing import Type, Dict, Any
 
 # Import all model schemas
-from .email_models import EmailSchema, ReaderViewResponse
-from .summary_models import SummarySchema
+from .email_models import BodyPartRef, EmailSchema, ReaderViewResponse, StoredReaderView
+from .summary_models import CachedSummary, SummarySchema
 from .user_models import UserSchema, PreferencesSchema
+from .sync_models import MailboxSyncState
 from .auth_models import (
     TokenData,
     TokenResponse,
@@ -30,16 +31,22 @@ __all__ = [
     'ModelType',
     
     # Email Models
+    'BodyPartRef',
     'EmailSchema',
     'ReaderViewResponse',
+    'StoredReaderView',
     
     # Summary Models
+    'CachedSummary',
     'SummarySchema',
     
     # User Models
     'UserSchema',
     'PreferencesSchema',
     
+    # Sync Models
+    'MailboxSyncState',
+    
     # Auth Models
     'TokenData',
     'TokenResponse',
@@ -8,6 +8,22 @@ from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime, timezone
 from typing import List, Optional, Dict
 
+class BodyPartRef(BaseModel):
+    """
+    Location of the displayable body part of a message on the IMAP server.
+    
+    Stored for emails ingested headers-first so the body can be fetched
+    on demand with ``BODY.PEEK[section]``.
+    """
+    section: str  # IMAP body section, e.g. "1" or "1.2"
+    content_type: str = "text/plain"
+    encoding: str = "7bit"  # Content-Transfer-Encoding
+    charset: str = "utf-8"
+    folder: str = "INBOX"  # Folder the UID belongs to
+    uidvalidity: Optional[int] = None  # UIDVALIDITY of the folder when the UID was seen
+    
+    model_config = ConfigDict(frozen=True)
+
 class EmailSchema(BaseModel):
     """
     Schema for email data storage and retrieval.
@@ -21,6 +37,11 @@ class EmailSchema(BaseModel):
     received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     category: str = "uncategorized"
     is_read: bool = False
+    folder: str = "INBOX"  # IMAP folder the email was synced from
+    body_loaded: bool = True  # False until the body of a headers-only email is fetched
+    body_ref: Optional[BodyPartRef] = None
+    size: Optional[int] = None  # RFC822.SIZE in bytes
+    removed_trackers: List[str] = Field(default_factory=list)  # Hosts of tracking images stripped from the body
     
     model_config = ConfigDict(frozen=True)  # Using new Pydantic v2 syntax for immutability
     
@@ -55,6 +76,15 @@ class EmailResponse(BaseModel):
     has_more: bool
     debug_info: dict
 
+class StoredReaderView(BaseModel):
+    """
+    Reader view of an email, stored in the email's document once computed.
+    """
+    content: str
+    content_type: str  # "html" or "plain", the type of the body it was converted from
+    original_length: int
+    version: int  # Converter version it was computed with; outdated versions are recomputed
+
 class ReaderViewResponse(BaseModel):
     """Response model for reader view endpoint"""
     email_id: str
@@ -37,4 +37,21 @@ class SummarySchema(BaseModel):
         Returns:
             Dict: Dictionary representation of this summary
         """
-        return self.model_dump()  # Using Pydantic v2 method
\ No newline at end of file
+        return self.model_dump()  # Using Pydantic v2 method
+
+class CachedSummary(BaseModel):
+    """
+    Summary of an email body, shared by every email with the same content.
+
+    Entries are keyed by a hash of the normalized body, the prompt version
+    and the model, so a newsletter sent to many users is summarized once.
+    They hold no user data and expire when they have not been used for a while.
+    """
+    content_hash: str
+    summary_text: str
+    keywords: List[str]
+    model_info: Optional[Dict[str, str]] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_used_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Expiry is counted from here
+
+    model_config = ConfigDict(frozen=True)
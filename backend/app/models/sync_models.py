@@ -0,0 +1,28 @@
+"""
+Mailbox synchronization models for Email Essence.
+
+This module defines the Pydantic models used to track IMAP sync progress.
+"""
+
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime, timezone
+from typing import Optional
+
+class MailboxSyncState(BaseModel):
+    """
+    High-water marks for incremental IMAP sync of one folder.
+
+    A stored state is only valid while the server's UIDVALIDITY for the
+    folder is unchanged; any change means previously seen UIDs may have
+    been reassigned and the folder must be fully resynced. On servers with
+    CONDSTORE the folder's HIGHESTMODSEQ is kept as well so that flag changes
+    can be synced as deltas.
+    """
+    google_id: str  # Google User ID for consistent user identification
+    folder: str = "INBOX"
+    uidvalidity: int
+    last_uid: int = 0  # Highest UID already ingested
+    highest_modseq: Optional[int] = None  # CONDSTORE mod-sequence of the last flag sync
+    last_synced_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = ConfigDict(frozen=True)
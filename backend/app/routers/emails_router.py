@@ -17,7 +17,7 @@ from app.dependencies import get_current_user
 from app.utils.helpers import get_logger, log_operation, standardize_error_response
 from app.models.email_models import EmailResponse, EmailSchema, ReaderViewResponse
 from app.models.user_models import UserSchema
-from app.services.database.factories import get_email_service
+from app.services.database.factories import get_email_service, get_mailbox_sync_scheduler
 from app.services.email_service import EmailService
 
 # -------------------------------------------------------------------------
@@ -42,6 +42,7 @@ async def retrieve_emails(
     limit: int = Query(default=20, ge=1, le=100, description="Maximum number of emails to return"),
     unread_only: bool = Query(default=False, description="Filter for unread emails only"),
     category: Optional[str] = Query(default=None, description="Filter by email category"),
+    folder: Optional[str] = Query(default=None, description="Filter by the IMAP folder the email was synced from"),
     search: Optional[str] = Query(default=None, description="Search in subject and body"),
     sort_by: str = Query(default="received_at", enum=["received_at", "sender", "subject"]),
     sort_order: str = Query(default="desc", enum=["asc", "desc"]),
@@ -53,13 +54,16 @@ async def retrieve_emails(
     Retrieve emails with filtering, sorting, and pagination options.
     
     This endpoint serves as the main method for fetching emails from the system.
-    It can optionally refresh from IMAP first before returning results.
+    It can optionally refresh from IMAP first before returning results. While
+    the background mailbox sync is running, a refresh only asks it to sync the
+    user's mailbox soon and the stored emails are returned right away.
     
     Args:
         skip: Number of emails to skip (for pagination)
         limit: Maximum number of emails to return
         unread_only: Whether to only return unread emails
         category: Filter emails by category
+        folder: Filter emails by IMAP folder
         search: Search term to filter emails by subject and body
         sort_by: Field to sort results by
         sort_order: Direction to sort results
@@ -79,6 +83,7 @@ async def retrieve_emails(
             "limit": limit,
             "unread_only": unread_only,
             "category": category,
+            "folder": folder,
             "search": search,
             "sort_by": sort_by,
             "sort_order": sort_order,
@@ -91,6 +96,12 @@ async def retrieve_emails(
         log_operation(logger, 'debug', f"Email retrieval request with refresh={refresh}", extra={"params": debug_info["request_params"]})
         log_operation(logger, 'debug', f"Google ID for email retrieval: {user.google_id}")
         
+        scheduler = get_mailbox_sync_scheduler()
+        if refresh and scheduler.running:
+            scheduler.request_sync(user.google_id)
+            debug_info["sync_requested"] = True
+            refresh = False
+        
         emails, total, service_debug_info = await email_service.fetch_emails(
             google_id=user.google_id,
             skip=skip,
@@ -100,7 +111,8 @@ async def retrieve_emails(
             search=search,
             sort_by=sort_by,
             sort_order=sort_order,
-            refresh=refresh
+            refresh=refresh,
+            folder=folder
         )
         
         # Combine debug info
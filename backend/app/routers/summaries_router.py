@@ -11,7 +11,7 @@ import logging
 from typing import List
 
 # Third-party imports
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, status
 
 # Internal imports
 from app.dependencies import get_current_user
@@ -127,6 +127,56 @@ async def get_summaries_by_ids(
     except Exception as e:
         raise standardize_error_response(e, "retrieve/generate summaries by IDs")
 
+@router.post(
+    "/backfill",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Backfill summaries offline",
+    description="Summarizes emails through the provider's Batch API; summaries are stored as the job completes, within a day"
+)
+async def backfill_summaries(
+    background_tasks: BackgroundTasks,
+    ids: List[str] = Query(..., description="List of email IDs to summarize"),
+    summarizer: AdaptiveSummarizer[EmailSchema] = Depends(get_summarizer),
+    summary_service: SummaryService = Depends(get_summary_service),
+    user: UserSchema = Depends(get_current_user)
+):
+    """
+    Summarize a backlog of emails without interactive latency.
+    
+    The emails without a summary are submitted as one Batch API job, which
+    is cheaper and does not use the quota of interactive requests. The job
+    runs after the response is sent; its summaries are stored as usual.
+    
+    Args:
+        background_tasks: Tasks run after the response is sent
+        ids: List of email IDs to summarize
+        summarizer: The summarizer implementation to use
+        summary_service: The summary service for data operations
+        user: Current authenticated user
+        
+    Returns:
+        dict: Number of emails submitted
+    """
+    async def _backfill() -> None:
+        try:
+            result = await summary_service.get_or_create_summaries_batch(
+                ids,
+                summarizer,
+                user.google_id,
+                batch_size=len(ids),
+                strategy=ProcessingStrategy.OFFLINE
+            )
+            log_operation(logger, 'info', f"Backfill for user {user.google_id}: "
+                f"{len(result['summaries'])} summaries, "
+                f"{len(result['missing_emails'])} missing, "
+                f"{len(result['failed_summaries'])} failed"
+            )
+        except Exception as e:
+            log_operation(logger, 'error', f"Backfill for user {user.google_id} failed: {e}")
+    
+    background_tasks.add_task(_backfill)
+    return {"status": "accepted", "count": len(ids)}
+
 @router.get(
     "/", 
     response_model=List[SummarySchema],
@@ -183,7 +233,7 @@ async def get_summaries(
             # Fetch emails using the proper instanced service
             email_service = get_email_service()
             emails_data, _, _ = await email_service.fetch_emails(google_id=user.google_id)
-            emails = [EmailSchema(**email_dict) for email_dict in emails_data]
+            emails = [EmailSchema.model_validate(email_data) for email_data in emails_data]
             
             if not emails:
                 return []
@@ -214,6 +264,10 @@ async def get_summaries(
                 else:
                     return existing_summaries
             
+            # Emails ingested headers-only need their body before they can be summarized;
+            # ones whose body can't be loaded right now are left for a later request
+            emails = [email for email in await email_service.load_email_bodies(emails) if email.body_loaded]
+            
             # Generate new summaries for emails that need them
             new_summaries = await summarizer.summarize(
                 emails,
@@ -11,12 +11,15 @@ from typing import Type, Dict, Any
 from .auth_service import AuthService
 from .email_service import EmailService
 from .user_service import UserService
+from .idle_listener import MailboxIdleListener
+from .sync_scheduler import MailboxSyncScheduler
 from .summarization import (
     SummaryService,
     OpenAIEmailSummarizer,
     GeminiEmailSummarizer,
     ProcessingStrategy,
-    get_summarizer
+    get_summarizer,
+    close_summarizers
 )
 
 # Define base service type
@@ -31,11 +34,14 @@ __all__ = [
     'EmailService',
     'AuthService',
     'UserService',
+    'MailboxIdleListener',
+    'MailboxSyncScheduler',
     'SummaryService',
     
     # Summarization
     'OpenAIEmailSummarizer',
     'GeminiEmailSummarizer',
     'ProcessingStrategy',
-    'get_summarizer'
+    'get_summarizer',
+    'close_summarizers'
 ]
\ No newline at end of file
@@ -12,15 +12,21 @@ from motor.motor_asyncio import AsyncIOMotorCollection
 
 from .connection import DatabaseConnection
 from .repositories.base_repository import BaseRepository
-from .repositories.email_repository import EmailRepository
+from .repositories.email_repository import BulkInsertResult, EmailRepository
 from .repositories.user_repository import UserRepository
 from .repositories.token_repository import TokenRepository
 from .repositories.summary_repository import SummaryRepository
+from .repositories.sync_state_repository import SyncStateRepository
+from .repositories.summary_cache_repository import SummaryCacheRepository
+from .repositories.rate_limit_repository import RateLimitRepository
 from .factories import (
     get_email_repository,
     get_user_repository,
     get_summary_repository,
-    get_token_repository
+    get_summary_cache_repository,
+    get_rate_limit_repository,
+    get_token_repository,
+    get_sync_state_repository
 )
 
 # Define available repository types
@@ -39,14 +45,21 @@ __all__ = [
     'RepositoryTypes',
     
     # Repositories
+    'BulkInsertResult',
     'EmailRepository',
     'UserRepository',
     'TokenRepository',
     'SummaryRepository',
+    'SyncStateRepository',
+    'SummaryCacheRepository',
+    'RateLimitRepository',
     
     # Factory functions
     'get_email_repository',
     'get_user_repository',
     'get_summary_repository',
-    'get_token_repository'
+    'get_summary_cache_repository',
+    'get_rate_limit_repository',
+    'get_token_repository',
+    'get_sync_state_repository'
 ] 
\ No newline at end of file
@@ -11,6 +11,10 @@ from app.services.database.repositories.email_repository import EmailRepository
 from app.services.database.repositories.user_repository import UserRepository
 from app.services.database.repositories.token_repository import TokenRepository
 from app.services.database.repositories.summary_repository import SummaryRepository
+from app.services.database.repositories.sync_state_repository import SyncStateRepository
+from app.services.database.repositories.summary_cache_repository import SummaryCacheRepository
+from app.services.database.repositories.rate_limit_repository import RateLimitRepository
+from app.utils.config import get_settings
 
 @lru_cache()
 def get_email_repository() -> EmailRepository:
@@ -56,6 +60,39 @@ def get_summary_repository() -> SummaryRepository:
     repo = SummaryRepository(instance.db.summaries)
     return repo
 
+@lru_cache()
+def get_summary_cache_repository() -> SummaryCacheRepository:
+    """
+    Get a cached instance of SummaryCacheRepository.
+    
+    Returns:
+        SummaryCacheRepository: Cached repository instance
+    """
+    repo = SummaryCacheRepository(instance.db.summary_cache, ttl_seconds=get_settings().summary_cache_ttl)
+    return repo
+
+@lru_cache()
+def get_rate_limit_repository() -> RateLimitRepository:
+    """
+    Get a cached instance of RateLimitRepository.
+    
+    Returns:
+        RateLimitRepository: Cached repository instance
+    """
+    repo = RateLimitRepository(instance.db.rate_limits)
+    return repo
+
+@lru_cache()
+def get_sync_state_repository() -> SyncStateRepository:
+    """
+    Get a cached instance of SyncStateRepository.
+    
+    Returns:
+        SyncStateRepository: Cached repository instance
+    """
+    repo = SyncStateRepository(instance.db.sync_state)
+    return repo
+
 @lru_cache()
 def get_auth_service() -> 'AuthService': # type: ignore
     """
@@ -90,7 +127,24 @@ def get_email_service() -> 'EmailService': # type: ignore
         EmailService: Cached service instance
     """
     from app.services.email_service import EmailService
-    return EmailService(email_repository=get_email_repository())
+    return EmailService(
+        email_repository=get_email_repository(),
+        sync_state_repository=get_sync_state_repository()
+    )
+
+@lru_cache()
+def get_mailbox_sync_scheduler() -> 'MailboxSyncScheduler': # type: ignore
+    """
+    Get a cached instance of MailboxSyncScheduler.
+    
+    Returns:
+        MailboxSyncScheduler: Cached scheduler instance
+    """
+    from app.services.sync_scheduler import MailboxSyncScheduler
+    return MailboxSyncScheduler(
+        email_service=get_email_service(),
+        user_repository=get_user_repository()
+    )
 
 @lru_cache()
 def get_summary_service() -> 'SummaryService': # type: ignore
@@ -114,12 +168,16 @@ async def setup_all_repositories():
         user_repo = get_user_repository()
         token_repo = get_token_repository()
         summary_repo = get_summary_repository()
+        summary_cache_repo = get_summary_cache_repository()
+        sync_state_repo = get_sync_state_repository()
         
         # Setup indexes for all repositories
         await email_repo.setup_indexes()
         await user_repo.setup_indexes()
         await token_repo.setup_indexes()
         await summary_repo.setup_indexes()
+        await summary_cache_repo.setup_indexes()
+        await sync_state_repo.setup_indexes()
         
         return True
     except Exception as e:
@@ -70,10 +70,40 @@ class ISummaryRepository(IRepository):
     async def find_by_email_id(self, email_id: str) -> Optional[BaseModel]:
         pass
 
+class ISummaryCacheRepository(IRepository):
+    """Content-addressed summary cache repository interface"""
+    @abstractmethod
+    async def find_by_hashes(self, content_hashes: List[str]) -> Dict[str, BaseModel]:
+        pass
+
+    @abstractmethod
+    async def save_many(self, entries: List[BaseModel]) -> None:
+        pass
+
+class IRateLimitRepository(ABC):
+    """Rate limit bucket store interface"""
+    @abstractmethod
+    async def reserve(self, key: str, requests: int, tokens: int, rpm: int, tpm: int) -> float:
+        pass
+
+    @abstractmethod
+    async def adjust(self, key: str, tokens: int, tpm: int) -> None:
+        pass
+
 class ITokenRepository(IRepository):
     """Token repository interface"""
     @abstractmethod
     async def find_by_token(self, token: str) -> Optional[BaseModel]:
         pass
 
+class ISyncStateRepository(IRepository):
+    """Mailbox sync state repository interface"""
+    @abstractmethod
+    async def find_state(self, google_id: str, folder: str) -> Optional[BaseModel]:
+        pass
+
+    @abstractmethod
+    async def save_state(self, state: BaseModel) -> bool:
+        pass
+
     
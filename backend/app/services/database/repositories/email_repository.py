@@ -2,14 +2,23 @@
 Repository for managing emails in MongoDB.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorCollection
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from pymongo.operations import UpdateOne
 
 from app.models.email_models import EmailSchema
 from app.services.database.repositories.base_repository import BaseRepository
 from app.services.database.interfaces import IEmailRepository
 
+DUPLICATE_KEY_ERROR = 11000
+
+class BulkInsertResult(NamedTuple):
+    """Outcome of inserting a batch of emails that may already be stored."""
+    inserted: int
+    skipped: int
+
 class EmailRepository(BaseRepository[EmailSchema], IEmailRepository):
     """
     Repository for managing emails in MongoDB.
@@ -31,9 +40,46 @@ class EmailRepository(BaseRepository[EmailSchema], IEmailRepository):
     async def setup_indexes(self):
         await self.collection.create_index("google_id")
         await self.collection.create_index([("email_id", 1), ("google_id", 1)], unique=True)
+        await self.collection.create_index([("google_id", 1), ("folder", 1)])
         await self.collection.create_index("thread_id")
         await self.collection.create_index("is_read")
     
+    async def insert_many_if_absent(self, emails: List[EmailSchema]) -> BulkInsertResult:
+        """
+        Insert emails that are not stored yet, in a single unordered bulk write.
+        
+        Each email is an upsert on (email_id, google_id) that only sets fields on
+        insert, so emails that already exist are left untouched. This is safe
+        under concurrent refreshes of the same mailbox: a racing upsert that
+        loses on the unique index counts as skipped.
+        
+        Args:
+            emails: Emails to store
+            
+        Returns:
+            BulkInsertResult: Number of emails inserted and skipped
+        """
+        if not emails:
+            return BulkInsertResult(0, 0)
+        
+        operations = []
+        for email in emails:
+            document = self._to_document(email)
+            operations.append(UpdateOne(
+                {"email_id": document["email_id"], "google_id": document["google_id"]},
+                {"$setOnInsert": document},
+                upsert=True
+            ))
+        
+        try:
+            result = await self._get_collection().bulk_write(operations, ordered=False)
+            inserted = result.upserted_count
+        except BulkWriteError as e:
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+            inserted = e.details.get("nUpserted", 0)
+        return BulkInsertResult(inserted, len(emails) - inserted)
+    
     async def find_by_google_id(self, google_id: str, limit: int = 100) -> List[EmailSchema]:
         """
         Find emails by Google user ID.
@@ -60,6 +106,22 @@ class EmailRepository(BaseRepository[EmailSchema], IEmailRepository):
         """
         return await self.find_one({"email_id": email_id, "google_id": google_id})
     
+    async def find_reader_view(self, email_id: str, google_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the subject and stored reader view of an email, without its body.
+        
+        Args:
+            email_id: IMAP UID of the email
+            google_id: Google ID of the user
+            
+        Returns:
+            Optional[Dict[str, Any]]: email_id, subject and reader_view (if stored), None if not found
+        """
+        return await self._get_collection().find_one(
+            {"email_id": email_id, "google_id": google_id},
+            {"_id": 0, "email_id": 1, "subject": 1, "reader_view": 1}
+        )
+    
     async def update_by_email_and_google_id(
         self, 
         email_id: str, 
@@ -107,6 +169,77 @@ class EmailRepository(BaseRepository[EmailSchema], IEmailRepository):
         """
         return await self.delete_one({"email_id": email_id, "google_id": google_id})
 
+    async def delete_by_email_ids(self, email_ids: List[str], google_id: str) -> bool:
+        """
+        Delete several emails of a user in a single command.
+        
+        Args:
+            email_ids: IMAP UIDs of the emails
+            google_id: Google ID of the user
+            
+        Returns:
+            bool: True if any email was deleted
+        """
+        if not email_ids:
+            return False
+        return await self.delete_many({"email_id": {"$in": email_ids}, "google_id": google_id})
+
+    @staticmethod
+    def folder_filter(folder: str) -> Any:
+        """Build the query condition on the ``folder`` field matching one IMAP folder."""
+        # Emails stored before the folder was recorded were all synced from INBOX
+        return {"$in": [folder, None]} if folder == "INBOX" else folder
+
+    def _folder_query(self, google_id: str, folder: str) -> Dict[str, Any]:
+        """Build a query for a user's emails synced from one IMAP folder."""
+        return {"google_id": google_id, "folder": self.folder_filter(folder)}
+
+    async def find_email_ids_by_folder(self, google_id: str, folder: str) -> List[str]:
+        """
+        Find the IDs of a user's emails synced from one IMAP folder.
+        
+        Args:
+            google_id: Google ID of the user
+            folder: IMAP folder name
+            
+        Returns:
+            List[str]: Email IDs
+        """
+        return await self._get_collection().distinct("email_id", self._folder_query(google_id, folder))
+
+    async def delete_by_folder(self, google_id: str, folder: str) -> bool:
+        """
+        Delete a user's emails synced from one IMAP folder.
+        
+        Args:
+            google_id: Google ID of the user
+            folder: IMAP folder name
+            
+        Returns:
+            bool: True if any email was deleted
+        """
+        return await self.delete_many(self._folder_query(google_id, folder))
+
+    async def bulk_update_read_state(self, read_states: Dict[str, bool], google_id: str) -> int:
+        """
+        Set the read state of several emails of a user in one bulk write.
+        
+        Args:
+            read_states: Mapping of IMAP UID to is_read value
+            google_id: Google ID of the user
+            
+        Returns:
+            int: Number of emails whose read state changed
+        """
+        result = await self.bulk_write([
+            {
+                "filter": {"email_id": email_id, "google_id": google_id},
+                "update": {"is_read": is_read}
+            }
+            for email_id, is_read in read_states.items()
+        ])
+        return result.modified_count if result else 0
+
     async def find_by_thread_id(self, thread_id: str) -> List[EmailSchema]:
         """
         Find emails by thread ID.
@@ -0,0 +1,79 @@
+"""
+Repository for LLM provider rate limit buckets in MongoDB.
+"""
+
+import time
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.services.database.interfaces import IRateLimitRepository
+
+# A bucket holds a minute of its budget, so a full minute's requests may be sent at once
+BURST_SECONDS = 60.0
+
+def bucket_seconds(amount: int, per_minute: int) -> float:
+    """Seconds of a per-minute budget taken by an amount; 0 for disabled limits."""
+    return amount * 60.0 / per_minute if per_minute > 0 else 0.0
+
+class RateLimitRepository(IRateLimitRepository):
+    """
+    Repository for request and token buckets shared by all workers.
+
+    Each bucket is stored as the time at which everything reserved from it
+    has been paid back (a virtual scheduling time). A reservation moves it
+    forward by the reserved share of a minute, and the caller waits for as
+    long as it ends up more than BURST_SECONDS ahead of now. Both buckets of
+    a key are updated in one atomic update, so concurrent workers never
+    hand out the same budget twice.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        """
+        Initialize the rate limit repository.
+
+        Args:
+            collection: MongoDB collection instance
+        """
+        self.collection = collection
+
+    async def reserve(self, key: str, requests: int, tokens: int, rpm: int, tpm: int) -> float:
+        """
+        Reserve requests and tokens from the buckets of a key.
+
+        Args:
+            key: Bucket key, e.g. the provider
+            requests: Requests to reserve
+            tokens: Tokens to reserve
+            rpm: Requests per minute of the key; 0 disables the request bucket
+            tpm: Tokens per minute of the key; 0 disables the token bucket
+
+        Returns:
+            float: Seconds to wait before sending the reserved requests
+        """
+        now = time.time()
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [{"$set": {
+                "requests_at": {"$add": [{"$max": ["$requests_at", now]}, bucket_seconds(requests, rpm)]},
+                "tokens_at": {"$add": [{"$max": ["$tokens_at", now]}, bucket_seconds(tokens, tpm)]},
+            }}],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return max(0.0, max(doc["requests_at"], doc["tokens_at"]) - now - BURST_SECONDS)
+
+    async def adjust(self, key: str, tokens: int, tpm: int) -> None:
+        """
+        Take extra tokens from, or return unused tokens to, the token bucket of a key.
+
+        Args:
+            key: Bucket key
+            tokens: Tokens to take; negative to return them
+            tpm: Tokens per minute of the key
+        """
+        if not tokens or tpm <= 0:
+            return
+        await self.collection.update_one(
+            {"_id": key},
+            {"$inc": {"tokens_at": bucket_seconds(tokens, tpm)}}
+        )
@@ -0,0 +1,74 @@
+"""
+Repository for the content-addressed summary cache in MongoDB.
+"""
+
+from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.models.summary_models import CachedSummary
+from app.services.database.repositories.base_repository import BaseRepository
+from app.services.database.interfaces import ISummaryCacheRepository
+
+# Hits refresh last_used_at at most this often, so popular entries are not rewritten on every read
+_TOUCH_INTERVAL = timedelta(hours=1)
+
+class SummaryCacheRepository(BaseRepository[CachedSummary], ISummaryCacheRepository):
+    """
+    Repository for summaries shared across emails with the same content.
+
+    One document is stored per content hash. A TTL index on last_used_at
+    removes entries that have not been used within ttl_seconds, so the
+    least recently used summaries are evicted first.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, ttl_seconds: int):
+        """
+        Initialize the summary cache repository.
+
+        Args:
+            collection: MongoDB collection instance
+            ttl_seconds: Seconds an entry is kept after it was last used
+        """
+        super().__init__(collection, CachedSummary)
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    async def setup_indexes(self):
+        """Create indexes for the summary cache collection."""
+        await self.collection.create_index("content_hash", unique=True)
+        await self.collection.create_index("last_used_at", expireAfterSeconds=self.ttl_seconds)
+
+    async def find_by_hashes(self, content_hashes: List[str]) -> Dict[str, CachedSummary]:
+        """
+        Find the cached summaries of several content hashes and mark them as used.
+
+        Args:
+            content_hashes: Content hashes to look up
+
+        Returns:
+            Dict[str, CachedSummary]: Cached summaries by content hash, for the hashes found
+        """
+        if not content_hashes:
+            return {}
+        cursor = self.collection.find({"content_hash": {"$in": content_hashes}}, {"_id": 0})
+        found = {doc["content_hash"]: self._to_model(doc) for doc in await cursor.to_list(length=len(content_hashes))}
+        if found:
+            now = datetime.now(timezone.utc)
+            await self.collection.update_many(
+                {"content_hash": {"$in": list(found)}, "last_used_at": {"$lt": now - _TOUCH_INTERVAL}},
+                {"$set": {"last_used_at": now}}
+            )
+        return found
+
+    async def save_many(self, entries: List[CachedSummary]) -> None:
+        """
+        Insert or replace cached summaries.
+
+        Args:
+            entries: Cached summaries to store
+        """
+        await self.bulk_write([
+            {"filter": {"content_hash": entry.content_hash}, "update": entry.model_dump(), "upsert": True}
+            for entry in entries
+        ])
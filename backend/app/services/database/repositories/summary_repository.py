@@ -95,6 +95,21 @@ class SummaryRepository(BaseRepository[SummarySchema], ISummaryRepository):
         """
         return await self.delete_one({"email_id": email_id, "google_id": google_id})
     
+    async def delete_by_email_ids(self, email_ids: List[str], google_id: str) -> bool:
+        """
+        Delete the summaries of several emails of a user.
+        
+        Args:
+            email_ids: IDs of the emails
+            google_id: Google ID of the user
+            
+        Returns:
+            bool: True if any summary was deleted
+        """
+        if not email_ids:
+            return False
+        return await self.delete_many({"email_id": {"$in": email_ids}, "google_id": google_id})
+    
     async def delete_by_google_id(self, google_id):
         """
         Delete all summaries attached to given Google user ID.
@@ -0,0 +1,73 @@
+"""
+Repository for managing IMAP sync state in MongoDB.
+"""
+
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.models.sync_models import MailboxSyncState
+from app.services.database.repositories.base_repository import BaseRepository
+from app.services.database.interfaces import ISyncStateRepository
+
+class SyncStateRepository(BaseRepository[MailboxSyncState], ISyncStateRepository):
+    """
+    Repository for managing per-folder IMAP sync state in MongoDB.
+
+    One document is stored per (google_id, folder) pair holding the
+    UIDVALIDITY and last-synced UID used for incremental refreshes.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        """
+        Initialize the sync state repository.
+
+        Args:
+            collection: MongoDB collection instance
+        """
+        super().__init__(collection, MailboxSyncState)
+        self.collection = collection
+
+    async def setup_indexes(self):
+        """Create indexes for the sync state collection."""
+        await self.collection.create_index([("google_id", 1), ("folder", 1)], unique=True)
+
+    async def find_state(self, google_id: str, folder: str) -> Optional[MailboxSyncState]:
+        """
+        Find the sync state for a user's folder.
+
+        Args:
+            google_id: Google ID of the user
+            folder: IMAP folder name
+
+        Returns:
+            Optional[MailboxSyncState]: Sync state if the folder was synced before, None otherwise
+        """
+        return await self.find_one({"google_id": google_id, "folder": folder})
+
+    async def save_state(self, state: MailboxSyncState) -> bool:
+        """
+        Insert or replace the sync state for a user's folder.
+
+        Args:
+            state: Sync state to store
+
+        Returns:
+            bool: True if the state was written
+        """
+        return await self.update_one(
+            {"google_id": state.google_id, "folder": state.folder},
+            state.model_dump(),
+            upsert=True
+        )
+
+    async def delete_by_google_id(self, google_id: str) -> bool:
+        """
+        Delete the sync state of every folder for a user.
+
+        Args:
+            google_id: Google ID of the user
+
+        Returns:
+            bool: True if deletion successful
+        """
+        return await self.delete_many({"google_id": google_id})
@@ -50,6 +50,19 @@ class UserRepository(BaseRepository[UserSchema], IUserRepository):
             return UserSchema(**doc)
         return None
     
+    async def find_fetch_frequencies(self) -> Dict[str, str]:
+        """
+        Find the fetch_frequency preference of every user.
+        
+        Returns:
+            Dict[str, str]: Mapping of Google ID to fetch_frequency, None where unset
+        """
+        cursor = self._get_collection().find({}, {"_id": 0, "google_id": 1, "preferences.fetch_frequency": 1})
+        return {
+            doc["google_id"]: (doc.get("preferences") or {}).get("fetch_frequency")
+            async for doc in cursor
+        }
+    
     async def find_by_email(self, email: str) -> Optional[UserSchema]:
         """
         Find a user by email.
@@ -3,26 +3,50 @@ Email service for handling email-related operations.
 """
 
 # Standard library imports
+import asyncio
+import base64
+import binascii
 import email
+import multiprocessing
 import os
+import quopri
 import re
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from email.header import decode_header
-from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, ContextManager, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 # Third-party imports
 from fastapi import HTTPException, status
 from google.auth.transport.requests import Request
 from imapclient import IMAPClient
+from imapclient.exceptions import IMAPClientAbortError
+from imapclient.response_parser import parse_fetch_response
 from starlette.concurrency import run_in_threadpool
 
 # Internal imports
 from app.utils.helpers import get_logger, log_operation, standardize_error_response
-from app.models import EmailSchema, ReaderViewResponse
+from app.models import BodyPartRef, EmailSchema, MailboxSyncState, ReaderViewResponse, StoredReaderView
 from app.services import auth_service
-from app.services.database import EmailRepository, get_email_repository
-from app.services.database.factories import get_auth_service, get_user_service
-from app.utils.config import get_settings
+from app.services.database import (
+    BulkInsertResult,
+    EmailRepository,
+    SyncStateRepository,
+    get_email_repository,
+    get_sync_state_repository,
+)
+from app.services.html_text import HTML_TAG, html_to_reader_text
+from app.services.tracker_blocklist import TrackerBlocklist, get_tracker_blocklist
+from app.services.imap import AsyncIMAPClient, AsyncIMAPConnectionPool, IMAPConnectionPool, StageQueue, run_pipeline
+from app.services.database.factories import (
+    get_auth_service,
+    get_summary_repository,
+    get_user_service,
+)
+from app.utils.config import IMAPTransport, get_settings
 
 # -------------------------------------------------------------------------
 # Configuration
@@ -31,6 +55,50 @@ from app.utils.config import get_settings
 logger = get_logger(__name__, 'service')
 settings = get_settings()
 
+# Version of the reader view conversion; bump it whenever html_to_reader_text or
+# _clean_plaintext_for_reading change, so stored reader views are recomputed on their next view
+READER_VIEW_VERSION = 2
+
+
+# HTML sanitization: a script/style block, or any other tag (group 1)
+_SANITIZE_TOKENS = re.compile(r'<script[^>]*>.*?</script>|(<[^<>]*>)', re.DOTALL)
+_READER_VIEW_TOKENS = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|(<[^<>]*>)', re.DOTALL)
+_EVENT_HANDLER = re.compile(r' on\w+=(?:"[^"]*"|\'[^\']*\')')
+_JAVASCRIPT_URL = re.compile(r'(\s(?:href|src|action)=["\'])javascript:[^"\']*(?=["\'])', re.IGNORECASE)
+_INLINE_STYLE = re.compile(r' style=["\'][^"\']*["\']')
+# Matched against the lowercased tag, which is much faster than re.IGNORECASE
+_PIXEL_WIDTH = re.compile(r'width=["\']?1')
+_PIXEL_HEIGHT = re.compile(r'height=["\']?1')
+_IMAGE_HOST = re.compile(r'src=["\']?(?:https?:)?//([^/"\'?#:\s>]+)')
+# Tracking subdomains of senders' own domains, which no blocklist can enumerate
+_TRACKING_URL = re.compile(
+    r'src=["\']https?://[^"\']*(?:track|pixel|analytics|beacon|tracker|metrics|telemetry|logger)\.[^"\']*["\']'
+)
+
+@dataclass
+class MailboxSyncResult:
+    """Outcome of syncing one IMAP folder."""
+    emails: List[dict]
+    state: MailboxSyncState
+    full_resync: bool
+    read_states: Dict[int, bool] = field(default_factory=dict)  # UID -> is_read for changed flags
+    vanished_uids: List[int] = field(default_factory=list)
+    email_count: int = 0  # New emails ingested; ``emails`` stays empty when they were streamed to the database
+
+@dataclass
+class ParsedBody:
+    """Displayable body of a message, decoded and sanitized exactly once."""
+    content: str
+    is_html: bool
+    removed_trackers: List[str] = field(default_factory=list)  # Hosts of tracking images stripped from the content
+
+@dataclass
+class FetchedChunk:
+    """Raw FETCH data of one chunk of messages, handed from the fetch to the parse stage."""
+    full_resync: bool
+    uidvalidity: int
+    messages: List[Tuple[int, dict]]
+
 class EmailService:
     """
     Service for handling all email-related operations.
@@ -39,16 +107,63 @@ class EmailService:
     processing, and storage operations.
     """
     
-    def __init__(self, email_repository: EmailRepository = None):
+    def __init__(self, email_repository: EmailRepository = None,
+                 sync_state_repository: SyncStateRepository = None,
+                 connection_pool: IMAPConnectionPool = None,
+                 async_connection_pool: AsyncIMAPConnectionPool = None):
         """
         Initialize the email service.
         
         Args:
             email_repository: Email repository instance
+            sync_state_repository: IMAP sync state repository instance
+            connection_pool: Pool of authenticated IMAP connections
+            async_connection_pool: Pool of authenticated asyncio IMAP connections
         """
         self.email_repository = email_repository or get_email_repository()
-        self.imap_host = 'imap.gmail.com'
+        self.sync_state_repository = sync_state_repository or get_sync_state_repository()
+        self.imap_host = settings.imap_host
+        self.imap_port = settings.imap_port
+        self.imap_ssl = settings.imap_ssl
+        self.use_async_imap = settings.imap_transport == IMAPTransport.ASYNCIO
         self.default_email_account = os.environ.get("EMAIL_ACCOUNT")
+        self.fetch_chunk_size = max(1, settings.imap_fetch_chunk_size)
+        self.headers_only = settings.imap_headers_only
+        self.sync_folders = list(settings.imap_sync_folders) or ['INBOX']
+        # Each concurrently synced folder holds a pooled connection, so stay within the pool's cap
+        self.folder_concurrency = max(1, min(settings.imap_folder_concurrency, settings.imap_pool_max_per_account))
+        self._account_folder_slots: Dict[str, asyncio.Semaphore] = {}
+        self.pipeline_depth = settings.imap_pipeline_depth
+        self.parse_processes = max(0, settings.imap_parse_processes)
+        self.parse_task_size = max(1, settings.imap_parse_task_size)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.tracker_blocklist = get_tracker_blocklist()
+        # CONDSTORE/QRESYNC can only be enabled before a folder is selected, so it is
+        # done once per connection at login and remembered here for pooled reuse
+        self._modseq_extensions: "weakref.WeakKeyDictionary[Any, Optional[str]]" = weakref.WeakKeyDictionary()
+        self.connection_pool = connection_pool or IMAPConnectionPool(
+            self._open_imap_connection,
+            max_per_account=settings.imap_pool_max_per_account,
+            idle_timeout=settings.imap_pool_idle_timeout
+        )
+        self.async_connection_pool = async_connection_pool or AsyncIMAPConnectionPool(
+            self._open_async_imap_connection,
+            max_per_account=settings.imap_pool_max_per_account,
+            idle_timeout=settings.imap_pool_idle_timeout
+        )
+    
+    @classmethod
+    def parser(cls, headers_only: bool = False) -> "EmailService":
+        """
+        Create an instance that can only parse FETCH data.
+        
+        Used in parse worker processes, which have no database or IMAP
+        connections; only the settings the parsing methods read are set.
+        """
+        parser = cls.__new__(cls)
+        parser.headers_only = headers_only
+        parser.tracker_blocklist = get_tracker_blocklist()
+        return parser
     
     # -------------------------------------------------------------------------
     # Helper Methods
@@ -64,15 +179,47 @@ class EmailService:
         """Standardize error handling for email operations."""
         raise standardize_error_response(error, operation, email_id, google_id)
     
-    def _get_imap_connection(self, token: str, email_account: str) -> IMAPClient:
+    def _get_imap_connection(self, token: str, email_account: str) -> ContextManager[IMAPClient]:
+        """Borrow an authenticated IMAP connection from the pool for a ``with`` block."""
+        return self.connection_pool.connection(email_account, token)
+    
+    def _open_imap_connection(self, email_account: str, token: str) -> IMAPClient:
         """Create and authenticate IMAP connection."""
-        server = IMAPClient(self.imap_host, use_uid=True, ssl=True)
+        server = IMAPClient(self.imap_host, port=self.imap_port, use_uid=True, ssl=self.imap_ssl)
         try:
             server.oauth2_login(email_account, token)
+            self._modseq_extensions[server] = self._enable_modseq_extension(server)
+            return server
+        except Exception as e:
+            server.shutdown()
+            raise standardize_error_response(e, "get imap connection", email_account)
+    
+    async def _open_async_imap_connection(self, email_account: str, token: str) -> AsyncIMAPClient:
+        """Create and authenticate an asyncio IMAP connection."""
+        server = await AsyncIMAPClient.connect(self.imap_host, self.imap_port, ssl=self.imap_ssl)
+        try:
+            await server.oauth2_login(email_account, token)
+            self._modseq_extensions[server] = await self._enable_modseq_extension_async(server)
             return server
         except Exception as e:
+            server.shutdown()
             raise standardize_error_response(e, "get imap connection", email_account)
     
+    @staticmethod
+    def _email_id(folder: str, uid: int) -> str:
+        """
+        Build the email ID for a message.
+        
+        UIDs are only unique within a folder. INBOX keeps plain UIDs so emails
+        stored before other folders were synced keep their IDs.
+        """
+        return str(uid) if folder == 'INBOX' else f"{folder}:{uid}"
+    
+    @staticmethod
+    def _uid_from_email_id(email_id: str) -> int:
+        """Get the IMAP UID back from an email ID built by _email_id()."""
+        return int(email_id.rsplit(':', 1)[-1])
+    
     def _build_search_query(self, search: str) -> Dict[str, Any]:
         """Build search query component."""
         if not search:
@@ -131,77 +278,79 @@ class EmailService:
     # Email Security & Privacy Methods
     # -------------------------------------------------------------------------
     
-    def _remove_scripts(self, html_content: str) -> str:
-        """Remove script tags and their contents for security."""
-        # Remove script tags and their contents
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL)
-        
-        # Remove on* event handlers (onclick, onload, etc.)
-        html_content = re.sub(r'(<[^>]*) on\w+="[^"]*"([^>]*>)', r'\1\2', html_content)
-        html_content = re.sub(r'(<[^>]*) on\w+=\'[^\']*\'([^>]*>)', r'\1\2', html_content)
-        
-        # Remove javascript: URLs
-        html_content = re.sub(r'(<[^>]*\s+(?:href|src|action)=[\'\"])javascript:.*?([\'\"][^>]*>)', 
-                              r'\1#\2', html_content, flags=re.IGNORECASE|re.DOTALL)
-        
-        # TODO: Research and add more event handlers to the list based on current trends
-        return html_content
-    
-    def _remove_tracking_pixels(self, html_content: str) -> str:
-        """Remove tracking pixels while preserving normal images."""
-        # Remove 1x1 pixel images (common tracking pixels)
-        html_content = re.sub(r'<img[^>]*(?:width=["\']?1["\']?[^>]*height=["\']?1["\']?|'
-                            r'height=["\']?1["\']?[^>]*width=["\']?1["\']?)[^>]*>', 
-                            '', html_content, flags=re.IGNORECASE)
-        
-        # Remove images from common tracking domains
-        # TODO: Research and add more tracking domains to the list
-        tracking_domains = [
-            r'track\.', r'pixel\.', r'analytics\.', r'beacon\.', 
-            r'tracker\.', r'metrics\.', r'telemetry\.', r'logger\.'
-        ]
-        for domain in tracking_domains:
-            html_content = re.sub(
-                fr'<img[^>]*src=["\']https?://[^"\']*{domain}[^"\']*["\'][^>]*>', 
-                '', html_content, flags=re.IGNORECASE
-            )
-        
-        return html_content
-    
-    def _minimal_email_sanitization(self, html_content: str) -> str:
+    def _sanitize_html(self, html_content: str, reader_view: bool = False,
+                       removed_trackers: Optional[List[str]] = None) -> str:
         """
-        Minimally sanitize email content while preserving formatting.
-        Removes scripts and tracking elements but maintains styles and layout.
+        Sanitize HTML in a single scan over the content.
+
+        Script blocks (and style blocks for reader view) are dropped whole;
+        every other tag is cleaned individually, so the per-tag patterns only
+        ever run on a few dozen characters instead of the full message.
+
+        Args:
+            html_content: HTML to sanitize
+            reader_view: Also remove style blocks and inline styles
+            removed_trackers: List the hosts of removed tracking images are appended to
         """
         if not html_content:
             return html_content
-            
-        # First remove scripts for security
-        html_content = self._remove_scripts(html_content)
-        
-        # Then remove tracking pixels
-        html_content = self._remove_tracking_pixels(html_content)
-        
-        return html_content
+
+        tokens = _READER_VIEW_TOKENS if reader_view else _SANITIZE_TOKENS
+
+        def replace(match: re.Match) -> str:
+            tag = match.group(1)
+            return '' if tag is None else self._sanitize_tag(tag, reader_view, removed_trackers)
+
+        return tokens.sub(replace, html_content)
+
+    def _sanitize_tag(self, tag: str, reader_view: bool, removed_trackers: Optional[List[str]]) -> str:
+        """Clean a single tag; returns an empty string for tracking images."""
+        # Remove on* event handlers (onclick, onload, etc.) and javascript: URLs
+        if ' on' in tag:
+            tag = _EVENT_HANDLER.sub('', tag)
+        lowered = tag.lower()
+        if 'javascript:' in lowered:
+            tag = _JAVASCRIPT_URL.sub(r'\1#', tag)
+            lowered = tag.lower()
+
+        if lowered.startswith('<img') and self._is_tracking_image(lowered, removed_trackers):
+            return ''
+
+        # Remove inline styles for reader view
+        if reader_view and ' style=' in tag:
+            tag = _INLINE_STYLE.sub('', tag)
+        return tag
+
+    def _is_tracking_image(self, img_tag: str, removed_trackers: Optional[List[str]]) -> bool:
+        """
+        Check a lowercased <img> tag for a 1x1 pixel, a tracking URL or a blocklisted host.
+
+        The host of a tracking image is recorded in removed_trackers.
+        """
+        host = _IMAGE_HOST.search(img_tag)
+        host = host.group(1) if host else None
+        if not ((_PIXEL_WIDTH.search(img_tag) and _PIXEL_HEIGHT.search(img_tag))
+                or _TRACKING_URL.search(img_tag)
+                or (host and self.tracker_blocklist.match(host))):
+            return False
+        if removed_trackers is not None and host and host not in removed_trackers:
+            removed_trackers.append(host)
+        return True
+
+    def _minimal_email_sanitization(self, html_content: str,
+                                    removed_trackers: Optional[List[str]] = None) -> str:
+        """
+        Minimally sanitize email content while preserving formatting.
+        Removes scripts and tracking elements but maintains styles and layout.
+        """
+        return self._sanitize_html(html_content, removed_trackers=removed_trackers)
     
     def _full_email_sanitization(self, html_content: str) -> str:
         """
         More aggressive cleaning for reader view.
         Removes tracking pixels, scripts, styles and other formatting to focus on content.
         """
-        if not html_content:
-            return html_content
-            
-        # Start with minimal sanitization
-        html_content = self._minimal_email_sanitization(html_content)
-        
-        # Additionally remove style tags for reader view
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL)
-        
-        # Remove inline styles
-        html_content = re.sub(r'(<[^>]*) style=["\'][^"\']*["\']([^>]*>)', r'\1\2', html_content)
-        
-        return html_content
+        return self._sanitize_html(html_content, reader_view=True)
 
     def _decode_email_field(self, field_value: Optional[str], default: str = '') -> str:
         """Safely decode email header fields with proper encoding handling."""
@@ -213,86 +362,189 @@ class EmailService:
             decoded = decoded.decode(encoding or 'utf-8', errors='ignore')
         return decoded
 
-    def _extract_email_body(self, email_message: email.message.Message) -> Tuple[str, bool]:
+    def _extract_email_body(self, email_message: email.message.Message) -> ParsedBody:
         """
-        Extract body content from email message and determine if it's HTML.
+        Extract the displayable body of a message in a single walk of its MIME tree.
+        
+        Attachments are skipped and text/html is preferred over text/plain. Only
+        the chosen part is decoded, and HTML is sanitized here, so the result
+        must not be sanitized again.
         
         Args:
             email_message: The email message to extract body from
             
         Returns:
-            Tuple containing (body_content, is_html_flag)
+            ParsedBody: Body content and whether it is HTML
         """
-        # Default values
-        body = ""
-        is_html = False
-        html_part = None
-        text_part = None
-        
-        # Check if the message is multipart
-        if email_message.is_multipart():
-            # First pass: identify all content parts
-            for part in email_message.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-                
-                # Skip attachments
-                if "attachment" in content_disposition:
-                    continue
-                    
-                # Find HTML content
-                if content_type == "text/html":
-                    html_part = part
-                    
-                # Find plain text content
-                if content_type == "text/plain":
-                    text_part = part
-            
-            # Prefer HTML content when available
-            if html_part:
-                try:
-                    body = html_part.get_payload(decode=True).decode(errors="replace")
-                    is_html = True
-                except Exception as e:
-                    log_operation(logger, 'error', f"Error decoding HTML part: {e}")
-                    # Fall back to text part if available
-                    if text_part:
-                        body = text_part.get_payload(decode=True).decode(errors="replace")
-            elif text_part:
-                # Use plain text if no HTML is found
-                body = text_part.get_payload(decode=True).decode(errors="replace")
-        else:
-            # Not multipart - get content type and decode accordingly
+        if not email_message.is_multipart():
             content_type = email_message.get_content_type()
             try:
-                body = email_message.get_payload(decode=True).decode(errors="replace")
-                is_html = content_type == "text/html"
+                return self._finalize_body(self._decode_part(email_message), content_type == "text/html")
             except Exception as e:
                 log_operation(logger, 'error', f"Error decoding non-multipart message: {e}")
                 body = email_message.get_payload(decode=False)
                 # Try to detect HTML if content-type wasn't reliable
-                is_html = bool(re.search(r'<(?:html|body|div|p|h[1-6])[^>]*>', body, re.IGNORECASE))
+                return self._finalize_body(body, bool(HTML_TAG.search(body)))
+        
+        html_part = None
+        text_part = None
+        for part in email_message.walk():
+            if part.is_multipart() or "attachment" in str(part.get("Content-Disposition", "")):
+                continue
+            content_type = part.get_content_type()
+            if content_type == "text/html":
+                html_part = part
+            elif content_type == "text/plain":
+                text_part = part
         
+        # Prefer HTML content when available, falling back to plain text
+        for part, is_html in ((html_part, True), (text_part, False)):
+            if part is None:
+                continue
+            try:
+                return self._finalize_body(self._decode_part(part), is_html)
+            except Exception as e:
+                log_operation(logger, 'error', f"Error decoding {part.get_content_type()} part: {e}")
+        return ParsedBody(content="", is_html=False)
+
+    def _decode_part(self, part: email.message.Message) -> str:
+        """Decode the transfer encoding and charset of a single-part MIME entity."""
+        payload = part.get_payload(decode=True)
+        try:
+            return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+        except LookupError:
+            return payload.decode(errors="replace")
+
+    def _finalize_body(self, body: str, is_html: bool) -> ParsedBody:
+        """Validate the HTML flag of a decoded body and minimally sanitize HTML content."""
         # Validate HTML detection with regex if needed
-        if is_html and not bool(re.search(r'<(?:html|body|div|p|h[1-6])[^>]*>', body, re.IGNORECASE)):
+        if is_html and not HTML_TAG.search(body):
             log_operation(logger, 'warning', "Content marked as HTML but no HTML tags found, validating...")
             is_html = False  # Reset if no HTML tags found
         
         # Apply minimal sanitization for HTML content
+        removed_trackers: List[str] = []
         if is_html:
-            body = self._minimal_email_sanitization(body)
+            body = self._minimal_email_sanitization(body, removed_trackers=removed_trackers)
         
-        return body, is_html
+        return ParsedBody(content=body, is_html=is_html, removed_trackers=removed_trackers)
+
+    def _format_address(self, address) -> Optional[str]:
+        """Format an IMAP ENVELOPE address as 'Name <mailbox@host>'."""
+        if not address.mailbox or not address.host:
+            # Start or end marker of an RFC 2822 group
+            return None
+        addr = f"{address.mailbox.decode(errors='replace')}@{address.host.decode(errors='replace')}"
+        name = self._decode_email_field(address.name.decode(errors='replace') if address.name else None)
+        return f"{name} <{addr}>" if name else addr
+
+    def _find_body_part(self, bodystructure) -> Optional[BodyPartRef]:
+        """
+        Locate the displayable body part in a BODYSTRUCTURE response.
+        
+        Mirrors _extract_email_body: attachments are skipped and text/html is
+        preferred over text/plain.
+        
+        Args:
+            bodystructure: Parsed BODYSTRUCTURE of the message
+            
+        Returns:
+            Optional[BodyPartRef]: Location of the body part, None if the message has no text body
+        """
+        found = {}
+        
+        def walk(part, section):
+            if part.is_multipart:
+                for index, child in enumerate(part[0], start=1):
+                    walk(child, f"{section}.{index}" if section else str(index))
+                return
+            
+            content_type = f"{part[0].decode()}/{part[1].decode()}".lower()
+            if content_type not in ("text/html", "text/plain"):
+                return
+            # Text parts carry their disposition after MD5 in the extension data
+            disposition = part[9] if len(part) > 9 else None
+            if isinstance(disposition, tuple) and disposition[0] and disposition[0].lower() == b'attachment':
+                return
+            
+            params = part[2] or ()
+            params = {params[i].decode().lower(): params[i + 1].decode() for i in range(0, len(params) - 1, 2)}
+            found[content_type] = BodyPartRef(
+                section=section or "1",
+                content_type=content_type,
+                encoding=(part[5] or b'7bit').decode().lower(),
+                charset=params.get("charset", "utf-8")
+            )
+        
+        walk(bodystructure, "")
+        return found.get("text/html") or found.get("text/plain")
+
+    def _decode_body_part(self, payload: bytes, body_ref: BodyPartRef) -> ParsedBody:
+        """
+        Decode a body part fetched with BODY.PEEK[section].
+        
+        Args:
+            payload: Raw part content as returned by the server
+            body_ref: Location and encoding of the part
+            
+        Returns:
+            ParsedBody: Body content and whether it is HTML
+        """
+        try:
+            if body_ref.encoding == "base64":
+                payload = base64.b64decode(payload)
+            elif body_ref.encoding == "quoted-printable":
+                payload = quopri.decodestring(payload)
+        except (binascii.Error, ValueError) as e:
+            log_operation(logger, 'error', f"Error decoding {body_ref.encoding} body part: {e}")
+        
+        try:
+            body = payload.decode(body_ref.charset, errors="replace")
+        except LookupError:
+            body = payload.decode(errors="replace")
+        
+        return self._finalize_body(body, body_ref.content_type == "text/html")
+
+    def _parse_headers_only(self, uid: int, message_data: dict, google_id: str = 'default',
+                            folder: str = 'INBOX', uidvalidity: Optional[int] = None) -> dict:
+        """
+        Parse an ENVELOPE/BODYSTRUCTURE FETCH response into schema-compliant format.
+        
+        The body is left empty and a reference to the body part, including the
+        folder and UIDVALIDITY the UID belongs to, is stored so that
+        load_email_body() can fetch it on demand.
+        """
+        envelope = message_data[b'ENVELOPE']
+        body_ref = self._find_body_part(message_data[b'BODYSTRUCTURE'])
+        if body_ref is not None:
+            body_ref = body_ref.model_copy(update={"folder": folder, "uidvalidity": uidvalidity})
+        
+        subject = self._decode_email_field(envelope.subject.decode(errors='replace') if envelope.subject else None)
+        senders = [self._format_address(address) for address in envelope.from_ or ()]
+        recipients = [self._format_address(address) for address in envelope.to or ()]
+        
+        return {
+            'google_id': google_id,
+            'email_id': self._email_id(folder, uid),
+            'sender': next((sender for sender in senders if sender), ''),
+            'recipients': [recipient for recipient in recipients if recipient],
+            'subject': subject,
+            'body': '',
+            'is_html': bool(body_ref and body_ref.content_type == "text/html"),
+            'received_at': envelope.date or message_data.get(b'INTERNALDATE') or datetime.now(),
+            'category': 'uncategorized',
+            'is_read': b'\\Seen' in message_data.get(b'FLAGS', ()),
+            'folder': folder,
+            'body_loaded': body_ref is None,  # Nothing to fetch later without a text part
+            'body_ref': body_ref,
+            'size': message_data.get(b'RFC822.SIZE')
+        }
 
     def _parse_email_message(self, uid: int, email_message: email.message.Message, 
-                           google_id: str = 'default') -> dict:
+                           google_id: str = 'default', folder: str = 'INBOX') -> dict:
         """Parse email message into schema-compliant format."""
-        # Extract body content and determine if it's HTML
-        body, is_html = self._extract_email_body(email_message)
-        
-        # Minimally sanitize HTML content if present
-        if is_html:
-            body = self._minimal_email_sanitization(body)
+        # Decoded and sanitized in one pass
+        body = self._extract_email_body(email_message)
         
         # Process headers
         subject = self._decode_email_field(email_message.get('Subject'))
@@ -316,15 +568,17 @@ class EmailService:
 
         return {
             'google_id': google_id,
-            'email_id': str(uid),
+            'email_id': self._email_id(folder, uid),
             'sender': from_,
             'recipients': recipients,
             'subject': subject,
-            'body': body,
-            'is_html': is_html, # TODO: Remove this field or add to the schema? Leaning towards keeping it to communicate the type of body content
+            'body': body.content,
+            'is_html': body.is_html, # TODO: Remove this field or add to the schema? Leaning towards keeping it to communicate the type of body content
+            'removed_trackers': body.removed_trackers,
             'received_at': received_date,
             'category': 'uncategorized',
-            'is_read': False
+            'is_read': False,
+            'folder': folder
         }
 
     # -------------------------------------------------------------------------
@@ -338,70 +592,763 @@ class EmailService:
                              folder: str = 'INBOX', 
                              criteria: str = 'ALL') -> List[dict]:
         """Fetch emails from IMAP server"""
+        if self.use_async_imap:
+            return await self._fetch_from_imap_async(
+                token, email_account, google_id, limit, since_date, folder, criteria
+            )
         return await run_in_threadpool(
             lambda: self._fetch_from_imap_sync(
                 token, email_account, google_id, limit, since_date, folder, criteria
             )
         )
     
+    async def sync_mailbox(self, token: str, email_account: str, google_id: str,
+                           folder: str = 'INBOX', limit: Optional[int] = 50) -> MailboxSyncResult:
+        """
+        Incrementally sync a folder into the database.
+        
+        Uses the stored UIDVALIDITY and last-synced UID for (google_id, folder) so
+        that only new messages are downloaded. On CONDSTORE servers, read-state
+        changes and (with QRESYNC) expunges of already-synced messages are applied
+        as bulk updates without downloading any bodies. The new high-water marks
+        are persisted only after the fetched emails have been saved.
+        
+        New messages stream through a fetch -> parse -> persist pipeline joined
+        by bounded queues, so the stages overlap and at most a few chunks are
+        held in memory however large the sync is.
+        
+        Args:
+            token: OAuth access token
+            email_account: Email address to log in as
+            google_id: Google ID of the user
+            folder: IMAP folder to sync
+            limit: Maximum number of messages to fetch on a full resync
+            
+        Returns:
+            MailboxSyncResult: Number of new emails and the new sync state
+        """
+        state = await self.sync_state_repository.find_state(google_id, folder)
+        fetched = StageQueue(self.pipeline_depth)
+        parsed = StageQueue(self.pipeline_depth)
+        
+        async def fetch_stage() -> MailboxSyncResult:
+            if self.use_async_imap:
+                result = await self._sync_mailbox_async(
+                    token, email_account, google_id, folder, state, limit, sink=fetched.put
+                )
+            else:
+                result = await run_in_threadpool(
+                    lambda: self._sync_mailbox_sync(
+                        token, email_account, google_id, folder, state, limit, sink=fetched.put_threadsafe
+                    )
+                )
+            await fetched.close()
+            return result
+        
+        async def parse_stage() -> None:
+            async for chunk in fetched:
+                emails = await self._parse_fetched_messages_async(
+                    chunk.messages, google_id, folder, chunk.uidvalidity
+                )
+                await parsed.put((chunk.full_resync, emails))
+            await parsed.close()
+        
+        async def persist_stage() -> Tuple[bool, int]:
+            purged, saved = False, 0
+            async for full_resync, emails in parsed:
+                if full_resync and state is not None and not purged:
+                    await self._purge_folder(google_id, folder)
+                    purged = True
+                await self.save_emails_to_db(emails)
+                saved += len(emails)
+            return purged, saved
+        
+        result, _, (purged, saved) = await run_pipeline(
+            [fetch_stage(), parse_stage(), persist_stage()], [fetched, parsed]
+        )
+        
+        if result.full_resync and state is not None and not purged:
+            await self._purge_folder(google_id, folder)
+        
+        if result.read_states:
+            await self.email_repository.bulk_update_read_state(
+                {self._email_id(folder, uid): is_read for uid, is_read in result.read_states.items()}, google_id
+            )
+        if result.vanished_uids:
+            vanished_ids = [self._email_id(folder, uid) for uid in result.vanished_uids]
+            await self.email_repository.delete_by_email_ids(vanished_ids, google_id)
+            await get_summary_repository().delete_by_email_ids(vanished_ids, google_id)
+        
+        await self.sync_state_repository.save_state(result.state)
+        return replace(result, email_count=saved)
+    
+    async def _purge_folder(self, google_id: str, folder: str) -> None:
+        """Drop a folder's emails and their summaries after its UIDVALIDITY changed."""
+        # Stored UIDs may now point at different messages
+        log_operation(logger, 'warning', f"UIDVALIDITY changed for {folder} of user {google_id}, resyncing")
+        stale_ids = await self.email_repository.find_email_ids_by_folder(google_id, folder)
+        await self.email_repository.delete_by_folder(google_id, folder)
+        await get_summary_repository().delete_by_email_ids(stale_ids, google_id)
+    
+    async def sync_mailboxes(self, token: str, email_account: str, google_id: str,
+                             folders: Optional[List[str]] = None,
+                             limit: Optional[int] = 50) -> Dict[str, MailboxSyncResult]:
+        """
+        Sync several folders concurrently, each over its own pooled connection.
+        
+        At most ``folder_concurrency`` folders of one account are synced at a
+        time, across all concurrent refreshes of that account, so the account
+        stays within its IMAP connection limit. A folder that fails (e.g. one
+        that doesn't exist) is logged and skipped without affecting the others.
+        
+        Note that on Gmail a message carrying several labels appears in each
+        of the corresponding folders and is stored once per folder.
+        
+        Args:
+            token: OAuth access token
+            email_account: Email address to log in as
+            google_id: Google ID of the user
+            folders: Folders to sync, by default the configured ``imap_sync_folders``
+            limit: Maximum number of messages to fetch per folder on a full resync
+            
+        Returns:
+            Dict[str, MailboxSyncResult]: Sync result per successfully synced folder
+        """
+        folders = list(dict.fromkeys(folders or self.sync_folders))
+        slots = self._account_folder_slots.setdefault(email_account, asyncio.Semaphore(self.folder_concurrency))
+        
+        async def sync_folder(folder: str) -> MailboxSyncResult:
+            async with slots:
+                return await self.sync_mailbox(token, email_account, google_id, folder=folder, limit=limit)
+        
+        outcomes = await asyncio.gather(*(sync_folder(folder) for folder in folders), return_exceptions=True)
+        
+        results = {}
+        for folder, outcome in zip(folders, outcomes):
+            if isinstance(outcome, BaseException):
+                log_operation(logger, 'error', f"Failed to sync {folder} for user {google_id}: {outcome}")
+                continue
+            results[folder] = outcome
+        if folders and not results:
+            # Nothing could be synced at all, e.g. the token was rejected
+            raise outcomes[0]
+        return results
+    
     def _fetch_from_imap_sync(self, token: str, email_account: str,
                             google_id: str = 'default', limit: Optional[int] = None,
                             since_date: Optional[datetime] = None, 
                             folder: str = 'INBOX', criteria: str = 'ALL') -> List[dict]:
         """Synchronous implementation of IMAP fetching"""
         with self._get_imap_connection(token, email_account) as server:
-            server.select_folder(folder)
+            select_info = server.select_folder(folder)
 
-            search_criteria = [criteria]
-            if since_date:
-                date_str = since_date.strftime('%d-%b-%Y')
-                search_criteria.extend(['SINCE', date_str])        
-
-            messages = server.search(search_criteria)
+            messages = server.search(self._build_imap_criteria(criteria, since_date))
 
             if limit:
                 messages = messages[-limit:]
 
-            emails = []
-            
-            for uid in messages:
-                try:
-                    fetch_data = server.fetch(uid, ['RFC822', 'INTERNALDATE'])
-                    raw_message = fetch_data[uid][b'RFC822']
-                    received_date = fetch_data[uid][b'INTERNALDATE']
-                    
-                    email_message = email.message_from_bytes(raw_message)
-                    body = self._extract_email_body(email_message)
-                    
-                    email_data = self._parse_email_message(
-                        uid=uid,
-                        email_message=email_message,
-                        google_id=google_id
-                    )
-                    
-                    emails.append(email_data)
-                    
-                except Exception as e:
-                    log_operation(logger, 'error', f"Error processing email {uid}: {e}")
-                    continue
+            emails, _ = self._fetch_and_parse_messages(
+                server, messages, google_id, folder, select_info.get(b'UIDVALIDITY')
+            )
+            return emails
+
+    async def _fetch_from_imap_async(self, token: str, email_account: str,
+                                     google_id: str = 'default', limit: Optional[int] = None,
+                                     since_date: Optional[datetime] = None,
+                                     folder: str = 'INBOX', criteria: str = 'ALL') -> List[dict]:
+        """Asyncio implementation of IMAP fetching"""
+        async with self.async_connection_pool.connection(email_account, token) as server:
+            select_info = await server.select_folder(folder)
+
+            messages = await server.search(self._build_imap_criteria(criteria, since_date))
 
+            if limit:
+                messages = messages[-limit:]
+
+            emails, _ = await self._fetch_and_parse_messages_async(
+                server, messages, google_id, folder, select_info.get(b'UIDVALIDITY')
+            )
             return emails
 
+    def _build_imap_criteria(self, criteria: str, since_date: Optional[datetime]) -> List[str]:
+        """Build SEARCH criteria from a base criterion and an optional start date."""
+        search_criteria = [criteria]
+        if since_date:
+            search_criteria.extend(['SINCE', since_date.strftime('%d-%b-%Y')])
+        return search_criteria
+
+    def _sync_mailbox_sync(self, token: str, email_account: str, google_id: str,
+                           folder: str, state: Optional[MailboxSyncState],
+                           limit: Optional[int] = None,
+                           sink: Optional[Callable[[FetchedChunk], None]] = None) -> MailboxSyncResult:
+        """
+        Synchronous implementation of incremental mailbox sync.
+
+        Only UIDs above the stored high-water mark are fetched while the folder's
+        UIDVALIDITY is unchanged. When UIDNEXT shows nothing new, SEARCH is skipped
+        entirely. A missing state or a UIDVALIDITY change triggers a full resync of
+        the newest ``limit`` messages.
+
+        Flag changes are collected with CHANGEDSINCE against the stored
+        HIGHESTMODSEQ when the server supports CONDSTORE; with QRESYNC the same
+        round trip also reports expunged UIDs.
+
+        When a ``sink`` is given, each fetched chunk is handed to it unparsed
+        instead of being collected into the result.
+        """
+        with self._get_imap_connection(token, email_account) as server:
+            modseq_extension = self._get_modseq_extension(server)
+            select_info = server.select_folder(folder)
+            full_resync, last_uid, search_criteria = self._plan_uid_search(state, select_info)
+
+            uids = []
+            if search_criteria:
+                uids = self._select_new_uids(server.search(search_criteria), full_resync, last_uid, limit)
+
+            read_states, vanished_uids = {}, []
+            since_modseq = self._flag_sync_modseq(state, full_resync, select_info, modseq_extension)
+            if since_modseq is not None:
+                read_states, vanished_uids = self._fetch_flag_changes(
+                    server, last_uid, since_modseq, qresync=modseq_extension == 'QRESYNC'
+                )
+
+            on_chunk = None
+            if sink is not None:
+                on_chunk = lambda messages: sink(FetchedChunk(full_resync, select_info[b'UIDVALIDITY'], messages))
+            emails, fetched_uids = self._fetch_and_parse_messages(
+                server, uids, google_id, folder, select_info[b'UIDVALIDITY'], on_chunk
+            )
+
+            return self._build_sync_result(
+                google_id, folder, select_info, modseq_extension, full_resync, last_uid,
+                uids, emails, fetched_uids, read_states, vanished_uids
+            )
+
+    async def _sync_mailbox_async(self, token: str, email_account: str, google_id: str,
+                                  folder: str, state: Optional[MailboxSyncState],
+                                  limit: Optional[int] = None,
+                                  sink: Optional[Callable[[FetchedChunk], Awaitable[None]]] = None
+                                  ) -> MailboxSyncResult:
+        """Asyncio implementation of incremental mailbox sync. See _sync_mailbox_sync()."""
+        async with self.async_connection_pool.connection(email_account, token) as server:
+            modseq_extension = await self._get_modseq_extension_async(server)
+            select_info = await server.select_folder(folder)
+            full_resync, last_uid, search_criteria = self._plan_uid_search(state, select_info)
+
+            uids = []
+            if search_criteria:
+                uids = self._select_new_uids(await server.search(search_criteria), full_resync, last_uid, limit)
+
+            read_states, vanished_uids = {}, []
+            since_modseq = self._flag_sync_modseq(state, full_resync, select_info, modseq_extension)
+            if since_modseq is not None:
+                modifiers = [f'CHANGEDSINCE {since_modseq}'] + (['VANISHED'] if modseq_extension == 'QRESYNC' else [])
+                response = await server.fetch(f'1:{last_uid}', ['FLAGS'], modifiers=modifiers)
+                read_states, vanished_uids = self._parse_flag_changes(
+                    response, server.untagged_responses.pop('VANISHED', []), last_uid
+                )
+
+            on_chunk = None
+            if sink is not None:
+                on_chunk = lambda messages: sink(FetchedChunk(full_resync, select_info[b'UIDVALIDITY'], messages))
+            emails, fetched_uids = await self._fetch_and_parse_messages_async(
+                server, uids, google_id, folder, select_info[b'UIDVALIDITY'], on_chunk
+            )
+
+            return self._build_sync_result(
+                google_id, folder, select_info, modseq_extension, full_resync, last_uid,
+                uids, emails, fetched_uids, read_states, vanished_uids
+            )
+
+    def _plan_uid_search(self, state: Optional[MailboxSyncState],
+                         select_info: Dict[bytes, Any]) -> Tuple[bool, int, Optional[List[str]]]:
+        """
+        Decide how to find new messages after selecting a folder.
+
+        Returns:
+            Tuple of (whether this is a full resync, current high-water mark,
+            SEARCH criteria or None when UIDNEXT shows there is nothing new)
+        """
+        if state is None or state.uidvalidity != select_info[b'UIDVALIDITY']:
+            return True, 0, ['ALL']
+
+        uidnext = select_info.get(b'UIDNEXT')
+        if uidnext is not None and uidnext <= state.last_uid + 1:
+            return False, state.last_uid, None
+        return False, state.last_uid, ['UID', f'{state.last_uid + 1}:*']
+
+    def _select_new_uids(self, found: List[int], full_resync: bool, last_uid: int,
+                         limit: Optional[int]) -> List[int]:
+        """Filter SEARCH results down to the UIDs that should be fetched."""
+        if full_resync:
+            return found[-limit:] if limit else list(found)
+        # "n:*" always matches the highest UID, even when it is below n
+        return [uid for uid in found if uid > last_uid]
+
+    def _flag_sync_modseq(self, state: Optional[MailboxSyncState], full_resync: bool,
+                          select_info: Dict[bytes, Any], modseq_extension: Optional[str]) -> Optional[int]:
+        """Get the mod-sequence to fetch flag changes since, or None if there is nothing to sync."""
+        highest_modseq = select_info.get(b'HIGHESTMODSEQ') if modseq_extension else None
+        if (full_resync or not state.last_uid or highest_modseq is None
+                or state.highest_modseq is None or highest_modseq <= state.highest_modseq):
+            return None
+        return state.highest_modseq
+
+    def _build_sync_result(self, google_id: str, folder: str, select_info: Dict[bytes, Any],
+                           modseq_extension: Optional[str], full_resync: bool, last_uid: int,
+                           uids: List[int], emails: List[dict], fetched_uids: Set[int],
+                           read_states: Dict[int, bool], vanished_uids: List[int]) -> MailboxSyncResult:
+        """Advance the high-water marks and assemble the outcome of a folder sync."""
+        # Advance the high-water mark only over UIDs that were actually fetched, so a
+        # dropped connection doesn't skip messages. Unparseable messages still count.
+        for uid in sorted(uids):
+            if uid not in fetched_uids:
+                break
+            last_uid = uid
+
+        return MailboxSyncResult(
+            emails=emails,
+            email_count=len(emails),
+            state=MailboxSyncState(
+                google_id=google_id,
+                folder=folder,
+                uidvalidity=select_info[b'UIDVALIDITY'],
+                last_uid=last_uid,
+                highest_modseq=select_info.get(b'HIGHESTMODSEQ') if modseq_extension else None
+            ),
+            full_resync=full_resync,
+            read_states=read_states,
+            vanished_uids=vanished_uids
+        )
+
+    def _get_modseq_extension(self, server: IMAPClient) -> Optional[str]:
+        """Get the extension enabled on a connection at login, enabling it now for other connections."""
+        if server not in self._modseq_extensions:
+            self._modseq_extensions[server] = self._enable_modseq_extension(server)
+        return self._modseq_extensions[server]
+
+    async def _get_modseq_extension_async(self, server: AsyncIMAPClient) -> Optional[str]:
+        """Asyncio version of _get_modseq_extension()."""
+        if server not in self._modseq_extensions:
+            self._modseq_extensions[server] = await self._enable_modseq_extension_async(server)
+        return self._modseq_extensions[server]
+
+    def _enable_modseq_extension(self, server: IMAPClient) -> Optional[str]:
+        """
+        Enable QRESYNC, or failing that CONDSTORE, on the connection.
+
+        Must be called before a folder is selected so that SELECT reports
+        HIGHESTMODSEQ.
+
+        Returns:
+            The enabled extension name, or None if flag delta sync is unavailable
+        """
+        if not settings.imap_flag_sync:
+            return None
+        for extension in ('QRESYNC', 'CONDSTORE'):
+            if not server.has_capability(extension):
+                continue
+            try:
+                if server.has_capability('ENABLE'):
+                    enabled = server.enable(extension)
+                    if extension.encode() not in enabled:
+                        continue
+                return extension
+            except Exception as e:
+                log_operation(logger, 'warning', f"Could not enable {extension}: {e}")
+        return None
+
+    async def _enable_modseq_extension_async(self, server: AsyncIMAPClient) -> Optional[str]:
+        """Asyncio version of _enable_modseq_extension()."""
+        if not settings.imap_flag_sync:
+            return None
+        for extension in ('QRESYNC', 'CONDSTORE'):
+            if not await server.has_capability(extension):
+                continue
+            try:
+                if await server.has_capability('ENABLE'):
+                    enabled = await server.enable(extension)
+                    if extension.encode() not in enabled:
+                        continue
+                return extension
+            except IMAPClientAbortError:
+                raise
+            except Exception as e:
+                log_operation(logger, 'warning', f"Could not enable {extension}: {e}")
+        return None
+
+    def _fetch_flag_changes(self, server: IMAPClient, last_uid: int, since_modseq: int,
+                            qresync: bool = False) -> Tuple[Dict[int, bool], List[int]]:
+        """
+        Fetch flags of already-synced messages changed since a mod-sequence.
+
+        Issues a single ``UID FETCH 1:<last_uid> (FLAGS) (CHANGEDSINCE <modseq>)``,
+        adding the VANISHED modifier when QRESYNC is enabled. IMAPClient.fetch()
+        can't be used here: it expects explicit UIDs and ignores VANISHED responses.
+
+        Returns:
+            Tuple of (UID -> is_read for changed messages, expunged UIDs)
+        """
+        modifiers = f'CHANGEDSINCE {since_modseq}' + (' VANISHED' if qresync else '')
+        imap = server._imap
+        typ, data = imap.uid('FETCH', f'1:{last_uid}', '(FLAGS)', f'({modifiers})')
+        if typ != 'OK':
+            raise Exception(f"Flag sync failed: {data}")
+
+        response = parse_fetch_response([item for item in data if item is not None], uid_is_key=True)
+        return self._parse_flag_changes(response, imap.untagged_responses.pop('VANISHED', []), last_uid)
+
+    def _parse_flag_changes(self, response: Dict[int, dict], vanished_lines: List[bytes],
+                            last_uid: int) -> Tuple[Dict[int, bool], List[int]]:
+        """
+        Extract read states and expunged UIDs from a CHANGEDSINCE FETCH.
+
+        Returns:
+            Tuple of (UID -> is_read for changed messages, expunged UIDs)
+        """
+        read_states = {
+            uid: b'\\Seen' in message_data.get(b'FLAGS', ())
+            for uid, message_data in response.items()
+            if uid <= last_uid
+        }
+
+        vanished_uids = []
+        for line in vanished_lines:
+            # e.g. b'(EARLIER) 300:310,405'
+            uid_set = line.split()[-1].decode() if isinstance(line, bytes) else line.split()[-1]
+            vanished_uids.extend(uid for uid in self._parse_uid_set(uid_set) if uid <= last_uid)
+
+        return read_states, sorted(set(vanished_uids))
+
+    @staticmethod
+    def _parse_uid_set(uid_set: str) -> List[int]:
+        """Expand an IMAP sequence set such as '3:5,9' into a list of UIDs."""
+        uids = []
+        for part in uid_set.split(','):
+            if ':' in part:
+                start, end = sorted(int(n) for n in part.split(':'))
+                uids.extend(range(start, end + 1))
+            elif part:
+                uids.append(int(part))
+        return uids
+
+    def _message_data_items(self) -> List[str]:
+        """FETCH data items needed to ingest a message in the configured mode."""
+        if self.headers_only:
+            return ['ENVELOPE', 'BODYSTRUCTURE', 'INTERNALDATE', 'FLAGS', 'RFC822.SIZE']
+        # BODY.PEEK avoids implicitly setting \Seen, which would clobber the read state we sync
+        return ['BODY.PEEK[]', 'FLAGS', 'INTERNALDATE']
+
+    def _parse_fetched_message(self, uid: int, message_data: dict, google_id: str,
+                               folder: str = 'INBOX', uidvalidity: Optional[int] = None) -> dict:
+        """
+        Parse the FETCH data of one message into schema-compliant format.
+
+        In headers-only mode just the ENVELOPE, BODYSTRUCTURE and flags are
+        available; bodies are fetched later by load_email_body().
+        """
+        if self.headers_only:
+            return self._parse_headers_only(uid, message_data, google_id, folder, uidvalidity)
+
+        email_message = email.message_from_bytes(message_data[b'BODY[]'])
+        email_data = self._parse_email_message(
+            uid=uid,
+            email_message=email_message,
+            google_id=google_id,
+            folder=folder
+        )
+        email_data['is_read'] = b'\\Seen' in message_data.get(b'FLAGS', ())
+        return email_data
+
+    def _fetch_and_parse_messages(self, server: IMAPClient, uids: List[int], google_id: str,
+                                  folder: str = 'INBOX', uidvalidity: Optional[int] = None,
+                                  on_chunk: Optional[Callable[[List[Tuple[int, dict]]], None]] = None
+                                  ) -> Tuple[List[dict], Set[int]]:
+        """
+        Fetch and parse messages by UID from the selected folder.
+
+        With ``on_chunk``, the FETCH data of each chunk is handed over unparsed
+        and no emails are returned.
+
+        Returns:
+            Tuple of (parsed email dicts, UIDs the server returned data for)
+        """
+        emails = []
+        fetched_uids = set()
+
+        for chunk in self._iter_fetched_chunks(server, uids, self._message_data_items()):
+            fetched_uids.update(uid for uid, _ in chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            else:
+                emails.extend(self._parse_fetched_messages(chunk, google_id, folder, uidvalidity))
+
+        return emails, fetched_uids
+
+    async def _fetch_and_parse_messages_async(self, server: AsyncIMAPClient, uids: List[int], google_id: str,
+                                              folder: str = 'INBOX', uidvalidity: Optional[int] = None,
+                                              on_chunk: Optional[Callable[[List[Tuple[int, dict]]], Awaitable[None]]] = None
+                                              ) -> Tuple[List[dict], Set[int]]:
+        """
+        Asyncio version of _fetch_and_parse_messages().
+
+        MIME parsing and sanitization are CPU-bound, so each fetched chunk is
+        parsed off the event loop to keep it free for other requests.
+        """
+        emails = []
+        fetched_uids = set()
+
+        async for chunk in self._aiter_fetched_chunks(server, uids, self._message_data_items()):
+            fetched_uids.update(uid for uid, _ in chunk)
+            if on_chunk is not None:
+                await on_chunk(chunk)
+            else:
+                emails.extend(await self._parse_fetched_messages_async(chunk, google_id, folder, uidvalidity))
+
+        return emails, fetched_uids
+
+    def _parse_fetched_messages(self, fetched: List[Tuple[int, dict]], google_id: str,
+                                folder: str = 'INBOX', uidvalidity: Optional[int] = None) -> List[dict]:
+        """Parse FETCH data of several messages, skipping the ones that fail to parse."""
+        emails = []
+        for uid, message_data in fetched:
+            try:
+                emails.append(self._parse_fetched_message(uid, message_data, google_id, folder, uidvalidity))
+            except Exception as e:
+                log_operation(logger, 'error', f"Error processing email {uid}: {e}")
+        return emails
+
+    async def _parse_fetched_messages_async(self, fetched: List[Tuple[int, dict]], google_id: str,
+                                            folder: str = 'INBOX', uidvalidity: Optional[int] = None) -> List[dict]:
+        """
+        Parse FETCH data of several messages without blocking the event loop.
+
+        With imap_parse_processes set, the messages are split into tasks of
+        parse_task_size messages and parsed in parallel by worker processes, so
+        large syncs use all cores without holding the API process's GIL.
+        Otherwise, or if a worker fails, they are parsed in a worker thread.
+        """
+        pool = self._get_parse_pool()
+        if pool is not None and fetched:
+            loop = asyncio.get_running_loop()
+            try:
+                tasks = [
+                    loop.run_in_executor(pool, _parse_in_worker, fetched[start:start + self.parse_task_size],
+                                         google_id, folder, uidvalidity, self.headers_only)
+                    for start in range(0, len(fetched), self.parse_task_size)
+                ]
+                return [email_data for batch in await asyncio.gather(*tasks) for email_data in batch]
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    # Don't keep respawning workers that die, e.g. because they can't start
+                    self.close_parse_pool()
+                    self.parse_processes = 0
+                log_operation(logger, 'warning', f"Parse worker failed, parsing {len(fetched)} emails in-process: {e}")
+        return await asyncio.to_thread(self._parse_fetched_messages, fetched, google_id, folder, uidvalidity)
+
+    def _get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the parse worker processes, starting them on first use; None when parsing in-process."""
+        if self.parse_processes and self._parse_pool is None:
+            # Forking a process that runs threads can deadlock, so workers are spawned
+            self._parse_pool = ProcessPoolExecutor(self.parse_processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._parse_pool
+
+    def close_parse_pool(self) -> None:
+        """Stop the parse worker processes."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
+    def _iter_fetched_chunks(self, server: IMAPClient, uids: List[int],
+                             data_items: List[str]) -> Iterator[List[Tuple[int, dict]]]:
+        """
+        Fetch messages with chunked multi-UID FETCH commands and yield one list per chunk.
+
+        Each chunk costs a single round trip, and only one chunk is held at a
+        time. If a chunk fails, its UIDs are retried individually so one bad
+        message cannot drop the rest of the chunk.
+
+        Args:
+            server: Authenticated IMAP connection with a folder selected
+            uids: UIDs to fetch, in the order they should be yielded
+            data_items: FETCH data items (e.g. ['BODY.PEEK[]', 'INTERNALDATE'])
+
+        Yields:
+            List of (uid, fetch data for that uid); UIDs expunged between SEARCH
+            and FETCH or failing individually are left out
+        """
+        for start in range(0, len(uids), self.fetch_chunk_size):
+            chunk = uids[start:start + self.fetch_chunk_size]
+            try:
+                fetch_data = server.fetch(chunk, data_items)
+            except Exception as e:
+                log_operation(logger, 'warning', f"Chunked fetch of {len(chunk)} emails failed, retrying individually: {e}")
+                fetch_data = {}
+                for uid in chunk:
+                    try:
+                        fetch_data.update(server.fetch([uid], data_items))
+                    except Exception as uid_error:
+                        log_operation(logger, 'error', f"Error fetching email {uid}: {uid_error}")
+
+            yield [(uid, fetch_data[uid]) for uid in chunk if uid in fetch_data]
+
+    async def _aiter_fetched_chunks(self, server: AsyncIMAPClient, uids: List[int],
+                                    data_items: List[str]) -> AsyncIterator[List[Tuple[int, dict]]]:
+        """
+        Asyncio version of _iter_fetched_chunks().
+
+        A lost connection aborts the iteration instead of being retried per UID,
+        since every following command on it would fail too.
+        """
+        for start in range(0, len(uids), self.fetch_chunk_size):
+            chunk = uids[start:start + self.fetch_chunk_size]
+            try:
+                fetch_data = await server.fetch(chunk, data_items)
+            except IMAPClientAbortError:
+                raise
+            except Exception as e:
+                log_operation(logger, 'warning', f"Chunked fetch of {len(chunk)} emails failed, retrying individually: {e}")
+                fetch_data = {}
+                for uid in chunk:
+                    try:
+                        fetch_data.update(await server.fetch([uid], data_items))
+                    except IMAPClientAbortError:
+                        raise
+                    except Exception as uid_error:
+                        log_operation(logger, 'error', f"Error fetching email {uid}: {uid_error}")
+
+            yield [(uid, fetch_data[uid]) for uid in chunk if uid in fetch_data]
+
+    def _fetch_body_part_sync(self, token: str, email_account: str, uid: int,
+                              body_ref: BodyPartRef) -> Optional[bytes]:
+        """
+        Fetch a single body part with BODY.PEEK[section].
+
+        Returns:
+            The raw part content, or None if the message no longer exists
+        """
+        with self._get_imap_connection(token, email_account) as server:
+            select_info = server.select_folder(body_ref.folder, readonly=True)
+            if not self._body_ref_is_current(body_ref, select_info):
+                return None
+            response = server.fetch([uid], [f'BODY.PEEK[{body_ref.section}]'])
+            return response.get(uid, {}).get(f'BODY[{body_ref.section}]'.encode())
+
+    async def _fetch_body_part_async(self, token: str, email_account: str, uid: int,
+                                     body_ref: BodyPartRef) -> Optional[bytes]:
+        """Asyncio version of _fetch_body_part_sync()."""
+        async with self.async_connection_pool.connection(email_account, token) as server:
+            select_info = await server.select_folder(body_ref.folder, readonly=True)
+            if not self._body_ref_is_current(body_ref, select_info):
+                return None
+            response = await server.fetch([uid], [f'BODY.PEEK[{body_ref.section}]'])
+            return response.get(uid, {}).get(f'BODY[{body_ref.section}]'.encode())
+
+    def _body_ref_is_current(self, body_ref: BodyPartRef, select_info: Dict[bytes, Any]) -> bool:
+        """Check that the UID of a body reference still names the same message in its folder."""
+        if body_ref.uidvalidity is not None and body_ref.uidvalidity != select_info.get(b'UIDVALIDITY'):
+            log_operation(logger, 'warning', f"UIDVALIDITY of {body_ref.folder} changed, not loading stale body part")
+            return False
+        return True
+
+    async def get_imap_credentials(self, google_id: str) -> Tuple[str, str]:
+        """Get the OAuth token and email address used to log in to a user's mailbox."""
+        user = await get_user_service().get_user(google_id)
+        if not user or not user.email:
+            raise Exception(f"Email address not found for user {google_id}")
+        
+        token_data = await get_auth_service().get_token_data(google_id)
+        if not token_data:
+            raise Exception(f"No token found for user {google_id}")
+        
+        return token_data.token, user.email
+
+    async def load_email_body(self, email_schema: EmailSchema) -> EmailSchema:
+        """
+        Fetch the body of a headers-only email from IMAP and store it.
+        
+        Only the displayable text part is downloaded, so attachments are never
+        transferred. Emails whose body is already loaded are returned unchanged.
+        
+        Args:
+            email_schema: Email to load the body for
+            
+        Returns:
+            EmailSchema: Email with its body populated
+        """
+        if email_schema.body_loaded or email_schema.body_ref is None:
+            return email_schema
+        
+        token, email_account = await self.get_imap_credentials(email_schema.google_id)
+        uid = self._uid_from_email_id(email_schema.email_id)
+        if self.use_async_imap:
+            payload = await self._fetch_body_part_async(token, email_account, uid, email_schema.body_ref)
+        else:
+            payload = await run_in_threadpool(
+                lambda: self._fetch_body_part_sync(token, email_account, uid, email_schema.body_ref)
+            )
+        if payload is None:
+            log_operation(logger, 'warning', f"Email {email_schema.email_id} no longer exists on the server")
+            return email_schema
+        
+        body = self._decode_body_part(payload, email_schema.body_ref)
+        update = {"body": body.content, "body_loaded": True, "removed_trackers": body.removed_trackers}
+        await self.email_repository.update_by_email_and_google_id(
+            email_schema.email_id, email_schema.google_id, update
+        )
+        log_operation(logger, 'info', f"Loaded body of email {email_schema.email_id} on demand")
+        return email_schema.model_copy(update=update)
+
+    async def load_email_bodies(self, emails: List[Union[dict, EmailSchema]]) -> List[EmailSchema]:
+        """
+        Load the bodies of any headers-only emails in a list.
+        
+        Failures to reach IMAP are logged and leave the email headers-only, so
+        callers that need the text should check ``body_loaded``.
+        
+        Args:
+            emails: Emails as stored in the database
+            
+        Returns:
+            List[EmailSchema]: The emails, in the same order
+        """
+        loaded = []
+        for email_data in emails:
+            email_schema = self._ensure_email_schema(email_data)
+            try:
+                email_schema = await self.load_email_body(email_schema)
+            except Exception as e:
+                log_operation(logger, 'warning', f"Could not load body of email {email_schema.email_id}: {e}")
+            loaded.append(email_schema)
+        return loaded
+
     # -------------------------------------------------------------------------
     # Database Operations
     # -------------------------------------------------------------------------
     
-    async def save_email_to_db(self, email_data: dict) -> None:
-        """Store email in database if not exists"""
+    async def save_emails_to_db(self, emails: List[Union[dict, EmailSchema]]) -> BulkInsertResult:
+        """
+        Store a batch of emails in one bulk write, skipping ones that already exist.
+        
+        Args:
+            emails: Parsed emails to store
+            
+        Returns:
+            BulkInsertResult: Number of emails inserted and skipped
+        """
         try:
-            email_id = str(email_data["email_id"])
-            existing_email = await self.email_repository.find_by_email_and_google_id(email_id, email_data["google_id"])
-            if not existing_email:
-                email_schema = self._ensure_email_schema(email_data)
-                await self.email_repository.insert_one(email_schema)
-                log_operation(logger, 'info', f"Email {email_id} inserted successfully")
+            result = await self.email_repository.insert_many_if_absent(
+                [self._ensure_email_schema(email_data) for email_data in emails]
+            )
+            if emails:
+                log_operation(logger, 'info', f"Saved {result.inserted} new emails, {result.skipped} already stored")
+            return result
         except Exception as e:
-            self._handle_email_error(e, "save", email_data.get("email_id"), email_data.get("google_id"))
+            self._handle_email_error(e, "save")
+
+    async def save_email_to_db(self, email_data: dict) -> None:
+        """Store email in database if not exists"""
+        await self.save_emails_to_db([email_data])
 
     async def get_emails_from_db(self, google_id: str, query: Dict = None, 
                                 skip: int = 0, limit: int = 100,
@@ -427,6 +1374,10 @@ class EmailService:
         """
         Get an email by IMAP UID.
         
+        The body of an email ingested headers-only is fetched from IMAP the
+        first time it is requested. If that fails, the email is returned
+        with its headers only.
+        
         Args:
             email_id: IMAP UID of the email
             google_id: Google ID of the user
@@ -438,7 +1389,7 @@ class EmailService:
             email_data = await self.email_repository.find_by_email_and_google_id(str(email_id), google_id)
             if not email_data:
                 return None
-            return self._ensure_email_schema(email_data)
+            return (await self.load_email_bodies([email_data]))[0]
         except Exception as e:
             self._handle_email_error(e, "get", email_id, google_id)
 
@@ -485,6 +1436,8 @@ class EmailService:
             bool: True if deletion successful
         """
         try:
+            # Forget the high-water marks too, otherwise the next refresh only fetches newer mail
+            await self.sync_state_repository.delete_by_google_id(google_id)
             return await self.email_repository.delete_by_google_id(google_id)
         except Exception as e:
             self._handle_email_error(e, "delete", google_id)
@@ -497,66 +1450,10 @@ class EmailService:
     
     def _convert_html_to_readable_text(self, html_content: str) -> str:
         """Convert HTML to readable plain text, optimized for reader view."""
-        # First apply full sanitization
-        html_content = self._full_email_sanitization(html_content)
-        
-        # Add newlines after block elements to improve readability
-        block_elements = ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'tr', 'section', 'article']
-        for tag in block_elements:
-            pattern = f'</{tag}>'
-            html_content = re.sub(pattern, f'</{tag}>\n\n', html_content, flags=re.IGNORECASE)
-        
-        # Handle list items with bullets
-        html_content = re.sub(r'<li[^>]*>', '• ', html_content, flags=re.IGNORECASE)
-        
-        # Handle headings with emphasis
-        for i in range(1, 7):
-            html_content = re.sub(f'<h{i}[^>]*>(.*?)</h{i}>', 
-                                 lambda m: f"\n\n{m.group(1).upper()}\n\n", 
-                                 html_content, flags=re.IGNORECASE|re.DOTALL)
-        
-        # Remove all remaining HTML tags
-        html_content = re.sub(r'<[^>]+>', ' ', html_content)
-        
-        # Unescape HTML entities
-        import html
-        html_content = html.unescape(html_content)
-        
-        # Clean up whitespace
-        html_content = re.sub(r' {2,}', ' ', html_content)
-        html_content = re.sub(r'\n{3,}', '\n\n', html_content)
-        
-        # Strip out email headers that we display separately
-        html_content = re.sub(r'(?i)(-+\s*Forwarded message\s*-+\s*)?'
-                             r'From:.*?(?=To:|Subject:|Date:|$).*?\n', '', html_content)
-        html_content = re.sub(r'(?i)Date:\s*.*?\n', '', html_content)
-        html_content = re.sub(r'(?i)To:\s*.*?\n', '', html_content)
-        html_content = re.sub(r'(?i)Subject:\s*.*?\n', '', html_content)
-        html_content = re.sub(r'(?i)Cc:\s*.*?\n', '', html_content)
-        
-        # Remove any remaining forwarded message markers
-        html_content = re.sub(r'(?i)(-+\s*Forwarded message\s*-+\s*)', '', html_content)
-        
-        # Clean up excessive whitespace after header removal
-        html_content = re.sub(r'\n{3,}', '\n\n', html_content)
-        
-        # Format sections divided by separator lines
-        html_content = re.sub(r'([_\-=]{3,})\s*', '\n\n----------\n\n', html_content)
-        
-        # Add spacing around links and URLs
-        html_content = re.sub(r'(https?://\S+)', r'\n\1\n', html_content)
-        
-        # Add spacing around list items for better readability
-        html_content = re.sub(r'(•\s+.*?)(\n•\s+)', r'\1\n\2', html_content)
-        
-        # Normalize paragraph spacing (ensure double newlines between paragraphs)
-        # Readerview is destroying this.
-        html_content = re.sub(r'([^\n])\n([^\n])', r'\1\n\n\2', html_content)
-        
-        # Clean up any excessive newlines again
-        html_content = re.sub(r'\n{3,}', '\n\n', html_content)
-        
-        return html_content.strip()
+        return html_to_reader_text(
+            html_content,
+            drop_tag=lambda tag: tag.startswith('<img') and self._is_tracking_image(tag, None)
+        )
         
     def _clean_plaintext_for_reading(self, text: str) -> str:
         """Clean plain text content for better readability."""
@@ -570,39 +1467,71 @@ class EmailService:
         return text.strip()
     
     async def get_email_reader_view(self, email_id: str, google_id: str) -> Optional[ReaderViewResponse]:
-        """Process an email to generate a reader-view friendly version."""
+        """
+        Get the reader-view friendly version of an email.
+        
+        The reader view is computed on first view and stored with the email,
+        so later views are a single read that skips the body. Reader views
+        stored by an older converter (READER_VIEW_VERSION) are recomputed.
+        
+        Args:
+            email_id: IMAP UID of the email
+            google_id: Google ID of the user
+            
+        Returns:
+            Optional[ReaderViewResponse]: Reader view if the email exists, None otherwise
+        """
         try:
+            email_id = str(email_id)
+            stored = await self.email_repository.find_reader_view(email_id, google_id)
+            if not stored:
+                return None
+            
+            reader_view = stored.get("reader_view")
+            if reader_view and reader_view.get("version") == READER_VIEW_VERSION:
+                return self._reader_view_response(stored["email_id"], stored["subject"], StoredReaderView(**reader_view))
+            
             email = await self.get_email(email_id, google_id)
             if not email:
                 return None
-                
-            body = email.body
-            original_length = len(body)
-            
-            # Determine if content is HTML based on content
-            is_html = getattr(email, 'is_html', False)
-            if not is_html:
-                # Fallback detection if is_html attribute doesn't exist
-                is_html = bool(re.search(r'<(?:html|body|div|p|h[1-6])[^>]*>', body, re.IGNORECASE))
-            
-            if is_html:
-                reader_content = self._convert_html_to_readable_text(body)
-                content_type = "html"
-            else:
-                reader_content = self._clean_plaintext_for_reading(body)
-                content_type = "plain"
-            
-            return ReaderViewResponse.from_email(
-                email=email,
-                reader_content=reader_content,
-                content_type=content_type,
-                is_processed=True,
-                original_length=original_length,
-                processed_length=len(reader_content)
-            )
+            reader_view = await run_in_threadpool(self._build_reader_view, email.body)
+            # Headers-only emails whose body could not be loaded are converted again next time
+            if email.body_loaded:
+                await self.email_repository.update_by_email_and_google_id(
+                    email_id, google_id, {"reader_view": reader_view.model_dump()}
+                )
+            return self._reader_view_response(email.email_id, email.subject, reader_view)
             
         except Exception as e:
             self._handle_email_error(e, "generate reader view for", email_id, google_id)
+    
+    def _build_reader_view(self, body: str) -> StoredReaderView:
+        """Convert an email body to its reader view."""
+        if HTML_TAG.search(body):
+            reader_content = self._convert_html_to_readable_text(body)
+            content_type = "html"
+        else:
+            reader_content = self._clean_plaintext_for_reading(body)
+            content_type = "plain"
+        
+        return StoredReaderView(
+            content=reader_content,
+            content_type=content_type,
+            original_length=len(body),
+            version=READER_VIEW_VERSION
+        )
+    
+    def _reader_view_response(self, email_id: str, subject: str, reader_view: StoredReaderView) -> ReaderViewResponse:
+        """Build the reader view endpoint response from a stored reader view."""
+        return ReaderViewResponse(
+            email_id=email_id,
+            subject=subject,
+            reader_content=reader_view.content,
+            content_type=reader_view.content_type,
+            is_processed=True,
+            original_length=reader_view.original_length,
+            processed_length=len(reader_view.content)
+        )
         
     # -------------------------------------------------------------------------
     # Public API Methods
@@ -611,7 +1540,8 @@ class EmailService:
     async def fetch_emails(self, google_id: str, skip: int = 0, limit: int = 20,
                           unread_only: bool = False, category: Optional[str] = None,
                           search: Optional[str] = None, sort_by: str = "received_at",
-                          sort_order: str = "desc", refresh: bool = False) -> Tuple[List[EmailSchema], int, Dict[str, Any]]:
+                          sort_order: str = "desc", refresh: bool = False,
+                          folder: Optional[str] = None) -> Tuple[List[EmailSchema], int, Dict[str, Any]]:
         """Main email fetching function that combines IMAP and database operations."""
         try:
             debug_info = {"db_query": {}, "timing": {}, "source": "database", "google_id": google_id}
@@ -619,7 +1549,7 @@ class EmailService:
             if refresh:
                 await self._refresh_emails_from_imap(google_id, debug_info)
             
-            query = self._build_email_query(google_id, unread_only, category, search)
+            query = self._build_email_query(google_id, unread_only, category, search, folder)
             debug_info["db_query"] = query
             
             sort_direction = -1 if sort_order == "desc" else 1
@@ -643,6 +1573,21 @@ class EmailService:
         except Exception as e:
             self._handle_email_error(e, "fetch", None, google_id)
     
+    async def refresh_mailboxes(self, google_id: str) -> Dict[str, Any]:
+        """
+        Sync a user's mailboxes from IMAP into the database.
+        
+        Args:
+            google_id: Google ID of the user
+            
+        Returns:
+            Dict[str, Any]: Debug info of the refresh; ``imap_error`` is set when
+            the user, their email address or their token is missing
+        """
+        debug_info = {"timing": {}}
+        await self._refresh_emails_from_imap(google_id, debug_info)
+        return debug_info
+    
     async def _refresh_emails_from_imap(self, google_id: str, debug_info: Dict[str, Any]) -> None:
         """Internal method to refresh emails from IMAP"""
         debug_info["source"] = "imap+database"
@@ -676,22 +1621,19 @@ class EmailService:
                 debug_info["imap_error"] = "No token found for user"
                 return
             
-            log_operation(logger, 'info', f"Fetching emails from IMAP for {user_email}")
-            imap_emails = await self.fetch_from_imap(
+            log_operation(logger, 'info', f"Syncing {len(self.sync_folders)} folders from IMAP for {user_email}")
+            results = await self.sync_mailboxes(
                 token=token_data.token,
                 email_account=user_email,
                 google_id=google_id,
                 limit=50
             )
             
-            log_operation(logger, 'info', f"Retrieved {len(imap_emails)} emails from IMAP for {user_email}")
-            
-            for email_data in imap_emails:
-                email_data["google_id"] = google_id
-                await self.save_email_to_db(email_data)
-            
-            debug_info["imap_fetch_count"] = len(imap_emails)
-            log_operation(logger, 'info', f"Saved {len(imap_emails)} emails to database for {user_email}")
+            fetched = sum(result.email_count for result in results.values())
+            debug_info["imap_fetch_count"] = fetched
+            debug_info["imap_folders"] = {folder: result.email_count for folder, result in results.items()}
+            debug_info["imap_full_resync"] = [folder for folder, result in results.items() if result.full_resync]
+            log_operation(logger, 'info', f"Saved {fetched} new emails to database for {user_email}")
             
         except Exception as e:
             debug_info["imap_error"] = str(e)
@@ -701,10 +1643,13 @@ class EmailService:
             debug_info["timing"]["imap_fetch_duration"] = (datetime.now() - start_time).total_seconds()
     
     def _build_email_query(self, google_id: str, unread_only: bool, category: Optional[str], 
-                          search: Optional[str]) -> Dict[str, Any]:
+                          search: Optional[str], folder: Optional[str] = None) -> Dict[str, Any]:
         """Build query filter for emails"""
         query = {"google_id": google_id}
         
+        if folder:
+            query["folder"] = EmailRepository.folder_filter(folder)
+        
         if unread_only:
             query["is_read"] = False
             
@@ -714,4 +1659,18 @@ class EmailService:
         if search:
             query.update(self._build_search_query(search))
             
-        return query
\ No newline at end of file
+        return query
+
+# -------------------------------------------------------------------------
+# Parse Worker Processes
+# -------------------------------------------------------------------------
+
+_worker_parser: Optional[EmailService] = None
+
+def _parse_in_worker(fetched: List[Tuple[int, dict]], google_id: str, folder: str,
+                     uidvalidity: Optional[int], headers_only: bool) -> List[dict]:
+    """Parse FETCH data of several messages in a parse worker process."""
+    global _worker_parser
+    if _worker_parser is None or _worker_parser.headers_only != headers_only:
+        _worker_parser = EmailService.parser(headers_only)
+    return _worker_parser._parse_fetched_messages(fetched, google_id, folder, uidvalidity)
@@ -0,0 +1,145 @@
+"""
+HTML to text conversion for Email Essence.
+
+Email HTML is converted by an incremental tokenizer that walks the document
+once and emits text as it goes, so the markup, which makes up most of a
+marketing email, is never copied. Only the much smaller extracted text is
+post-processed: into the reader view, or into compact text for summarizer
+input.
+"""
+
+# Standard library imports
+import re
+from html import unescape
+from typing import Callable, Iterator, Optional
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+# A start or end tag (groups: "/" and tag name), a comment, or a doctype/processing instruction
+_TOKEN = re.compile(r'<(?:(/?)([a-zA-Z][^\s/>]*)[^>]*|!--.*?--|[!?][^>]*)>', re.DOTALL)
+_BLOCK_ELEMENTS = frozenset(['p', 'div', 'li', 'tr', 'section', 'article'])
+_HEADINGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+_SKIPPED_END = {tag: re.compile(fr'</{tag}\s*>', re.IGNORECASE) for tag in ('script', 'style')}
+_SKIPPED_ELEMENTS = frozenset(_SKIPPED_END)
+
+# Tags that show a body contains markup
+HTML_TAG = re.compile(r'<(?:html|body|div|p|h[1-6])[^>]*>', re.IGNORECASE)
+
+# Reader view post-processing, applied in this order
+_READER_VIEW_STEPS = [
+    # Clean up whitespace
+    (re.compile(r' {2,}'), ' '),
+    (re.compile(r'\n{3,}'), '\n\n'),
+    # Strip out email headers that we display separately
+    (re.compile(r'(?i)(-+\s*Forwarded message\s*-+\s*)?From:.*?(?=To:|Subject:|Date:|$).*?\n'), ''),
+    (re.compile(r'(?i)Date:\s*.*?\n'), ''),
+    (re.compile(r'(?i)To:\s*.*?\n'), ''),
+    (re.compile(r'(?i)Subject:\s*.*?\n'), ''),
+    (re.compile(r'(?i)Cc:\s*.*?\n'), ''),
+    # Remove any remaining forwarded message markers
+    (re.compile(r'(?i)(-+\s*Forwarded message\s*-+\s*)'), ''),
+    (re.compile(r'\n{3,}'), '\n\n'),
+    # Format sections divided by separator lines
+    (re.compile(r'([_\-=]{3,})\s*'), '\n\n----------\n\n'),
+    # Add spacing around links and URLs
+    (re.compile(r'(https?://\S+)'), r'\n\1\n'),
+    # Add spacing around list items for better readability
+    (re.compile(r'(•\s+.*?)(\n•\s+)'), r'\1\n\2'),
+    # Normalize paragraph spacing (ensure double newlines between paragraphs)
+    (re.compile(r'([^\n])\n([^\n])'), r'\1\n\n\2'),
+    (re.compile(r'\n{3,}'), '\n\n'),
+]
+
+_HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+_LINE_BREAKS = re.compile(r' ?\n[\s]*')
+
+def _iter_text(html: str, drop_tag: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    Tokenize HTML and yield the pieces of its text in document order.
+
+    Tags become a space, the ends of block elements a paragraph break, list
+    items a bullet and headings an uppercase paragraph. Script and style
+    contents and comments are skipped.
+
+    Args:
+        html: HTML content
+        drop_tag: Called with each lowercased start tag; tags it returns True
+                  for (e.g. tracking images) are dropped without a space
+    """
+    heading_depth = 0
+    pos = 0
+    while True:
+        match = _TOKEN.search(html, pos)
+        end = match.start() if match else len(html)
+        if end > pos:
+            data = unescape(html[pos:end])
+            yield data.upper() if heading_depth else data
+        if not match:
+            return
+        pos = match.end()
+
+        closing, tag = match.group(1, 2)
+        if tag is None:
+            # Comment, doctype or processing instruction
+            yield ' '
+            continue
+        tag = tag.lower()
+        if closing:
+            if tag in _HEADINGS and heading_depth:
+                heading_depth -= 1
+                yield '\n\n\n\n'
+            elif tag in _BLOCK_ELEMENTS or tag in _HEADINGS:
+                yield ' \n\n'
+            else:
+                yield ' '
+        elif tag in _SKIPPED_ELEMENTS:
+            skipped = _SKIPPED_END[tag].search(html, pos)
+            if skipped:
+                pos = skipped.end()
+            else:
+                yield ' '  # Unterminated, so its content is shown as text
+        elif drop_tag is not None and drop_tag(match.group().lower()):
+            continue
+        elif tag == 'li':
+            yield '• '
+        elif tag in _HEADINGS and not match.group().endswith('/>'):
+            heading_depth += 1
+            yield '\n\n'
+        else:
+            yield ' '
+
+def html_to_reader_text(html: str, drop_tag: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Convert HTML to readable plain text for the reader view.
+
+    Args:
+        html: HTML content
+        drop_tag: Predicate for start tags to drop, see _iter_text
+
+    Returns:
+        str: Text with paragraphs separated by blank lines
+    """
+    text = ''.join(_iter_text(html, drop_tag))
+    for pattern, replacement in _READER_VIEW_STEPS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+def html_to_text(html: str, drop_tag: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Convert HTML to compact plain text, e.g. for summarizer input.
+
+    Whitespace is collapsed and blank lines are removed, so no tokens are
+    spent on layout.
+
+    Args:
+        html: HTML content
+        drop_tag: Predicate for start tags to drop, see _iter_text
+
+    Returns:
+        str: Text with one line per paragraph
+    """
+    text = ''.join(_iter_text(html, drop_tag))
+    text = _HORIZONTAL_SPACE.sub(' ', text)
+    return _LINE_BREAKS.sub('\n', text).strip()
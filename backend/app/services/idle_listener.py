@@ -0,0 +1,165 @@
+"""
+IMAP IDLE listener for Email Essence.
+
+Holds one IDLE connection (RFC 2177) per watched account, so new or expunged
+messages are ingested seconds after they arrive instead of on the next poll.
+Accounts that can't be watched (no IDLE support, connection cap reached,
+repeated failures) are left to the background polling.
+"""
+
+# Standard library imports
+import asyncio
+from contextlib import nullcontext
+from typing import Dict, Optional, Set
+
+# Third-party imports
+from imapclient.exceptions import IMAPClientAbortError
+
+# Internal imports
+from app.utils.helpers import get_logger, log_operation
+from app.services.imap import AsyncIMAPClient
+from app.utils.config import get_settings
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+settings = get_settings()
+
+_CHANGE_RESPONSES = (b'EXISTS', b'EXPUNGE')
+_MAX_RETRY_DELAY = 300
+
+class MailboxIdleListener:
+    """
+    Watches accounts' mailboxes with IMAP IDLE and syncs them on changes.
+
+    IDLE connections are dedicated asyncio connections outside the pools, as
+    they are held open indefinitely. When the server reports EXISTS or
+    EXPUNGE, the folder is synced incrementally, which fetches only the UIDs
+    above the stored high-water mark and applies expunges.
+    """
+
+    def __init__(self, email_service: 'EmailService', # type: ignore
+                 sync_slots: Optional[asyncio.Semaphore] = None,
+                 folder: Optional[str] = None, max_connections: Optional[int] = None,
+                 renew_interval: Optional[float] = None, max_failures: Optional[int] = None):
+        """
+        Initialize the listener.
+
+        Args:
+            email_service: Email service used to look up credentials and sync folders
+            sync_slots: Semaphore shared with other syncs to limit how many run at once
+            folder: Folder to watch
+            max_connections: Maximum number of IDLE connections across all accounts
+            renew_interval: Seconds before IDLE is ended and re-issued
+            max_failures: Connection failures in a row before an account is given up
+        """
+        self.email_service = email_service
+        self.sync_slots = sync_slots
+        self.folder = folder or settings.imap_idle_folder
+        self.max_connections = max_connections or settings.imap_idle_max_connections
+        self.renew_interval = renew_interval or settings.imap_idle_renew_interval
+        self.max_failures = max_failures or settings.imap_idle_max_failures
+
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._live: Set[str] = set()  # Accounts with an established IDLE connection
+        self._unwatchable: Set[str] = set()  # Accounts left to polling
+
+    def watching(self, google_id: str) -> bool:
+        """Whether an IDLE connection is currently established for a user."""
+        return google_id in self._live
+
+    def watch(self, google_id: str) -> bool:
+        """
+        Start watching a user's mailbox, unless it can't be watched.
+
+        Returns:
+            bool: True if the mailbox is being watched
+        """
+        if google_id in self._watchers:
+            return True
+        if google_id in self._unwatchable or len(self._watchers) >= self.max_connections:
+            return False
+        self._watchers[google_id] = asyncio.create_task(self._watch(google_id))
+        return True
+
+    def unwatch(self, google_id: str) -> None:
+        """Stop watching a user's mailbox."""
+        task = self._watchers.pop(google_id, None)
+        if task is not None:
+            task.cancel()
+        self._unwatchable.discard(google_id)
+
+    async def stop(self) -> None:
+        """Close all IDLE connections."""
+        tasks = list(self._watchers.values())
+        self._watchers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _watch(self, google_id: str) -> None:
+        """Keep an IDLE session open for a user, reconnecting with backoff after failures."""
+        failures = 0
+        try:
+            while failures < self.max_failures:
+                try:
+                    await self._idle_session(google_id)
+                    return
+                except Exception as e:
+                    # A session that got as far as idling starts the count over
+                    failures = 1 if google_id in self._live else failures + 1
+                    self._live.discard(google_id)
+                    log_operation(logger, 'warning', f"IDLE connection for {google_id} failed ({failures} in a row): {e}")
+                    await asyncio.sleep(min(2 ** failures, _MAX_RETRY_DELAY))
+            log_operation(logger, 'warning', f"Giving up IDLE for {google_id}, falling back to polling")
+        finally:
+            self._live.discard(google_id)
+            if self._watchers.get(google_id) is asyncio.current_task():
+                del self._watchers[google_id]
+                self._unwatchable.add(google_id)
+
+    async def _idle_session(self, google_id: str) -> None:
+        """
+        Connect, then alternate between idling and syncing the folder.
+
+        Returns only if the server has no IDLE support; other errors are raised.
+        """
+        token, email_account = await self.email_service.get_imap_credentials(google_id)
+
+        server = await AsyncIMAPClient.connect(
+            self.email_service.imap_host, self.email_service.imap_port, ssl=self.email_service.imap_ssl
+        )
+        try:
+            await server.oauth2_login(email_account, token)
+            if not await server.has_capability('IDLE'):
+                log_operation(logger, 'info', f"IMAP server of {google_id} has no IDLE support, polling instead")
+                return
+            await server.select_folder(self.folder, readonly=True)
+            self._live.add(google_id)
+            # Catch up on changes made while no IDLE connection was open
+            await self._sync(google_id, email_account, token)
+
+            loop = asyncio.get_running_loop()
+            while True:
+                await server.idle()
+                deadline = loop.time() + self.renew_interval
+                changed = False
+                while not changed and loop.time() < deadline:
+                    for response in await server.idle_check(deadline - loop.time()):
+                        if response[0] == b'BYE':
+                            raise IMAPClientAbortError(f"IMAP server closed the IDLE connection: {response[1]!r}")
+                        changed = changed or response[1] in _CHANGE_RESPONSES
+                await server.idle_done()
+                if changed:
+                    await self._sync(google_id, email_account, token)
+        finally:
+            server.shutdown()
+
+    async def _sync(self, google_id: str, email_account: str, token: str) -> None:
+        """Incrementally sync the watched folder."""
+        async with self.sync_slots or nullcontext():
+            result = await self.email_service.sync_mailbox(token, email_account, google_id, folder=self.folder)
+        if result.email_count or result.vanished_uids:
+            log_operation(logger, 'info', f"IDLE sync for {google_id}: {result.email_count} new, {len(result.vanished_uids)} expunged")
@@ -0,0 +1,20 @@
+"""
+IMAP module for Email Essence.
+
+This module provides connection management for talking to users' IMAP
+mailboxes.
+"""
+
+from .aio_client import AsyncIMAPClient
+from .pipeline import PipelineAborted, StageQueue, run_pipeline
+from .pool import AsyncIMAPConnectionPool, IMAPConnectionPool, PoolExhaustedError
+
+__all__ = [
+    'AsyncIMAPClient',
+    'AsyncIMAPConnectionPool',
+    'IMAPConnectionPool',
+    'PipelineAborted',
+    'PoolExhaustedError',
+    'StageQueue',
+    'run_pipeline'
+]
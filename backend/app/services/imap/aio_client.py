@@ -0,0 +1,344 @@
+"""
+Asyncio IMAP client for Email Essence.
+
+IMAPClient is blocking, so every session has to run in a worker thread for
+its whole duration. This client speaks the subset of IMAP4rev1 the email
+service needs (XOAUTH2, CAPABILITY, ENABLE, SELECT, UID SEARCH, UID FETCH,
+IDLE, NOOP, LOGOUT) directly on asyncio streams, so many accounts can be served
+concurrently from the event loop.
+
+Responses are collected in the same shape imaplib produces, which lets the
+parsers from imapclient.response_parser be reused, and the public methods
+mirror the IMAPClient methods of the same name.
+"""
+
+# Standard library imports
+import asyncio
+import base64
+import re
+import ssl as ssl_lib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Third-party imports
+from imapclient.exceptions import IMAPClientAbortError, IMAPClientError, LoginError
+from imapclient.imap_utf7 import encode as encode_utf7
+from imapclient.response_parser import parse_fetch_response, parse_message_list
+
+# Internal imports
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+_LITERAL = re.compile(rb'\{(?P<size>\d+)\}$')
+_UNTAGGED_NUMBERED = re.compile(rb'(?P<number>\d+) (?P<type>[A-Z-]+)(?: (?P<data>.*))?$', re.DOTALL)
+_UNTAGGED = re.compile(rb'(?P<type>[A-Z-]+)(?: (?P<data>.*))?$', re.DOTALL)
+_RESPONSE_CODE = re.compile(rb'\[(?P<code>[A-Z-]+)(?: (?P<data>[^\]]*))?\]')
+
+# Longest response line accepted. asyncio's 64 KiB default is too small for
+# UID SEARCH ALL on large mailboxes or for big BODYSTRUCTURE responses.
+STREAM_LIMIT = 32 * 1024 * 1024
+
+UntaggedData = Union[bytes, Tuple[bytes, bytes]]
+
+class AsyncIMAPClient:
+    """
+    Minimal asyncio IMAP4rev1 client using UIDs for all message references.
+
+    Instances are created with ``await AsyncIMAPClient.connect(...)``.
+    Untagged responses of the most recent command are kept in
+    ``untagged_responses`` keyed by response type, as imaplib does.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the client on an open stream. Use connect() instead.
+
+        Args:
+            reader: Stream to read server responses from
+            writer: Stream to write commands to
+            timeout: Seconds to wait for each server response line
+        """
+        self._reader = reader
+        self._writer = writer
+        self.timeout = timeout
+        self._tag_counter = 0
+        self._capabilities: Optional[Tuple[bytes, ...]] = None
+        self._idle_tag: Optional[bytes] = None
+        self.untagged_responses: Dict[str, List[UntaggedData]] = {}
+
+    @classmethod
+    async def connect(cls, host: str, port: int = 993, ssl: bool = True,
+                      timeout: Optional[float] = 60.0) -> "AsyncIMAPClient":
+        """
+        Open a connection and read the server greeting.
+
+        Args:
+            host: IMAP server hostname
+            port: IMAP server port
+            ssl: Whether to use implicit TLS
+            timeout: Seconds to wait for each server response line
+
+        Returns:
+            AsyncIMAPClient: Connected, not yet authenticated client
+        """
+        ssl_context = ssl_lib.create_default_context() if ssl else None
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context, limit=STREAM_LIMIT), timeout
+        )
+        client = cls(reader, writer, timeout)
+        greeting = await client._read_line()
+        if not greeting.startswith(b'* OK'):
+            client.shutdown()
+            raise IMAPClientError(f"Unexpected server greeting: {greeting!r}")
+        return client
+
+    # -------------------------------------------------------------------------
+    # Commands
+    # -------------------------------------------------------------------------
+
+    async def oauth2_login(self, user: str, access_token: str) -> bytes:
+        """Authenticate using the XOAUTH2 SASL mechanism."""
+        auth_string = base64.b64encode(f"user={user}\1auth=Bearer {access_token}\1\1".encode())
+        challenges = iter([auth_string])
+        try:
+            # A failed login gets a second continuation carrying the error, which must be answered empty
+            return await self._command(b'AUTHENTICATE', b'XOAUTH2',
+                                       continuation=lambda _: next(challenges, b''))
+        except IMAPClientAbortError:
+            raise
+        except IMAPClientError as e:
+            raise LoginError(str(e)) from e
+
+    async def capabilities(self) -> Tuple[bytes, ...]:
+        """Get the server capabilities, issuing CAPABILITY once per connection."""
+        if self._capabilities is None:
+            await self._command(b'CAPABILITY')
+            data = self.untagged_responses.get('CAPABILITY', [b''])[-1]
+            self._capabilities = tuple(data.upper().split())
+        return self._capabilities
+
+    async def has_capability(self, capability: str) -> bool:
+        """Check if the server supports a capability."""
+        return capability.upper().encode() in await self.capabilities()
+
+    async def enable(self, *capabilities: str) -> List[bytes]:
+        """
+        Activate server side capability extensions (RFC 5161).
+
+        Returns:
+            List[bytes]: The extensions the server enabled
+        """
+        await self._command(b'ENABLE', *(c.encode() for c in capabilities))
+        return [name for line in self.untagged_responses.get('ENABLED', []) for name in line.split()]
+
+    async def select_folder(self, folder: str, readonly: bool = False) -> Dict[bytes, object]:
+        """
+        Select a folder.
+
+        Returns:
+            Dict[bytes, object]: The SELECT response, keyed like IMAPClient.select_folder()
+        """
+        await self._command(b'EXAMINE' if readonly else b'SELECT', self._quote_folder(folder))
+
+        info: Dict[bytes, object] = {}
+        for key in ('EXISTS', 'RECENT'):
+            if key in self.untagged_responses:
+                info[key.encode()] = int(self.untagged_responses[key][-1])
+        for line in self.untagged_responses.get('OK', []):
+            match = _RESPONSE_CODE.match(line)
+            if match and match.group('code') in (b'UIDVALIDITY', b'UIDNEXT', b'HIGHESTMODSEQ'):
+                info[match.group('code')] = int(match.group('data'))
+        info[b'READ-WRITE'] = not readonly
+        return info
+
+    async def search(self, criteria: Sequence[str]) -> List[int]:
+        """Run UID SEARCH with criteria such as ['UID', '10:*'] and return matching UIDs."""
+        await self._command(b'UID', b'SEARCH', *(str(c).encode() for c in criteria))
+        return parse_message_list([self.untagged_responses.get('SEARCH', [b''])[-1]])
+
+    async def fetch(self, messages: Union[str, Sequence[int]], data: Sequence[str],
+                    modifiers: Optional[Sequence[str]] = None) -> Dict[int, dict]:
+        """
+        Run UID FETCH and return the parsed response keyed by UID.
+
+        Args:
+            messages: UIDs, or a UID set string such as '1:100'
+            data: FETCH data items (e.g. ['ENVELOPE', 'FLAGS'])
+            modifiers: FETCH modifiers (e.g. ['CHANGEDSINCE 42'])
+
+        Returns:
+            Dict[int, dict]: FETCH data per UID, as returned by IMAPClient.fetch()
+        """
+        if not messages:
+            return {}
+        message_set = messages if isinstance(messages, str) else ','.join(str(uid) for uid in messages)
+        args = [b'UID', b'FETCH', message_set.encode(), f"({' '.join(data)})".encode()]
+        if modifiers:
+            args.append(f"({' '.join(modifiers)})".encode())
+        await self._command(*args)
+        return dict(parse_fetch_response(self.untagged_responses.get('FETCH', []), uid_is_key=True))
+
+    async def idle(self) -> None:
+        """
+        Start IDLE (RFC 2177). The server then pushes mailbox changes, which are
+        read with idle_check(), until idle_done() is called.
+        """
+        self._idle_tag = await self._send_command(b'IDLE')
+        line = await self._read_line()
+        while line.startswith(b'* '):
+            await self._handle_untagged(line[2:])
+            line = await self._read_line()
+        if not line.startswith(b'+'):
+            self._idle_tag = None
+            raise IMAPClientError(f"IDLE failed: {line.decode(errors='replace')}")
+
+    async def idle_check(self, timeout: Optional[float] = None) -> List[Tuple[Union[int, bytes], bytes]]:
+        """
+        Wait for the server to push a response while idling.
+
+        Args:
+            timeout: Seconds to wait; None waits until a response arrives
+
+        Returns:
+            List of (message number, type) such as (3, b'EXISTS') or
+            (type, text) such as (b'OK', b'Still here'); empty on timeout
+        """
+        try:
+            line = await asyncio.wait_for(self._read_line(timed=False), timeout)
+        except asyncio.TimeoutError:
+            return []
+        if not line.startswith(b'* '):
+            raise IMAPClientError(f"Unexpected response line while idling: {line!r}")
+        match = _UNTAGGED_NUMBERED.match(line[2:])
+        if match:
+            return [(int(match.group('number')), match.group('type').upper())]
+        match = _UNTAGGED.match(line[2:])
+        if not match:
+            raise IMAPClientError(f"Unparseable untagged response: {line!r}")
+        return [(match.group('type').upper(), match.group('data') or b'')]
+
+    async def idle_done(self) -> bytes:
+        """End IDLE and return the text of the tagged response."""
+        tag, self._idle_tag = self._idle_tag, None
+        self._writer.write(b'DONE\r\n')
+        await self._writer.drain()
+        return await self._read_response(tag, b'IDLE')
+
+    async def noop(self) -> bytes:
+        """Send NOOP, e.g. to check that the connection is alive."""
+        return await self._command(b'NOOP')
+
+    async def logout(self) -> None:
+        """Log out and close the connection."""
+        try:
+            await self._command(b'LOGOUT')
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Close the connection without logging out."""
+        self._writer.close()
+
+    # -------------------------------------------------------------------------
+    # Protocol Handling
+    # -------------------------------------------------------------------------
+
+    def _quote_folder(self, folder: str) -> bytes:
+        """Encode a folder name as a quoted modified UTF-7 string."""
+        encoded = encode_utf7(folder)
+        return b'"' + encoded.replace(b'\\', b'\\\\').replace(b'"', b'\\"') + b'"'
+
+    async def _read_line(self, timed: bool = True) -> bytes:
+        """Read one response line without its CRLF, waiting at most ``timeout`` unless ``timed`` is False."""
+        try:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout if timed else None)
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            raise IMAPClientAbortError(f"Connection to IMAP server lost: {e!r}") from e
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            # The rest of the line is still unread, so the connection can't be used any more
+            raise IMAPClientAbortError(f"IMAP response line longer than {STREAM_LIMIT} bytes") from e
+        if not line.endswith(b'\n'):
+            raise IMAPClientAbortError("Connection to IMAP server closed")
+        return line.rstrip(b'\r\n')
+
+    async def _command(self, *args: bytes,
+                       continuation: Optional[Callable[[bytes], bytes]] = None) -> bytes:
+        """
+        Send a tagged command and collect its untagged responses.
+
+        Args:
+            *args: Command name and arguments
+            continuation: Produces the reply to each '+' continuation request
+
+        Returns:
+            bytes: Text of the tagged OK response
+
+        Raises:
+            IMAPClientError: If the server answers NO or BAD
+        """
+        tag = await self._send_command(*args)
+        return await self._read_response(tag, args[0], continuation)
+
+    async def _send_command(self, *args: bytes) -> bytes:
+        """Send a command under a new tag and return the tag."""
+        self._tag_counter += 1
+        tag = f"A{self._tag_counter:04d}".encode()
+        self.untagged_responses = {}
+        self._writer.write(b' '.join((tag,) + args) + b'\r\n')
+        await self._writer.drain()
+        return tag
+
+    async def _read_response(self, tag: bytes, name: bytes,
+                             continuation: Optional[Callable[[bytes], bytes]] = None) -> bytes:
+        """Collect untagged responses until the tagged response of a command arrives."""
+        while True:
+            line = await self._read_line()
+            if line.startswith(tag + b' '):
+                status, _, text = line[len(tag) + 1:].partition(b' ')
+                if status.upper() != b'OK':
+                    raise IMAPClientError(f"{name.decode()} failed: {text.decode(errors='replace')}")
+                return text
+            if line.startswith(b'+'):
+                if continuation is None:
+                    raise IMAPClientError(f"Unexpected continuation request: {line!r}")
+                self._writer.write(continuation(line[2:]) + b'\r\n')
+                await self._writer.drain()
+                continue
+            if line.startswith(b'* '):
+                await self._handle_untagged(line[2:])
+                continue
+            raise IMAPClientError(f"Unexpected response line: {line!r}")
+
+    async def _handle_untagged(self, text: bytes) -> None:
+        """Store an untagged response, reading any literals it announces."""
+        match = _UNTAGGED_NUMBERED.match(text)
+        if match:
+            data = match.group('number') + (b' ' + match.group('data') if match.group('data') else b'')
+        else:
+            match = _UNTAGGED.match(text)
+            if not match:
+                raise IMAPClientError(f"Unparseable untagged response: {text!r}")
+            data = match.group('data') or b''
+        response_type = match.group('type').decode().upper()
+
+        if response_type == 'BYE':
+            log_operation(logger, 'debug', f"IMAP server said BYE: {data.decode(errors='replace')}")
+
+        responses = self.untagged_responses.setdefault(response_type, [])
+        literal = _LITERAL.search(data)
+        while literal:
+            try:
+                payload = await asyncio.wait_for(
+                    self._reader.readexactly(int(literal.group('size'))), self.timeout
+                )
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError) as e:
+                raise IMAPClientAbortError(f"Connection to IMAP server lost: {e!r}") from e
+            responses.append((data, payload))
+            data = await self._read_line()
+            literal = _LITERAL.search(data)
+        responses.append(data)
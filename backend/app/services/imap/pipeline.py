@@ -0,0 +1,107 @@
+"""
+Bounded stage pipeline for IMAP ingestion.
+
+A refresh is split into stages (fetch, parse, persist) connected by small
+bounded queues, so each stage works on one chunk while the next one handles
+the previous chunk. The bounded queues provide backpressure: a fast fetch
+stage blocks instead of buffering the mailbox in memory, which keeps peak
+memory flat regardless of how many messages are synced.
+
+Stages are coroutines; a stage running in a worker thread (the threaded
+IMAPClient transport) hands chunks over with put_threadsafe().
+"""
+
+# Standard library imports
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, List, Sequence
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+_END = object()
+
+class PipelineAborted(Exception):
+    """Raised in a stage that hands over work after another stage failed."""
+
+class StageQueue:
+    """
+    Bounded hand-off between two pipeline stages.
+
+    The producing stage calls put() for each item and close() when done; the
+    consuming stage iterates with ``async for``. Once abort() is called, any
+    pending or later put() raises PipelineAborted so the producer stops
+    instead of blocking on a consumer that is gone.
+    """
+
+    def __init__(self, maxsize: int = 2):
+        """
+        Initialize the queue. Must be called on the event loop.
+
+        Args:
+            maxsize: Number of items that may be waiting for the consumer
+        """
+        self._queue: asyncio.Queue = asyncio.Queue(max(1, maxsize))
+        self._aborted = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    async def put(self, item: Any) -> None:
+        """Hand an item to the consumer, waiting while the queue is full."""
+        if self._aborted.is_set():
+            raise PipelineAborted()
+        put = asyncio.ensure_future(self._queue.put(item))
+        aborted = asyncio.ensure_future(self._aborted.wait())
+        try:
+            await asyncio.wait({put, aborted}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            put.cancel()
+            raise
+        finally:
+            aborted.cancel()
+        if not put.done():
+            put.cancel()
+            raise PipelineAborted()
+
+    def put_threadsafe(self, item: Any) -> None:
+        """put() for producers running in a worker thread."""
+        asyncio.run_coroutine_threadsafe(self.put(item), self._loop).result()
+
+    async def close(self) -> None:
+        """Signal the consumer that no more items follow."""
+        await self.put(_END)
+
+    def abort(self) -> None:
+        """Make producers stop, e.g. because the consumer failed."""
+        self._aborted.set()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            item = await self._queue.get()
+            if item is _END:
+                return
+            yield item
+
+async def run_pipeline(stages: Sequence[Awaitable[Any]], queues: Sequence[StageQueue]) -> List[Any]:
+    """
+    Run pipeline stages concurrently and collect their results.
+
+    If any stage fails, the queues are aborted, the other stages are cancelled
+    and the first error is raised.
+
+    Args:
+        stages: Stage coroutines, in pipeline order
+        queues: The queues connecting the stages
+
+    Returns:
+        List[Any]: The result of each stage, in the order given
+    """
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for queue in queues:
+            queue.abort()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,462 @@
+"""
+Pool of authenticated IMAP connections for Email Essence.
+
+Opening an IMAP session costs a TCP connect, a TLS handshake and an XOAUTH2
+login. The pool keeps authenticated connections around between refreshes so
+steady polling only pays those handshakes once per connection.
+"""
+
+# Standard library imports
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
+
+# Third-party imports
+from imapclient import IMAPClient
+
+# Internal imports
+from app.services.imap.aio_client import AsyncIMAPClient
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection for an account became free in time."""
+
+ClientT = TypeVar('ClientT', IMAPClient, AsyncIMAPClient)
+
+@dataclass
+class _PooledConnection(Generic[ClientT]):
+    """An authenticated connection and the token it logged in with."""
+    client: ClientT
+    email_account: str
+    token: str
+    last_used: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+
+class _ConnectionPoolBase(Generic[ClientT]):
+    """
+    Bookkeeping shared by the threaded and asyncio connection pools.
+    
+    Connections are pooled per email account and only reused with the token
+    they logged in with; when the token rotates, an idle connection is logged
+    out and replaced by a fresh login. The number of open connections per
+    account is capped, since Gmail allows at most 15 simultaneous IMAP
+    connections per account and the user's own mail clients share that limit.
+    Connections idle for longer than ``idle_timeout`` are closed, and ones
+    idle for longer than ``health_check_interval`` are checked with NOOP
+    before being handed out.
+    
+    The methods here only update the pool's state; subclasses call them while
+    holding their own lock and do the network IO outside of it.
+    """
+    
+    def __init__(self, connect: Callable[[str, str], Any],
+                 max_per_account: int = 5,
+                 idle_timeout: float = 300.0,
+                 health_check_interval: float = 60.0,
+                 acquire_timeout: float = 30.0):
+        """
+        Initialize the connection pool.
+        
+        Args:
+            connect: Opens and authenticates a connection for (email_account, token)
+            max_per_account: Maximum number of open connections per account
+            idle_timeout: Seconds after which an unused connection is closed
+            health_check_interval: Seconds of idleness after which a connection is checked with NOOP
+            acquire_timeout: Seconds to wait for a free connection when the account is at its cap
+        """
+        self._connect = connect
+        self.max_per_account = max(1, max_per_account)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        
+        self._idle: Dict[str, List[_PooledConnection[ClientT]]] = {}
+        self._open_count: Dict[str, int] = {}
+    
+    def _try_take(self, email_account: str, token: str) -> Optional[
+            Tuple[Optional[_PooledConnection[ClientT]], Optional[_PooledConnection[ClientT]]]]:
+        """
+        Decide how to serve a request for a connection, without waiting.
+        
+        Returns:
+            None if the account is at its cap and the caller has to wait, otherwise
+            a tuple of (idle connection to reuse or None to open a new one on a
+            reserved slot, idle connection with a rotated token whose slot was taken over)
+        """
+        idle = self._idle.setdefault(email_account, [])
+        pooled = next((p for p in reversed(idle) if p.token == token), None)
+        if pooled is not None:
+            idle.remove(pooled)
+            return pooled, None
+        if self._open_count.get(email_account, 0) < self.max_per_account:
+            # Reserve the slot before connecting outside the lock
+            self._open_count[email_account] = self._open_count.get(email_account, 0) + 1
+            return None, None
+        if idle:
+            # At the cap, but an idle connection still holds a rotated token:
+            # reuse its slot for a fresh login
+            return None, idle.pop(0)
+        return None
+    
+    def _pop_expired(self) -> List[_PooledConnection[ClientT]]:
+        """Remove connections idle for longer than ``idle_timeout`` and free their slots."""
+        now = time.monotonic()
+        expired = []
+        for email_account, idle in self._idle.items():
+            keep = []
+            for pooled in idle:
+                (expired if now - pooled.last_used > self.idle_timeout else keep).append(pooled)
+            self._idle[email_account] = keep
+        for pooled in expired:
+            self._open_count[pooled.email_account] -= 1
+        return expired
+    
+    def _pop_all_idle(self) -> List[_PooledConnection[ClientT]]:
+        """Remove every idle connection and free their slots."""
+        idle = [pooled for connections in self._idle.values() for pooled in connections]
+        self._idle.clear()
+        for pooled in idle:
+            self._open_count[pooled.email_account] -= 1
+        return idle
+    
+    def _push_idle(self, pooled: _PooledConnection[ClientT]) -> None:
+        """Put a connection back among the idle ones."""
+        pooled.last_used = pooled.last_checked = time.monotonic()
+        self._idle.setdefault(pooled.email_account, []).append(pooled)
+    
+    def _needs_health_check(self, pooled: _PooledConnection[ClientT]) -> bool:
+        return time.monotonic() - pooled.last_checked >= self.health_check_interval
+    
+    def _exhausted(self, email_account: str) -> PoolExhaustedError:
+        return PoolExhaustedError(
+            f"No IMAP connection available for {email_account} "
+            f"({self.max_per_account} in use)"
+        )
+    
+    def _stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            email_account: {"open": count, "idle": len(self._idle.get(email_account, []))}
+            for email_account, count in self._open_count.items()
+            if count
+        }
+
+class IMAPConnectionPool(_ConnectionPoolBase[IMAPClient]):
+    """
+    Thread-safe pool of authenticated IMAPClient connections.
+    
+    See _ConnectionPoolBase for the pooling policy. Logins and logouts run
+    outside the lock, so a slow server only blocks the thread using it.
+    """
+    
+    def __init__(self, connect: Callable[[str, str], IMAPClient],
+                 max_per_account: int = 5,
+                 idle_timeout: float = 300.0,
+                 health_check_interval: float = 60.0,
+                 acquire_timeout: float = 30.0):
+        """Initialize the connection pool. See _ConnectionPoolBase for the arguments."""
+        super().__init__(connect, max_per_account, idle_timeout, health_check_interval, acquire_timeout)
+        self._condition = threading.Condition()
+    
+    # -------------------------------------------------------------------------
+    # Public Methods
+    # -------------------------------------------------------------------------
+    
+    @contextmanager
+    def connection(self, email_account: str, token: str) -> Iterator[IMAPClient]:
+        """
+        Borrow an authenticated connection for the duration of a ``with`` block.
+        
+        The connection goes back to the pool on a clean exit. If the block
+        raises, the connection may be in an unknown protocol state, so it is
+        closed instead.
+        
+        Args:
+            email_account: Email address to log in as
+            token: OAuth access token for the account
+            
+        Yields:
+            IMAPClient: Authenticated connection
+        """
+        pooled = self._acquire(email_account, token)
+        try:
+            yield pooled.client
+        except BaseException:
+            self._discard(pooled)
+            raise
+        else:
+            self._release(pooled)
+    
+    def evict_idle(self) -> int:
+        """
+        Close connections that have been idle for longer than ``idle_timeout``.
+        
+        Returns:
+            int: Number of connections closed
+        """
+        with self._condition:
+            expired = self._pop_expired()
+            if expired:
+                self._condition.notify_all()
+        
+        for pooled in expired:
+            self._logout(pooled)
+        return len(expired)
+    
+    def close_all(self) -> None:
+        """Log out every idle connection, e.g. on application shutdown."""
+        with self._condition:
+            idle = self._pop_all_idle()
+            self._condition.notify_all()
+        
+        for pooled in idle:
+            self._logout(pooled)
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of open and idle connections per account."""
+        with self._condition:
+            return self._stats()
+    
+    # -------------------------------------------------------------------------
+    # Internal Methods
+    # -------------------------------------------------------------------------
+    
+    def _acquire(self, email_account: str, token: str) -> _PooledConnection[IMAPClient]:
+        """Take a matching idle connection, or reserve a slot and log in."""
+        self.evict_idle()
+        deadline = time.monotonic() + self.acquire_timeout
+        
+        while True:
+            with self._condition:
+                while (taken := self._try_take(email_account, token)) is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._exhausted(email_account)
+                    self._condition.wait(remaining)
+            pooled, stale = taken
+            
+            if stale is not None:
+                log_operation(logger, 'debug', f"Token rotated for {email_account}, re-logging in")
+                self._logout(stale)
+            
+            if pooled is None:
+                return self._open(email_account, token)
+            
+            if self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled)
+    
+    def _open(self, email_account: str, token: str) -> _PooledConnection[IMAPClient]:
+        """Log in on a reserved slot, freeing the slot if the login fails."""
+        try:
+            client = self._connect(email_account, token)
+        except BaseException:
+            self._free_slot(email_account)
+            raise
+        log_operation(logger, 'debug', f"Opened pooled IMAP connection for {email_account}")
+        return _PooledConnection(client=client, email_account=email_account, token=token)
+    
+    def _is_healthy(self, pooled: _PooledConnection[IMAPClient]) -> bool:
+        """Check a connection with NOOP if it has been idle for a while."""
+        if not self._needs_health_check(pooled):
+            return True
+        try:
+            pooled.client.noop()
+            pooled.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            log_operation(logger, 'debug', f"Pooled IMAP connection for {pooled.email_account} failed NOOP: {e}")
+            return False
+    
+    def _release(self, pooled: _PooledConnection[IMAPClient]) -> None:
+        """Return a connection to the pool."""
+        with self._condition:
+            self._push_idle(pooled)
+            self._condition.notify_all()
+    
+    def _discard(self, pooled: _PooledConnection[IMAPClient]) -> None:
+        """Close a connection and free its slot."""
+        self._logout(pooled)
+        self._free_slot(pooled.email_account)
+    
+    def _free_slot(self, email_account: str) -> None:
+        with self._condition:
+            self._open_count[email_account] -= 1
+            self._condition.notify_all()
+    
+    def _logout(self, pooled: _PooledConnection[IMAPClient]) -> None:
+        """Log out, ignoring errors from connections that are already dead."""
+        try:
+            pooled.client.logout()
+        except Exception:
+            try:
+                pooled.client.shutdown()
+            except Exception:
+                pass
+
+class AsyncIMAPConnectionPool(_ConnectionPoolBase[AsyncIMAPClient]):
+    """
+    Asyncio pool of authenticated AsyncIMAPClient connections.
+    
+    See _ConnectionPoolBase for the pooling policy. The bookkeeping runs on
+    the event loop, so the condition only serves to wait for a free slot.
+    Idle connections expired while serving a request are logged out in the
+    background rather than delaying the request.
+    """
+    
+    def __init__(self, connect: Callable[[str, str], Awaitable[AsyncIMAPClient]],
+                 max_per_account: int = 5,
+                 idle_timeout: float = 300.0,
+                 health_check_interval: float = 60.0,
+                 acquire_timeout: float = 30.0):
+        """
+        Initialize the connection pool. See _ConnectionPoolBase for the arguments;
+        ``connect`` is a coroutine function here.
+        """
+        super().__init__(connect, max_per_account, idle_timeout, health_check_interval, acquire_timeout)
+        self._condition = asyncio.Condition()
+        self._closing: Set[asyncio.Task] = set()
+    
+    # -------------------------------------------------------------------------
+    # Public Methods
+    # -------------------------------------------------------------------------
+    
+    @asynccontextmanager
+    async def connection(self, email_account: str, token: str) -> AsyncIterator[AsyncIMAPClient]:
+        """
+        Borrow an authenticated connection for the duration of an ``async with`` block.
+        
+        Args:
+            email_account: Email address to log in as
+            token: OAuth access token for the account
+            
+        Yields:
+            AsyncIMAPClient: Authenticated connection
+        """
+        pooled = await self._acquire(email_account, token)
+        try:
+            yield pooled.client
+        except BaseException:
+            await self._discard(pooled)
+            raise
+        else:
+            await self._release(pooled)
+    
+    async def evict_idle(self) -> int:
+        """
+        Close connections that have been idle for longer than ``idle_timeout``.
+        
+        Returns:
+            int: Number of connections closed
+        """
+        async with self._condition:
+            expired = self._pop_expired()
+            if expired:
+                self._condition.notify_all()
+        await asyncio.gather(*(self._logout(pooled) for pooled in expired))
+        return len(expired)
+    
+    async def close_all(self) -> None:
+        """Log out every idle connection, e.g. on application shutdown."""
+        async with self._condition:
+            idle = self._pop_all_idle()
+            self._condition.notify_all()
+        await asyncio.gather(*(self._logout(pooled) for pooled in idle), *self._closing)
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of open and idle connections per account."""
+        return self._stats()
+    
+    # -------------------------------------------------------------------------
+    # Internal Methods
+    # -------------------------------------------------------------------------
+    
+    async def _acquire(self, email_account: str, token: str) -> _PooledConnection[AsyncIMAPClient]:
+        """Take a matching idle connection, or reserve a slot and log in."""
+        await self._evict_in_background()
+        
+        while True:
+            try:
+                pooled, stale = await asyncio.wait_for(self._take(email_account, token), self.acquire_timeout)
+            except asyncio.TimeoutError:
+                raise self._exhausted(email_account)
+            
+            if stale is not None:
+                log_operation(logger, 'debug', f"Token rotated for {email_account}, re-logging in")
+                await self._logout(stale)
+            
+            if pooled is None:
+                try:
+                    client = await self._connect(email_account, token)
+                except BaseException:
+                    await self._free_slot(email_account)
+                    raise
+                log_operation(logger, 'debug', f"Opened pooled async IMAP connection for {email_account}")
+                return _PooledConnection(client=client, email_account=email_account, token=token)
+            
+            if await self._is_healthy(pooled):
+                return pooled
+            await self._discard(pooled)
+    
+    async def _take(self, email_account: str, token: str) -> Tuple[
+            Optional[_PooledConnection[AsyncIMAPClient]], Optional[_PooledConnection[AsyncIMAPClient]]]:
+        """Wait until _try_take() can serve the request."""
+        async with self._condition:
+            while (taken := self._try_take(email_account, token)) is None:
+                await self._condition.wait()
+            return taken
+    
+    async def _evict_in_background(self) -> None:
+        """Free the slots of expired connections now and log them out in a background task."""
+        async with self._condition:
+            expired = self._pop_expired()
+            if not expired:
+                return
+            self._condition.notify_all()
+        for pooled in expired:
+            task = asyncio.create_task(self._logout(pooled))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+    
+    async def _is_healthy(self, pooled: _PooledConnection[AsyncIMAPClient]) -> bool:
+        """Check a connection with NOOP if it has been idle for a while."""
+        if not self._needs_health_check(pooled):
+            return True
+        try:
+            await pooled.client.noop()
+            pooled.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            log_operation(logger, 'debug', f"Pooled IMAP connection for {pooled.email_account} failed NOOP: {e}")
+            return False
+    
+    async def _release(self, pooled: _PooledConnection[AsyncIMAPClient]) -> None:
+        """Return a connection to the pool."""
+        async with self._condition:
+            self._push_idle(pooled)
+            self._condition.notify_all()
+    
+    async def _discard(self, pooled: _PooledConnection[AsyncIMAPClient]) -> None:
+        """Close a connection and free its slot."""
+        await self._logout(pooled)
+        await self._free_slot(pooled.email_account)
+    
+    async def _free_slot(self, email_account: str) -> None:
+        async with self._condition:
+            self._open_count[email_account] -= 1
+            self._condition.notify_all()
+    
+    async def _logout(self, pooled: _PooledConnection[AsyncIMAPClient]) -> None:
+        """Log out, giving up after a few seconds on connections that are already dead."""
+        try:
+            await asyncio.wait_for(pooled.client.logout(), 5)
+        except Exception:
+            pooled.client.shutdown()
@@ -6,7 +6,7 @@ and strategies.
 """
 
 # Standard library imports
-from typing import TypeVar, Generic
+from typing import Any, Dict, Generic, Tuple, TypeVar
 
 # Third-party imports
 from fastapi import Depends, HTTPException
@@ -29,14 +29,16 @@ __all__ = [
     'OpenAIEmailSummarizer',
     'GeminiEmailSummarizer',
     'OpenRouterEmailSummarizer',
-    'get_summarizer'
+    'get_summarizer',
+    'close_summarizers'
 ]
 
-async def get_summarizer(
-    settings: Settings = Depends(get_settings)
-) -> AdaptiveSummarizer[EmailSchema]:
+# Summarizers by the settings they were created from, shared by all requests
+_summarizers: Dict[Tuple[Any, ...], AdaptiveSummarizer[EmailSchema]] = {}
+
+def _create_summarizer(settings: Settings) -> AdaptiveSummarizer[EmailSchema]:
     """
-    Factory function for creating the appropriate summarizer based on settings.
+    Create the summarizer configured in settings.
     
     Args:
         settings: Application settings containing summarizer configuration
@@ -58,7 +60,10 @@ async def get_summarizer(
                 api_key=settings.openai_api_key,
                 prompt_version=settings.summarizer_prompt_version,
                 model=settings.summarizer_model,
-                batch_threshold=settings.summarizer_batch_threshold
+                batch_threshold=settings.summarizer_batch_threshold,
+                input_token_budget=settings.summarizer_input_token_budget,
+                pack_token_budget=settings.summarizer_pack_token_budget,
+                batch_poll_interval=settings.summarizer_batch_poll_interval
             )
         case SummarizerProvider.GOOGLE:
             if not settings.google_api_key:
@@ -70,7 +75,8 @@ async def get_summarizer(
                 api_key=settings.google_api_key,
                 prompt_version=settings.summarizer_prompt_version,
                 model=settings.summarizer_model,
-                batch_threshold=settings.summarizer_batch_threshold
+                batch_threshold=settings.summarizer_batch_threshold,
+                input_token_budget=settings.summarizer_input_token_budget
             )
         case SummarizerProvider.OPENROUTER:
             if not settings.openrouter_api_key:
@@ -81,10 +87,53 @@ async def get_summarizer(
             return OpenRouterEmailSummarizer(
                 api_key=settings.openrouter_api_key,
                 prompt_version=settings.summarizer_prompt_version,
-                batch_threshold=settings.summarizer_batch_threshold
+                batch_threshold=settings.summarizer_batch_threshold,
+                input_token_budget=settings.summarizer_input_token_budget,
+                pack_token_budget=settings.summarizer_pack_token_budget
             )
         case _:
             raise HTTPException(
                 status_code=500,
                 detail=f"Unsupported summarizer provider: {settings.summarizer_provider}"
-            )
\ No newline at end of file
+            )
+
+async def get_summarizer(
+    settings: Settings = Depends(get_settings)
+) -> AdaptiveSummarizer[EmailSchema]:
+    """
+    Get the summarizer configured in settings.
+    
+    The summarizer, and with it the connection pool of its client, is
+    created on first use and reused by later requests with the same settings.
+    
+    Args:
+        settings: Application settings containing summarizer configuration
+        
+    Returns:
+        AdaptiveSummarizer: Configured email summarizer implementation
+        
+    Raises:
+        HTTPException: If the configured summarizer provider is not supported
+    """
+    key = (
+        settings.summarizer_provider,
+        settings.summarizer_model,
+        settings.summarizer_prompt_version,
+        settings.summarizer_batch_threshold,
+        settings.summarizer_input_token_budget,
+        settings.summarizer_pack_token_budget,
+        settings.summarizer_batch_poll_interval,
+        settings.openai_api_key,
+        settings.google_api_key,
+        settings.openrouter_api_key
+    )
+    summarizer = _summarizers.get(key)
+    if summarizer is None:
+        summarizer = _summarizers[key] = _create_summarizer(settings)
+    return summarizer
+
+async def close_summarizers() -> None:
+    """Close the clients of all summarizers, e.g. on application shutdown."""
+    while _summarizers:
+        _, summarizer = _summarizers.popitem()
+        await summarizer.aclose()
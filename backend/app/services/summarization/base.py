@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from typing import Generic, List, Optional, TypeVar
 from datetime import datetime, timezone
 import asyncio
+from collections import deque
 
 # Internal imports
 from app.utils.helpers import get_logger
@@ -14,12 +15,16 @@ from app.services.summarization.types import(
     ModelConfig
 ) 
 from app.services.summarization.prompts import PromptManager
+from app.services.summarization.content import DEFAULT_INPUT_TOKEN_BUDGET, TokenCounter, content_hash, prepare_body
 from app.utils.config import PromptVersion
 
 """ ( Pipeline )
     EmailSchema → content preparation → LLM processing → SummarySchema
 """
 
+# Summarizers live for the whole process, so only the most recent metrics are kept
+MAX_METRICS = 1000
+
 # Constrain generic type to EmailSchema
 T = TypeVar('T', bound=EmailSchema)
 class AdaptiveSummarizer(ABC, Generic[T]):
@@ -36,7 +41,9 @@ class AdaptiveSummarizer(ABC, Generic[T]):
         batch_threshold: int = 10,
         max_batch_size: int = 50,
         timeout: float = 30.0,
-        model_config: Optional[ModelConfig] = None
+        model_config: Optional[ModelConfig] = None,
+        input_token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET,
+        tokenizer_model: Optional[str] = None
     ):
         self._backend = model_backend
         self._prompt_manager = prompt_manager
@@ -44,7 +51,9 @@ class AdaptiveSummarizer(ABC, Generic[T]):
         self.max_batch_size = max_batch_size
         self.timeout = timeout
         self.model_config = model_config or {}
-        self._metrics: List[SummaryMetrics] = []
+        self.input_token_budget = input_token_budget
+        self._token_counter = TokenCounter(tokenizer_model or model_backend.model_info["model"])
+        self._metrics: deque[SummaryMetrics] = deque(maxlen=MAX_METRICS)
         self._logger = get_logger(self.__class__.__name__, 'service')
 
     @abstractmethod
@@ -59,6 +68,19 @@ class AdaptiveSummarizer(ABC, Generic[T]):
         """
         raise NotImplementedError
 
+    def _body_text(self, body: str) -> str:
+        """Reduce an email body to plain text without quoted history or signature, within the token budget."""
+        return prepare_body(body, self._token_counter, self.input_token_budget)
+
+    def content_hash(self, email: T) -> str:
+        """Summary cache key of an email: equal for emails this summarizer would summarize alike."""
+        return content_hash(
+            self._body_text(email.body),
+            email.sender,
+            self._prompt_manager.prompt_version,
+            self._backend.model_info["model"]
+        )
+
     @abstractmethod
     def create_summary(
         self,
@@ -159,6 +181,33 @@ class AdaptiveSummarizer(ABC, Generic[T]):
                 error_count=0 if success else 1
             ))
 
+    async def process_offline(self, emails: List[T]) -> List[SummarySchema]:
+        """Process items through the provider's Batch API, which may take up to a day"""
+        offline_generate = getattr(self._backend, 'offline_generate_summaries', None)
+        if offline_generate is None:
+            self._logger.warning(f"{type(self._backend).__name__} has no Batch API, processing in batches instead")
+            return await self.process_batch(emails)
+
+        contents = [await self.prepare_content(email) for email in emails]
+        start_time = datetime.now(timezone.utc)
+        results = await offline_generate(contents, self.model_config)
+
+        summaries = [
+            self.create_summary(email.email_id, *result, email.google_id)
+            for email, result in zip(emails, results) if result is not None
+        ]
+        content_tokens = sum(len(content.split()) for content in contents)
+        completion_tokens = sum(len(summary.summary_text.split()) for summary in summaries)
+        self._metrics.append(SummaryMetrics(
+            processing_time=(datetime.now(timezone.utc) - start_time).total_seconds(),
+            token_count=content_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=content_tokens + completion_tokens,
+            batch_size=len(emails),
+            error_count=len(emails) - len(summaries)
+        ))
+        return summaries
+
     async def summarize(
         self,
         items: List[T],
@@ -201,6 +250,8 @@ class AdaptiveSummarizer(ABC, Generic[T]):
                 if len(items) < self.batch_threshold:
                     return [await self.process_single(item) for item in items]
                 return await self.process_batch(items)
+            case ProcessingStrategy.OFFLINE:
+                return await self.process_offline(items)
 
     @property
     def prompt_manager(self) -> PromptManager:
@@ -213,8 +264,12 @@ class AdaptiveSummarizer(ABC, Generic[T]):
     @property
     def metrics(self) -> List[SummaryMetrics]:
         """Access collected processing metrics"""
-        return self._metrics.copy()
+        return list(self._metrics)
 
     def reset_metrics(self) -> None:
         """Reset collected metrics"""
-        self._metrics.clear()
\ No newline at end of file
+        self._metrics.clear()
+
+    async def aclose(self) -> None:
+        """Close the connections of the model backend."""
+        await self._backend.aclose()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Provider Batch API jobs for offline summarization.
+
+Requests are written as JSONL, uploaded and submitted to the provider's
+batch endpoint, which completes them within a day at a lower price and
+outside the rate limits of interactive requests. The job is polled until
+it ends and the responses are returned in the order of the requests.
+"""
+
+# Standard library imports
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+# Third-party imports
+from openai import AsyncOpenAI
+
+# Internal imports
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+_FINISHED_STATUSES = frozenset(["completed", "failed", "expired", "cancelled"])
+
+def build_batch_file(bodies: List[Dict[str, Any]], endpoint: str = CHAT_COMPLETIONS_ENDPOINT) -> bytes:
+    """
+    Write request bodies as a Batch API input file.
+
+    Args:
+        bodies: Request bodies, e.g. chat completion parameters
+        endpoint: Endpoint every request is sent to
+
+    Returns:
+        bytes: JSONL with one request per line, identified by its index
+    """
+    return "".join(
+        json.dumps({"custom_id": str(index), "method": "POST", "url": endpoint, "body": body}) + "\n"
+        for index, body in enumerate(bodies)
+    ).encode()
+
+def parse_batch_output(text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Read the response bodies from a Batch API output file.
+
+    Args:
+        text: JSONL output file
+        count: Number of requests in the job
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: Response body of each request, None for failed requests
+    """
+    bodies: List[Optional[Dict[str, Any]]] = [None] * count
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = json.loads(line)
+            index = int(result["custom_id"])
+            response = result.get("response") or {}
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < count and response.get("status_code") == 200:
+            bodies[index] = response.get("body")
+    return bodies
+
+async def run_batch_job(
+    client: AsyncOpenAI,
+    bodies: List[Dict[str, Any]],
+    poll_interval: float,
+    endpoint: str = CHAT_COMPLETIONS_ENDPOINT
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Submit requests as a Batch API job and wait for their responses.
+
+    Cancelling the caller cancels the job at the provider.
+
+    Args:
+        client: Client of an API with the OpenAI Batch API
+        bodies: Request bodies
+        poll_interval: Seconds between status checks of the job
+        endpoint: Endpoint every request is sent to
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: Response body of each request, None for failed requests
+    """
+    input_file = await client.files.create(
+        file=("summaries.jsonl", build_batch_file(bodies, endpoint)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=endpoint,
+        completion_window=COMPLETION_WINDOW
+    )
+    log_operation(logger, 'info', f"Submitted batch {batch.id} of {len(bodies)} requests")
+
+    try:
+        while batch.status not in _FINISHED_STATUSES:
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+    except asyncio.CancelledError:
+        try:
+            await client.batches.cancel(batch.id)
+        except Exception as e:
+            log_operation(logger, 'warning', f"Failed to cancel batch {batch.id}: {e}")
+        raise
+
+    # Expired and cancelled jobs still return the responses completed so far
+    if not batch.output_file_id:
+        log_operation(logger, 'error', f"Batch {batch.id} ended as {batch.status} without results")
+        return [None] * len(bodies)
+    output = await client.files.content(batch.output_file_id)
+    results = parse_batch_output(output.text, len(bodies))
+    log_operation(logger, 'info',
+        f"Batch {batch.id} ended as {batch.status}: "
+        f"{sum(result is not None for result in results)} of {len(bodies)} requests succeeded"
+    )
+    return results
@@ -0,0 +1,66 @@
+"""
+HTTP clients for the LLM providers.
+
+Summarizers live for the whole process (see get_summarizer), so their
+clients keep connections to the provider open between requests instead of
+paying a TLS handshake per summary. The connection pool of every client is
+sized by the summarizer_max_connections setting.
+"""
+
+# Standard library imports
+from typing import Optional
+
+# Third-party imports
+import httpx
+from google import genai
+from google.genai import types
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Internal imports
+from app.utils.config import get_settings
+
+def http_limits() -> httpx.Limits:
+    """Connection pool limits for LLM provider clients."""
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.summarizer_max_connections,
+        max_keepalive_connections=settings.summarizer_max_connections,
+        keepalive_expiry=settings.summarizer_keepalive_expiry
+    )
+
+def create_openai_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Create an OpenAI API client with a tuned connection pool.
+
+    Args:
+        api_key: API key of the provider
+        base_url: Endpoint of an OpenAI compatible API, defaults to OpenAI
+
+    Returns:
+        AsyncOpenAI: Client that closes its pool with close()
+    """
+    # Retries are left to the backends so rate limits reach their concurrency limiter
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(limits=http_limits()),
+        max_retries=0
+    )
+
+def create_genai_client(api_key: str) -> genai.Client:
+    """
+    Create a Gemini API client with a tuned connection pool.
+
+    Args:
+        api_key: Google API key
+
+    Returns:
+        genai.Client: Client whose async pool is closed with client.aio.aclose()
+    """
+    # A custom transport also keeps the SDK on httpx when aiohttp is installed
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            async_client_args={"transport": httpx.AsyncHTTPTransport(limits=http_limits())}
+        )
+    )
@@ -0,0 +1,235 @@
+"""
+Adaptive concurrency limits for LLM provider requests.
+
+Each provider and model gets one limiter per process, shared by all
+requests, whose limit follows the capacity the provider actually grants:
+it grows additively while responses are fast and successful, and shrinks
+multiplicatively on rate limits, overload errors and rising latency
+(AIMD). A Retry-After header pauses all requests to the provider until it
+has passed.
+"""
+
+# Standard library imports
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Optional
+
+# Third-party imports
+import httpx
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+# Internal imports
+from app.utils.config import get_settings
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+MAX_RETRY_AFTER = 120.0  # Longest Retry-After honoured, in seconds
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider error (OpenAI or Google SDK), if it has one."""
+    code = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    return code if isinstance(code, int) else None
+
+def is_rate_limit(error: BaseException) -> bool:
+    """Whether an error means the provider's rate limit was hit."""
+    return status_code(error) == 429
+
+def is_overload(error: BaseException) -> bool:
+    """Whether an error means the provider is overloaded or unreachable."""
+    code = status_code(error)
+    if code is not None:
+        return code >= 500
+    return isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError)) or (
+        type(error).__name__ in ('APITimeoutError', 'APIConnectionError')
+    )
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds a provider asked to wait before retrying, from the error's response headers.
+
+    Args:
+        error: Error raised by a provider SDK
+
+    Returns:
+        Optional[float]: Delay in seconds, capped at MAX_RETRY_AFTER, None if not given
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            delay = float(headers['retry-after-ms']) / 1000
+        elif headers.get('retry-after'):
+            value = headers['retry-after']
+            try:
+                delay = float(value)
+            except ValueError:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+        else:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+class wait_retry_after(wait_base):
+    """Tenacity wait that honours Retry-After and otherwise uses a fallback wait."""
+
+    def __init__(self, fallback: Callable[[RetryCallState], float]):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after(error) if error else None
+        return delay if delay is not None else self.fallback(retry_state)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the requests in flight to one provider model.
+
+    Each success adds 1/limit to the limit (one per round of requests) as
+    long as the recent latency stays within latency_tolerance times the
+    long-term latency. Rate limits, overload errors and slow responses
+    multiply it by backoff, at most once per recent latency so one burst of
+    failures counts once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Provider and model, for logging
+            initial_limit: Requests allowed in flight before any feedback
+            min_limit: Lowest limit reached by backing off
+            max_limit: Highest limit reached by growing
+            backoff: Factor applied to the limit on congestion
+            latency_tolerance: Ratio of recent to long-term latency treated as congestion
+        """
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self._recent_latency: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._changed: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def _acquire(self) -> None:
+        changed = self._condition()
+        async with changed:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    # Sleep outside the lock so releases are not blocked meanwhile
+                    changed.release()
+                    try:
+                        await asyncio.sleep(pause)
+                    finally:
+                        await changed.acquire()
+                elif self.in_flight < max(self.min_limit, int(self.limit)):
+                    self.in_flight += 1
+                    return
+                else:
+                    await changed.wait()
+
+    async def _release(self) -> None:
+        changed = self._condition()
+        async with changed:
+            self.in_flight -= 1
+            changed.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, weight: float = 1.0) -> AsyncIterator[None]:
+        """
+        Hold one of the limited request slots while sending a request, reporting its outcome.
+
+        Args:
+            weight: Expected size of the request relative to a single summary, e.g. the
+                number of emails in a packed request; its latency is divided by it
+        """
+        await self._acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as error:
+            self.on_error(error)
+            raise
+        else:
+            self.on_success((time.monotonic() - start) / max(weight, 1.0))
+        finally:
+            await self._release()
+
+    def on_success(self, latency: float) -> None:
+        """Record a successful request and its latency per unit of weight."""
+        if self._recent_latency is None:
+            self._recent_latency = self._baseline_latency = latency
+            return
+        self._recent_latency += 0.2 * (latency - self._recent_latency)
+        self._baseline_latency += 0.02 * (latency - self._baseline_latency)
+        if self._recent_latency > self.latency_tolerance * self._baseline_latency:
+            self._decrease(f"latency {self._recent_latency:.1f}s over {self._baseline_latency:.1f}s")
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_error(self, error: BaseException) -> None:
+        """Record a failed request, backing off if it signals congestion."""
+        if is_rate_limit(error):
+            delay = retry_after(error)
+            if delay:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._decrease("rate limited" + (f", retrying after {delay:.1f}s" if delay else ""))
+        elif is_overload(error):
+            self._decrease(f"{type(error).__name__}")
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._recent_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        log_operation(logger, 'info', f"Concurrency limit of {self.name} lowered to {int(self.limit)}: {reason}")
+
+@lru_cache()
+def get_concurrency_limiter(provider: str, model: str) -> AdaptiveConcurrencyLimiter:
+    """
+    Get the process-wide concurrency limiter of a provider model.
+
+    Args:
+        provider: Provider name, e.g. "OpenAI"
+        model: Model name
+
+    Returns:
+        AdaptiveConcurrencyLimiter: Limiter shared by all requests to the model
+    """
+    settings = get_settings()
+    return AdaptiveConcurrencyLimiter(
+        f"{provider}/{model}",
+        initial_limit=settings.summarizer_initial_concurrency,
+        max_limit=settings.summarizer_max_concurrency
+    )
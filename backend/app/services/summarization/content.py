@@ -0,0 +1,161 @@
+"""
+Content preparation for summarizer prompts.
+
+Email bodies are reduced to the text worth summarizing before they are sent
+to a model: HTML is converted to compact text, quoted reply history and
+signatures are removed, and what remains is truncated to a token budget.
+Tokens are counted with tiktoken when it is installed (the ``tokenizer``
+extra) and estimated from the text length otherwise.
+"""
+
+# Standard library imports
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+# Internal imports
+from app.services.html_text import HTML_TAG, html_to_text
+from app.utils.helpers import get_logger, log_operation
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+DEFAULT_INPUT_TOKEN_BUDGET = 2000
+TRUNCATION_MARKER = "\n[…]"
+
+_CHARS_PER_TOKEN = 4  # Estimate for English text when tiktoken is not installed
+_DEFAULT_ENCODING = "o200k_base"
+
+# First line of the quoted history of a reply: Gmail/Apple "On <date>, <name> wrote:"
+# (possibly wrapped onto a second line) and Outlook's "-----Original Message-----"
+# or "From: ... / Sent: ..." header block
+_QUOTE_HEADER = re.compile(
+    r'^(?:On\s.{0,200}?\bwrote:\s*$|-{2,}\s*Original Message\s*-{2,}|From:\s.*\n(?:Sent|Date):\s)',
+    re.IGNORECASE | re.MULTILINE | re.DOTALL
+)
+_QUOTED_LINE = re.compile(r'^>.*(?:\n|$)', re.MULTILINE)
+# "-- " on its own line starts a signature (RFC 3676)
+_SIGNATURE_DELIMITER = re.compile(r'^--[ \t]*$', re.MULTILINE)
+_MOBILE_SIGNATURE = re.compile(r'^(?:Sent from my .*|Get Outlook for .*)$', re.IGNORECASE | re.MULTILINE)
+_BLANK_LINES = re.compile(r'\n{3,}')
+# Links of bulk mail carry per-recipient tracking parameters, so they are left out of content hashes
+_URL = re.compile(r'https?://\S+')
+_WHITESPACE = re.compile(r'\s+')
+
+@lru_cache()
+def _get_encoding(model: str) -> Optional[Any]:
+    """Load the tiktoken encoding of a model, or None to estimate token counts."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            # OpenRouter model names are prefixed with the vendor, e.g. "openai/gpt-4.1-nano"
+            return tiktoken.encoding_for_model(model.rsplit("/", 1)[-1])
+        except KeyError:
+            return tiktoken.get_encoding(_DEFAULT_ENCODING)
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails without network access
+        log_operation(logger, 'warning', f"Failed to load tokenizer for {model}, estimating token counts: {e}")
+        return None
+
+class TokenCounter:
+    """Counts and truncates text in the tokens of a model."""
+
+    def __init__(self, model: str):
+        """
+        Initialize the counter.
+
+        Args:
+            model: Model name the tokenizer is looked up by
+        """
+        self.model = model
+        self._encoding = _get_encoding(model)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        if self._encoding is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut a text down to at most max_tokens tokens, marking the cut.
+
+        The same text and budget always give the same result.
+        """
+        if self._encoding is None:
+            if len(text) <= max_tokens * _CHARS_PER_TOKEN:
+                return text
+            budget = max(0, max_tokens * _CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+            head = text[:budget]
+            # Avoid ending on half a word
+            head = head[:head.rfind(" ")] if " " in head[budget // 2:] else head
+        else:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            budget = max(0, max_tokens - len(self._encoding.encode(TRUNCATION_MARKER)))
+            # A cut inside a multi-byte character decodes to a replacement character
+            head = self._encoding.decode(tokens[:budget]).rstrip("�")
+        return head.rstrip() + TRUNCATION_MARKER
+
+def strip_quoted_history(text: str) -> str:
+    """Remove the quoted history of a reply, keeping the new message."""
+    match = _QUOTE_HEADER.search(text)
+    stripped = text[:match.start()] if match else text
+    stripped = _QUOTED_LINE.sub('', stripped)
+    # A message that is only a quote (e.g. an inline reply without new text) is kept
+    return stripped if stripped.strip() else text
+
+def strip_signature(text: str) -> str:
+    """Remove a delimited signature and mobile sign-offs."""
+    match = _SIGNATURE_DELIMITER.search(text)
+    stripped = text[:match.start()] if match else text
+    stripped = _MOBILE_SIGNATURE.sub('', stripped)
+    return stripped if stripped.strip() else text
+
+def prepare_body(body: str, token_counter: TokenCounter, max_tokens: int) -> str:
+    """
+    Reduce an email body to the text to summarize.
+
+    Args:
+        body: Email body, HTML or plain text
+        token_counter: Counter for the tokens of the summarizing model
+        max_tokens: Token budget for the prepared body
+
+    Returns:
+        str: Plain text within the token budget
+    """
+    text = html_to_text(body) if HTML_TAG.search(body) else body.replace("\r\n", "\n")
+    text = strip_signature(strip_quoted_history(text))
+    text = _BLANK_LINES.sub("\n\n", text).strip()
+    return token_counter.truncate(text, max_tokens)
+
+def content_hash(text: str, sender: str, prompt_version: Any, model: Any) -> str:
+    """
+    Hash prepared email text into a summary cache key.
+
+    Emails from the same sender whose text only differs in links, case or
+    whitespace get the same key, as long as the prompt and model are the same.
+
+    Args:
+        text: Prepared body text, see prepare_body
+        sender: Sender of the email
+        prompt_version: Prompt version the summary is generated with
+        model: Model the summary is generated with
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    normalized = _WHITESPACE.sub(' ', _URL.sub('', text)).strip().casefold()
+    parts = (getattr(prompt_version, "value", prompt_version), getattr(model, "value", model), sender.casefold(), normalized)
+    return hashlib.sha256("\0".join(map(str, parts)).encode()).hexdigest()
@@ -0,0 +1,135 @@
+"""
+Packed batch summarization.
+
+Several emails are summarized in one request: their contents are numbered
+in one prompt, up to a token budget, and the model answers with a JSON
+array of summaries. The system prompt and request overhead are paid once
+per pack instead of once per email. Items that are missing from the answer
+or malformed are summarized again one by one.
+"""
+
+# Standard library imports
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+# Internal imports
+from app.services.summarization.content import TokenCounter
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+Summary = Tuple[str, List[str]]
+
+DEFAULT_PACK_TOKEN_BUDGET = 6000
+
+# Tokens of the <email id="..."> element around each content
+_ITEM_OVERHEAD_TOKENS = 12
+
+def pack_contents(contents: List[str], token_counter: TokenCounter, max_tokens: int) -> List[List[int]]:
+    """
+    Group contents into packs of consecutive items within a token budget.
+
+    Args:
+        contents: Contents to summarize
+        token_counter: Counter for the tokens of the summarizing model
+        max_tokens: Token budget of the contents in one pack; 0 puts every item in its own pack
+
+    Returns:
+        List[List[int]]: Indices of the contents in each pack; an item over the budget is packed alone
+    """
+    packs: List[List[int]] = []
+    pack_tokens = 0
+    for index, content in enumerate(contents):
+        tokens = token_counter.count(content) + _ITEM_OVERHEAD_TOKENS
+        if packs and pack_tokens + tokens <= max_tokens:
+            packs[-1].append(index)
+            pack_tokens += tokens
+        else:
+            packs.append([index])
+            pack_tokens = tokens
+    return packs
+
+def parse_packed_response(text: str, size: int) -> Dict[int, Summary]:
+    """
+    Parse the answer to a packed prompt, keeping the valid items.
+
+    Args:
+        text: Model response, a JSON object with a "summaries" array
+        size: Number of emails in the pack
+
+    Returns:
+        Dict[int, Summary]: Summary and keywords by position in the pack (from 0), for valid items only
+    """
+    try:
+        items = json.loads(text)["summaries"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    results: Dict[int, Summary] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        position, summary, keywords = item.get("id"), item.get("summary"), item.get("keywords")
+        if isinstance(position, str) and position.isdigit():
+            position = int(position)
+        if (
+            isinstance(position, int) and 1 <= position <= size and position - 1 not in results
+            and isinstance(summary, str) and summary.strip()
+            and isinstance(keywords, list) and all(isinstance(keyword, str) for keyword in keywords)
+        ):
+            results[position - 1] = (summary.strip(), keywords)
+    return results
+
+async def summarize_packed(
+    contents: List[str],
+    generate_pack: Callable[[List[str]], Awaitable[str]],
+    generate_single: Callable[[str], Awaitable[Summary]],
+    token_counter: TokenCounter,
+    max_tokens: int
+) -> List[Summary]:
+    """
+    Summarize contents in packed requests, re-running failed items on their own.
+
+    All requests are started at once; the callables are expected to wait for
+    a slot of the provider's concurrency limiter (see concurrency.py).
+
+    Args:
+        contents: Contents to summarize
+        generate_pack: Sends a packed prompt of several contents and returns the raw response
+        generate_single: Summarizes one content with the single-email prompt
+        token_counter: Counter for the tokens of the summarizing model
+        max_tokens: Token budget of the contents in one pack, see pack_contents
+
+    Returns:
+        List[Summary]: Summary and keywords of each content, in order
+    """
+    results: List[Summary] = [None] * len(contents)
+
+    async def _single(index: int) -> None:
+        results[index] = await generate_single(contents[index])
+
+    async def _pack(indices: List[int]) -> None:
+        if len(indices) == 1:
+            return await _single(indices[0])
+        try:
+            parsed = parse_packed_response(await generate_pack([contents[i] for i in indices]), len(indices))
+        except Exception as e:
+            log_operation(logger, 'warning', f"Packed request of {len(indices)} emails failed: {e}")
+            parsed = {}
+
+        failed = [index for position, index in enumerate(indices) if position not in parsed]
+        for position, summary in parsed.items():
+            results[indices[position]] = summary
+        if failed:
+            log_operation(logger, 'warning', f"Re-running {len(failed)} of {len(indices)} emails of a packed request")
+            await asyncio.gather(*[_single(index) for index in failed])
+
+    await asyncio.gather(*[_pack(indices) for indices in pack_contents(contents, token_counter, max_tokens)])
+    return results
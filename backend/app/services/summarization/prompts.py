@@ -7,7 +7,7 @@ prompts across different LLM providers.
 
 # Standard library imports
 from abc import ABC, abstractmethod
-from typing import Optional, Protocol, Dict, Any, runtime_checkable
+from typing import List, Optional, Protocol, Dict, Any, runtime_checkable
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -57,6 +57,25 @@ class PromptManager(Protocol):
         """
         ...
 
+    def get_batch_system_prompt(self, version: Optional[PromptVersion] = None) -> str:
+        """Get system prompt for summarizing several emails in one request.
+        Args:
+            version: Optional version override
+        Returns:
+            System prompt string
+        """
+        ...
+
+    def get_batch_user_prompt(self, contents: List[str], version: Optional[PromptVersion] = None) -> str:
+        """Get user prompt holding several emails, numbered from 1.
+        Args:
+            contents: Contents of the emails
+            version: Optional version override
+        Returns:
+            Formatted user prompt string
+        """
+        ...
+
 @dataclass
 class BasePromptManager(ABC, PromptManager):
     """Abstract base class implementing version handling for PromptManager protocol."""
@@ -126,4 +145,39 @@ Email Content:
         "description": "User prompt for email summarization with JSON format specification",
         "variables": ["content"]
     }
-)
\ No newline at end of file
+)
+
+EMAIL_BATCH_SUMMARY_SYSTEM_PROMPT = PromptTemplate(
+    version=PromptVersion.V2,
+    template="""You are a precise email summarizer. You are given several emails, each in an <email id="..."> element. For every email:
+1. Create a concise, factual single-sentence summary capturing the key message or request
+2. Extract 3-5 key topics or themes as keywords
+
+Summarize each email on its own, never mixing content between emails.
+
+Respond only with a JSON object of this form, with one entry per email:
+{"summaries": [{"id": 1, "summary": "...", "keywords": ["...", "..."]}]}""",
+    metadata={
+        "description": "System prompt for summarizing several emails in one request with JSON output",
+        "response_format": {"type": "json_object"},
+        "schema": {
+            "summaries": "List[{id: int, summary: string, keywords: List[string]}]"
+        }
+    }
+)
+
+EMAIL_BATCH_SUMMARY_USER_PROMPT = PromptTemplate(
+    version=PromptVersion.V2,
+    template="""Please summarize each of these {count} emails.
+
+{emails}""",
+    metadata={
+        "description": "User prompt holding several emails numbered from 1",
+        "variables": ["count", "emails"]
+    }
+)
+
+def format_batch_user_prompt(contents: List[str]) -> str:
+    """Format the batch user prompt, numbering the emails from 1."""
+    emails = "\n\n".join(f'<email id="{i}">\n{content}\n</email>' for i, content in enumerate(contents, 1))
+    return EMAIL_BATCH_SUMMARY_USER_PROMPT.template.format(count=len(contents), emails=emails)
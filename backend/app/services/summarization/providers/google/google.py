@@ -1,26 +1,39 @@
 # Standard library imports
 from typing import Dict, TypeVar, List, Optional
 from datetime import datetime, timezone
+import asyncio
 import json
+import time
 
 # Third-party imports
-from google import genai
 from google.genai import types
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type
+    retry_if_exception
 )
 
 # Internal imports
 from app.models import SummarySchema
+from app.services.summarization.base import AdaptiveSummarizer
+from app.services.summarization.clients import create_genai_client
+from app.services.summarization.concurrency import get_concurrency_limiter, is_overload, is_rate_limit, wait_retry_after
+from app.services.summarization.content import DEFAULT_INPUT_TOKEN_BUDGET, TokenCounter
+from app.services.summarization.rate_limiter import estimate_request_tokens, get_rate_limiter
 from app.services.summarization.prompts import PromptManager, PromptVersion
 from app.services.summarization.providers.openai.openai import OpenAIBackend, OpenAIEmailSummarizer
 from app.services.summarization.types import ModelBackend, ModelConfig
 from app.utils.config import ProviderModel, SummarizerProvider
+from app.utils.helpers import get_logger, log_operation
 from .prompts import GeminiPromptManager
 
+logger = get_logger(__name__, 'service')
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a Gemini API error may succeed on retry: rate limits, server errors and timeouts."""
+    return is_rate_limit(error) or is_overload(error)
+
 
 T = TypeVar('T')
 
@@ -38,19 +51,21 @@ class GeminiBackend(ModelBackend):
         max_tokens: int = 150
     ):
         # Initialize Gemini client
-        self.client = genai.Client(api_key=api_key)
+        self.client = create_genai_client(api_key)
         # Get the async client
         self.async_client = self.client.aio
         self.prompt_manager = prompt_manager
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self._limiter = get_concurrency_limiter("Google", model)
+        self._rate_limiter = get_rate_limiter("Google")
+        self._token_counter = TokenCounter(model)
 
     @retry(
-        retry=retry_if_exception_type((
-            Exception  # Replace with specific Gemini exceptions when known
-        )),
-        stop=stop_after_attempt(2)
+        retry=retry_if_exception(is_transient),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
+        stop=stop_after_attempt(3)
     )
     async def generate_summary(
         self,
@@ -74,12 +89,19 @@ class GeminiBackend(ModelBackend):
             max_output_tokens=cfg.get("max_tokens", self.max_tokens),
         )
         
-        # Use the async client with the correct parameter structure
-        response = await self.async_client.models.generate_content(
-            model=cfg.get("model", self.model),
-            contents=prompt,
-            config=gemini_config
+        estimated_tokens = estimate_request_tokens(
+            [{"content": prompt}], gemini_config.max_output_tokens, self._token_counter
         )
+        async with self._rate_limiter.request(estimated_tokens) as reservation, self._limiter.slot():
+            start = time.monotonic()
+            # Use the async client with the correct parameter structure
+            response = await self.async_client.models.generate_content(
+                model=cfg.get("model", self.model),
+                contents=prompt,
+                config=gemini_config
+            )
+            log_operation(logger, 'debug', f"Gemini call to {cfg.get('model', self.model)} took {time.monotonic() - start:.2f}s")
+            reservation.record_usage(response.usage_metadata)
         
         try:
             result = json.loads(response.text)
@@ -93,11 +115,11 @@ class GeminiBackend(ModelBackend):
         contents: List[str],
         config: Optional[ModelConfig] = None
     ) -> List[tuple[str, List[str]]]:
-        """Generate summaries for multiple contents in parallel."""
-        return [
-            await self.generate_summary(content, config)
+        """Generate summaries for multiple contents concurrently, within the model's concurrency limit."""
+        return list(await asyncio.gather(*[
+            self.generate_summary(content, config)
             for content in contents
-        ]
+        ]))
 
     @property
     def model_info(self) -> Dict[str, str]:
@@ -106,6 +128,10 @@ class GeminiBackend(ModelBackend):
             "model": self.model
         }
 
+    async def aclose(self) -> None:
+        """Close the connections of the async client."""
+        await self.async_client.aclose()
+
 class GeminiEmailSummarizer(OpenAIEmailSummarizer):
     """Email summarizer implementation using Gemini's API via OpenAI compatibility layer."""
     
@@ -116,7 +142,8 @@ class GeminiEmailSummarizer(OpenAIEmailSummarizer):
         batch_threshold: int = 10,
         max_batch_size: int = 50,
         timeout: float = 30.0,
-        prompt_version: PromptVersion = PromptVersion.latest()
+        prompt_version: PromptVersion = PromptVersion.latest(),
+        input_token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET
     ):
         prompt_manager = GeminiPromptManager(prompt_version=prompt_version)
         backend = GeminiBackend(
@@ -124,22 +151,23 @@ class GeminiEmailSummarizer(OpenAIEmailSummarizer):
             prompt_manager=prompt_manager,
             model=model,
         )
-        super().__init__(
-            api_key=api_key,
-            model=model,
+        # Skip OpenAIEmailSummarizer.__init__, which would open an unused OpenAI client
+        AdaptiveSummarizer.__init__(
+            self,
+            model_backend=backend,
+            prompt_manager=prompt_manager,
             batch_threshold=batch_threshold,
             max_batch_size=max_batch_size,
             timeout=timeout,
-            prompt_version=prompt_version
+            input_token_budget=input_token_budget
         )
-        self._backend = backend
-        self._prompt_manager = prompt_manager
 
     def create_summary(
         self,
         email_id: str,
         summary_text: str,
-        keywords: List[str]
+        keywords: List[str],
+        google_id: str
     ) -> SummarySchema:
         """Create a SummarySchema from processing results with Gemini model info."""
         return SummarySchema(
@@ -150,6 +178,7 @@ class GeminiEmailSummarizer(OpenAIEmailSummarizer):
             model_info={
                 "provider": "Google",
                 "model": self._backend.model
-            }
+            },
+            google_id=google_id
         )
         
\ No newline at end of file
@@ -1,15 +1,13 @@
 # Standard library imports
-from typing import List, Optional, Dict, TypeVar
+from typing import Any, List, Optional, Dict, TypeVar
 from datetime import datetime, timezone
-import asyncio
 import json
 
 # Third-party imports
 from openai import (
     RateLimitError,
     APITimeoutError,
-    APIError,
-    AsyncOpenAI
+    APIError
 )
 from tenacity import (
     retry,
@@ -21,7 +19,13 @@ from tenacity import (
 # Internal imports
 from app.models import EmailSchema, SummarySchema
 from app.services.summarization.base import AdaptiveSummarizer
+from app.services.summarization.batch_api import run_batch_job
+from app.services.summarization.clients import create_openai_client
+from app.services.summarization.concurrency import get_concurrency_limiter, wait_retry_after
+from app.services.summarization.content import DEFAULT_INPUT_TOKEN_BUDGET, TokenCounter
+from app.services.summarization.packing import DEFAULT_PACK_TOKEN_BUDGET, summarize_packed
 from app.services.summarization.prompts import PromptManager
+from app.services.summarization.rate_limiter import estimate_request_tokens, get_rate_limiter
 from app.services.summarization.types import ModelBackend, ModelConfig
 from app.utils.config import ProviderModel, SummarizerProvider, PromptVersion
 from .prompts import OpenAIPromptManager
@@ -38,12 +42,19 @@ class OpenAIBackend(ModelBackend):
         model: str = ProviderModel.default_for_provider(SummarizerProvider.OPENAI),
         temperature: float = 0.3,
         max_tokens: int = 150,
+        pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
+        batch_poll_interval: float = 60.0,
     ):
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = create_openai_client(api_key)
         self.prompt_manager = prompt_manager
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.pack_token_budget = pack_token_budget
+        self._limiter = get_concurrency_limiter("OpenAI", model)
+        self._rate_limiter = get_rate_limiter("OpenAI")
+        self._token_counter = TokenCounter(model)
+        self.batch_poll_interval = batch_poll_interval
 
     @retry(
         retry=retry_if_exception_type((
@@ -51,7 +62,7 @@ class OpenAIBackend(ModelBackend):
             APITimeoutError,
             APIError
         )),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
         stop=stop_after_attempt(3)
     )
     async def generate_summary(
@@ -60,6 +71,15 @@ class OpenAIBackend(ModelBackend):
         config: Optional[ModelConfig] = None
     ) -> tuple[str, List[str]]:
         """Generate a summary for a single email using managed prompts."""
+        request = self._summary_request(content, config)
+        estimated_tokens = estimate_request_tokens(request["messages"], request["max_tokens"], self._token_counter)
+        async with self._rate_limiter.request(estimated_tokens) as reservation, self._limiter.slot():
+            response = await self.client.chat.completions.create(**request)
+            reservation.record_usage(response.usage)
+        return self._parse_summary(response.choices[0].message.content)
+
+    def _summary_request(self, content: str, config: Optional[ModelConfig] = None) -> Dict[str, Any]:
+        """Chat completion parameters for summarizing a single email."""
         cfg = config or {}
         
         messages = [
@@ -73,39 +93,93 @@ class OpenAIBackend(ModelBackend):
             }
         ]
         
-        response = await self.client.chat.completions.create(
-            model=cfg.get("model", self.model),
-            messages=messages,
-            temperature=cfg.get("temperature", self.temperature),
-            max_tokens=cfg.get("max_tokens", self.max_tokens),
-            response_format=self.prompt_manager.get_response_format()
-        )
-        
-        # Parse the response
+        return {
+            "model": cfg.get("model", self.model),
+            "messages": messages,
+            "temperature": cfg.get("temperature", self.temperature),
+            "max_tokens": cfg.get("max_tokens", self.max_tokens),
+            "response_format": self.prompt_manager.get_response_format()
+        }
+
+    @staticmethod
+    def _parse_summary(text: str) -> tuple[str, List[str]]:
+        """Parse the summary and keywords from a response."""
         try:
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(text)
             return result["summary"], result["keywords"]
         except (json.JSONDecodeError, KeyError) as e:
             # Fallback handling if JSON parsing fails
-            summary = response.choices[0].message.content
-            return summary.strip(), []
+            return text.strip(), []
 
-    # TODO: Implement batch processing in a more efficient way that actually lowers resource usage and token limits ie. chunking
-    async def batch_generate_summaries(
+    async def offline_generate_summaries(
         self,
         contents: List[str],
         config: Optional[ModelConfig] = None
-    ) -> List[tuple[str, List[str]]]:
-        """Generate summaries for multiple emails."""
-        # Implement concurrent processing with rate limiting
-        semaphore = asyncio.Semaphore(5)  # Limit concurrent API calls
+    ) -> List[Optional[tuple[str, List[str]]]]:
+        """Generate summaries through the Batch API; None for emails whose request failed."""
+        responses = await run_batch_job(
+            self.client,
+            [self._summary_request(content, config) for content in contents],
+            poll_interval=self.batch_poll_interval
+        )
+        return [
+            self._parse_summary(response["choices"][0]["message"]["content"]) if response else None
+            for response in responses
+        ]
+
+    @retry(
+        retry=retry_if_exception_type((
+            RateLimitError,
+            APITimeoutError,
+            APIError
+        )),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
+        stop=stop_after_attempt(3)
+    )
+    async def generate_packed_summaries(
+        self,
+        contents: List[str],
+        config: Optional[ModelConfig] = None
+    ) -> str:
+        """Send several emails in one packed prompt and return the raw JSON response."""
+        cfg = config or {}
         
-        async def _process_with_semaphore(content: str) -> tuple[str, List[str]]:
-            async with semaphore:
-                return await self.generate_summary(content, config)
+        messages = [
+            {
+                "role": "system",
+                "content": self.prompt_manager.get_batch_system_prompt()
+            },
+            {
+                "role": "user",
+                "content": self.prompt_manager.get_batch_user_prompt(contents)
+            }
+        ]
         
-        return await asyncio.gather(
-            *[_process_with_semaphore(content) for content in contents]
+        max_tokens = cfg.get("max_tokens", self.max_tokens) * len(contents)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens, self._token_counter)
+        async with self._rate_limiter.request(estimated_tokens) as reservation, self._limiter.slot(weight=len(contents)):
+            response = await self.client.chat.completions.create(
+                model=cfg.get("model", self.model),
+                messages=messages,
+                temperature=cfg.get("temperature", self.temperature),
+                max_tokens=max_tokens,
+                response_format=self.prompt_manager.get_response_format()
+            )
+            reservation.record_usage(response.usage)
+        return response.choices[0].message.content
+
+    async def batch_generate_summaries(
+        self,
+        contents: List[str],
+        config: Optional[ModelConfig] = None
+    ) -> List[tuple[str, List[str]]]:
+        """Generate summaries for multiple emails, several emails per request."""
+        return await summarize_packed(
+            contents,
+            lambda pack: self.generate_packed_summaries(pack, config),
+            lambda content: self.generate_summary(content, config),
+            self._token_counter,
+            self.pack_token_budget
         )
 
     @property
@@ -115,6 +189,10 @@ class OpenAIBackend(ModelBackend):
             "model": self.model
         }
 
+    async def aclose(self) -> None:
+        """Close the connections of the client."""
+        await self.client.close()
+
 class OpenAIEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
     """Email summarizer implementation using OpenAI's API."""
     
@@ -126,19 +204,25 @@ class OpenAIEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
         max_batch_size: int = 50,
         timeout: float = 30.0,
         prompt_version: PromptVersion = PromptVersion.latest(),
+        input_token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET,
+        pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
+        batch_poll_interval: float = 60.0,
     ):
         prompt_manager = OpenAIPromptManager(prompt_version=prompt_version)
         backend = OpenAIBackend(
             api_key=api_key,
             prompt_manager=prompt_manager,
             model=model,
+            pack_token_budget=pack_token_budget,
+            batch_poll_interval=batch_poll_interval,
         )
         super().__init__(
             model_backend=backend,
             prompt_manager=prompt_manager,
             batch_threshold=batch_threshold,
             max_batch_size=max_batch_size,
-            timeout=timeout
+            timeout=timeout,
+            input_token_budget=input_token_budget
         )
 
     async def prepare_content(self, email: EmailSchema) -> str:
@@ -148,7 +232,7 @@ class OpenAIEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
             f"To: {', '.join(email.recipients)}\n"
             f"Subject: {email.subject}\n"
             f"Date: {email.received_at}\n\n"
-            f"Body:\n{email.body}"
+            f"Body:\n{self._body_text(email.body)}"
         )
 
     def create_summary(
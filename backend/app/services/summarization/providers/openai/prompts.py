@@ -1,12 +1,14 @@
 # Standard library imports
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Internal imports
 from app.services.summarization.prompts import(
     PromptManager,
     EMAIL_SUMMARY_SYSTEM_PROMPT,
-    EMAIL_SUMMARY_USER_PROMPT
+    EMAIL_SUMMARY_USER_PROMPT,
+    EMAIL_BATCH_SUMMARY_SYSTEM_PROMPT,
+    format_batch_user_prompt
 )
 from app.utils.config import PromptVersion
 
@@ -22,4 +24,10 @@ class OpenAIPromptManager(PromptManager):
         return EMAIL_SUMMARY_USER_PROMPT.template.format(content=content)
     
     def get_response_format(self, version: Optional[PromptVersion] = None) -> Dict[str, Any]:
-        return EMAIL_SUMMARY_SYSTEM_PROMPT.metadata["response_format"]
\ No newline at end of file
+        return EMAIL_SUMMARY_SYSTEM_PROMPT.metadata["response_format"]
+
+    def get_batch_system_prompt(self, version: Optional[PromptVersion] = None) -> str:
+        return EMAIL_BATCH_SUMMARY_SYSTEM_PROMPT.template
+
+    def get_batch_user_prompt(self, contents: List[str], version: Optional[PromptVersion] = None) -> str:
+        return format_batch_user_prompt(contents)
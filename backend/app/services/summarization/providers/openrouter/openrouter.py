@@ -1,11 +1,10 @@
 # Core
 from typing import List, Optional, Dict, TypeVar
 from datetime import datetime, timezone
-import asyncio
 import json
 import sys
 
-from openai import AsyncOpenAI, RateLimitError, APITimeoutError, APIError
+from openai import RateLimitError, APITimeoutError, APIError
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -14,10 +13,15 @@ from tenacity import (
 )
 # internal
 from app.services.summarization.base import AdaptiveSummarizer
+from app.services.summarization.clients import create_openai_client
+from app.services.summarization.concurrency import get_concurrency_limiter, wait_retry_after
+from app.services.summarization.content import DEFAULT_INPUT_TOKEN_BUDGET, TokenCounter
+from app.services.summarization.packing import DEFAULT_PACK_TOKEN_BUDGET, summarize_packed
 from app.services.summarization.types import ModelBackend, ModelConfig
 from app.models import EmailSchema, SummarySchema
 from app.utils.config import ProviderModel, SummarizerProvider
 from app.services.summarization.prompts import PromptManager
+from app.services.summarization.rate_limiter import estimate_request_tokens, get_rate_limiter
 from .prompts import OpenRouterPromptManager
 from app.utils.config import PromptVersion
 from app.utils.helpers import get_logger
@@ -31,15 +35,17 @@ class OpenRouterBackend(ModelBackend):
         prompt_manager: PromptManager,
         temperature: float = 0.3,
         max_tokens: int = 150,
+        pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
     ):
         self.logger = get_logger(self.__class__.__name__, 'service')
-        self.client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key            
-        )
+        self.client = create_openai_client(api_key, base_url="https://openrouter.ai/api/v1")
         self.prompt_manager = prompt_manager
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.pack_token_budget = pack_token_budget
+        self._limiter = get_concurrency_limiter("OpenRouter", "auto")
+        self._rate_limiter = get_rate_limiter("OpenRouter")
+        self._token_counter = TokenCounter(ProviderModel.get_openrouter_fallbacks()[0])
 
     @retry(
         retry=retry_if_exception_type((
@@ -47,7 +53,7 @@ class OpenRouterBackend(ModelBackend):
             APITimeoutError,
             APIError,
         )),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
         stop=stop_after_attempt(3)
     )
     async def generate_summary(
@@ -81,17 +87,20 @@ class OpenRouterBackend(ModelBackend):
 
         try:
             # Let OpenRouter select the model from the provided list
-            response = await self.client.chat.completions.create(
-                model=ProviderModel.get_openrouter_fallbacks()[0], # Required by SDK, OR will use list below
-                messages=messages,
-                temperature=cfg.get("temperature", self.temperature),
-                max_tokens=cfg.get("max_tokens", self.max_tokens),
-                response_format=self.prompt_manager.get_response_format(),
-                extra_body={
-                    "models": ProviderModel.get_openrouter_fallbacks(),
-                    "route": "fallback" # Ensures it tries models in order
-                }
-            )
+            estimated_tokens = estimate_request_tokens(messages, request_payload["max_tokens"], self._token_counter)
+            async with self._rate_limiter.request(estimated_tokens) as reservation, self._limiter.slot():
+                response = await self.client.chat.completions.create(
+                    model=ProviderModel.get_openrouter_fallbacks()[0], # Required by SDK, OR will use list below
+                    messages=messages,
+                    temperature=cfg.get("temperature", self.temperature),
+                    max_tokens=cfg.get("max_tokens", self.max_tokens),
+                    response_format=self.prompt_manager.get_response_format(),
+                    extra_body={
+                        "models": ProviderModel.get_openrouter_fallbacks(),
+                        "route": "fallback" # Ensures it tries models in order
+                    }
+                )
+                reservation.record_usage(response.usage)
         except APIError as e:
             self.logger.error(f"OpenRouter API request failed with status code {e.status_code}.")
             if e.body:
@@ -108,21 +117,63 @@ class OpenRouterBackend(ModelBackend):
             summary = response.choices[0].message.content
             return summary.strip(), []
 
-    async def batch_generate_summaries(
+    @retry(
+        retry=retry_if_exception_type((
+            RateLimitError,
+            APITimeoutError,
+            APIError,
+        )),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
+        stop=stop_after_attempt(3)
+    )
+    async def generate_packed_summaries(
         self,
         contents: List[str],
         config: Optional[ModelConfig] = None
-    ) -> List[tuple[str, List[str]]]:
-        """Generate summaries for multiple emails."""
-        # Implement concurrent processing with rate limiting
-        semaphore = asyncio.Semaphore(5)  # Limit concurrent API calls
+    ) -> str:
+        """Send several emails in one packed prompt and return the raw JSON response."""
+        cfg = config or {}
         
-        async def _process_with_semaphore(content: str) -> tuple[str, List[str]]:
-            async with semaphore:
-                return await self.generate_summary(content, config)
+        messages = [
+            {
+                "role": "system",
+                "content": self.prompt_manager.get_batch_system_prompt()
+            },
+            {
+                "role": "user",
+                "content": self.prompt_manager.get_batch_user_prompt(contents)
+            }
+        ]
         
-        return await asyncio.gather(
-            *[_process_with_semaphore(content) for content in contents]
+        max_tokens = cfg.get("max_tokens", self.max_tokens) * len(contents)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens, self._token_counter)
+        async with self._rate_limiter.request(estimated_tokens) as reservation, self._limiter.slot(weight=len(contents)):
+            response = await self.client.chat.completions.create(
+                model=ProviderModel.get_openrouter_fallbacks()[0], # Required by SDK, OR will use list below
+                messages=messages,
+                temperature=cfg.get("temperature", self.temperature),
+                max_tokens=max_tokens,
+                response_format=self.prompt_manager.get_response_format(),
+                extra_body={
+                    "models": ProviderModel.get_openrouter_fallbacks(),
+                    "route": "fallback" # Ensures it tries models in order
+                }
+            )
+            reservation.record_usage(response.usage)
+        return response.choices[0].message.content
+
+    async def batch_generate_summaries(
+        self,
+        contents: List[str],
+        config: Optional[ModelConfig] = None
+    ) -> List[tuple[str, List[str]]]:
+        """Generate summaries for multiple emails, several emails per request."""
+        return await summarize_packed(
+            contents,
+            lambda pack: self.generate_packed_summaries(pack, config),
+            lambda content: self.generate_summary(content, config),
+            self._token_counter,
+            self.pack_token_budget
         )
 
     @property
@@ -132,6 +183,10 @@ class OpenRouterBackend(ModelBackend):
             "model": "auto" # Model is selected by OpenRouter
         }
 
+    async def aclose(self) -> None:
+        """Close the connections of the client."""
+        await self.client.close()
+
 class OpenRouterEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
     """Email summarizer implementation using OpenRouter's API."""
     
@@ -142,18 +197,24 @@ class OpenRouterEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
         max_batch_size: int = 50,
         timeout: float = 30.0,
         prompt_version: PromptVersion = PromptVersion.latest(),
+        input_token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET,
+        pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
     ):
         prompt_manager = OpenRouterPromptManager(prompt_version=prompt_version)
         backend = OpenRouterBackend(
             api_key=api_key,
             prompt_manager=prompt_manager,
+            pack_token_budget=pack_token_budget,
         )
         super().__init__(
             model_backend=backend,
             prompt_manager=prompt_manager,
             batch_threshold=batch_threshold,
             max_batch_size=max_batch_size,
-            timeout=timeout
+            timeout=timeout,
+            input_token_budget=input_token_budget,
+            # Budget in the tokens of the preferred model, as the model is selected by OpenRouter
+            tokenizer_model=ProviderModel.get_openrouter_fallbacks()[0]
         )
 
     async def prepare_content(self, email: EmailSchema) -> str:
@@ -163,7 +224,7 @@ class OpenRouterEmailSummarizer(AdaptiveSummarizer[EmailSchema]):
             f"To: {', '.join(email.recipients)}\n"
             f"Subject: {email.subject}\n"
             f"Date: {email.received_at}\n\n"
-            f"Body:\n{email.body}"
+            f"Body:\n{self._body_text(email.body)}"
         )
 
     def create_summary(
@@ -5,7 +5,9 @@ from app.services.summarization.prompts import(
     PromptTemplate,
     EMAIL_SUMMARY_USER_PROMPT,
     PromptManager,
-    EMAIL_SUMMARY_SYSTEM_PROMPT
+    EMAIL_SUMMARY_SYSTEM_PROMPT,
+    EMAIL_BATCH_SUMMARY_SYSTEM_PROMPT,
+    format_batch_user_prompt
 )
 from app.utils.config import PromptVersion
 
@@ -66,4 +68,10 @@ class OpenRouterPromptManager(PromptManager):
         """
         Return the basic JSON response format supported by most OpenRouter models.
         """
-        return {"type": "json_object"}
\ No newline at end of file
+        return {"type": "json_object"}
+
+    def get_batch_system_prompt(self, version: Optional[PromptVersion] = None) -> str:
+        return EMAIL_BATCH_SUMMARY_SYSTEM_PROMPT.template
+
+    def get_batch_user_prompt(self, contents: List[str], version: Optional[PromptVersion] = None) -> str:
+        return format_batch_user_prompt(contents)
@@ -0,0 +1,237 @@
+"""
+Request and token rate limits of LLM providers.
+
+Providers limit each account to a number of requests (RPM) and tokens
+(TPM) per minute. Every request reserves one request and its estimated
+tokens from token buckets per provider before it is sent, waiting while
+the buckets are empty, and its estimate is corrected with the usage the
+provider reports. The buckets are kept in MongoDB so that all workers
+share one budget, or in memory for development and tests.
+
+Requests waiting for budget are admitted round robin across users, so a
+large batch of one user does not hold back the requests of everyone else.
+"""
+
+# Standard library imports
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+# Internal imports
+from app.services.database.factories import get_rate_limit_repository
+from app.services.database.interfaces import IRateLimitRepository
+from app.services.database.repositories.rate_limit_repository import BURST_SECONDS, bucket_seconds
+from app.services.summarization.content import TokenCounter
+from app.utils.config import RateLimitStore, get_settings
+from app.utils.helpers import get_logger, log_operation
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+
+# Tokens a chat completion adds per message on top of its content
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+# User on whose behalf requests are sent, for fair queueing
+_current_user: ContextVar[str] = ContextVar("rate_limit_user", default="")
+
+@contextmanager
+def rate_limit_user(google_id: str) -> Iterator[None]:
+    """Attribute the provider requests sent inside the block to a user."""
+    token = _current_user.set(google_id)
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+def estimate_request_tokens(messages: List[Dict[str, str]], max_tokens: int, token_counter: TokenCounter) -> int:
+    """
+    Estimate the tokens a chat completion counts against the TPM limit.
+
+    Args:
+        messages: Messages of the request
+        max_tokens: Completion tokens requested, which providers reserve in full
+        token_counter: Counter for the tokens of the model
+
+    Returns:
+        int: Prompt tokens plus max_tokens
+    """
+    return sum(token_counter.count(message["content"]) + _MESSAGE_OVERHEAD_TOKENS for message in messages) + max_tokens
+
+class InMemoryRateLimitStore(IRateLimitRepository):
+    """Rate limit buckets of this process only, following RateLimitRepository."""
+
+    def __init__(self):
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def reserve(self, key: str, requests: int, tokens: int, rpm: int, tpm: int) -> float:
+        """Reserve requests and tokens, returning the seconds to wait for them."""
+        now = time.time()
+        bucket = self._buckets.setdefault(key, [now, now])
+        bucket[0] = max(bucket[0], now) + bucket_seconds(requests, rpm)
+        bucket[1] = max(bucket[1], now) + bucket_seconds(tokens, tpm)
+        return max(0.0, max(bucket) - now - BURST_SECONDS)
+
+    async def adjust(self, key: str, tokens: int, tpm: int) -> None:
+        """Take extra tokens from, or return unused tokens to, the token bucket."""
+        if key in self._buckets:
+            self._buckets[key][1] += bucket_seconds(tokens, tpm)
+
+class FairQueue:
+    """
+    Turns handed out round robin across users.
+
+    The next turn goes to the longest-waiting user who did not have the
+    previous one, then to that user's oldest request.
+    """
+
+    def __init__(self):
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._busy = False
+
+    @asynccontextmanager
+    async def turn(self, user: str) -> AsyncIterator[None]:
+        """Wait for a turn of a user and hold it for the block."""
+        if self._busy or self._waiting:
+            granted = asyncio.get_running_loop().create_future()
+            self._waiting.setdefault(user, deque()).append(granted)
+            try:
+                await granted
+            except asyncio.CancelledError:
+                # A turn handed over just before cancellation is passed on
+                if granted.done() and not granted.cancelled():
+                    self._next()
+                raise
+        else:
+            self._busy = True
+        try:
+            yield
+        finally:
+            self._next()
+
+    def _next(self) -> None:
+        while self._waiting:
+            user, queue = next(iter(self._waiting.items()))
+            granted = queue.popleft()
+            if queue:
+                self._waiting.move_to_end(user)
+            else:
+                del self._waiting[user]
+            if not granted.done():
+                granted.set_result(None)
+                return
+        self._busy = False
+
+class Reservation:
+    """Budget reserved for one request, corrected with the usage reported in its response."""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, usage: Any) -> None:
+        """Record the usage of a response, an OpenAI CompletionUsage or Gemini usage metadata."""
+        total = getattr(usage, 'total_tokens', None)
+        if total is None:
+            total = getattr(usage, 'total_token_count', None)
+        if isinstance(total, int):
+            self.used_tokens = total
+
+class RateLimiter:
+    """
+    RPM and TPM limits of one provider account.
+
+    Requests reserve their budget one at a time, in FairQueue order; a
+    request whose budget is not available yet keeps its turn while it
+    waits, so later requests cannot overtake it. If the shared store fails
+    the limiter falls back to buckets of this process.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        store: Optional[Callable[[], IRateLimitRepository]] = None
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            key: Bucket key, e.g. the provider
+            requests_per_minute: RPM limit; 0 disables it
+            tokens_per_minute: TPM limit; 0 disables it
+            store: Returns the shared bucket store; None keeps the buckets in memory
+        """
+        self.key = key
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._store = store
+        self._local = InMemoryRateLimitStore()
+        self._queue = FairQueue()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+    async def _call_store(self, method: str, *args: Any) -> Any:
+        if self._store is not None:
+            try:
+                return await getattr(self._store(), method)(self.key, *args)
+            except Exception as e:
+                log_operation(logger, 'warning', f"Shared rate limit store failed, limiting {self.key} locally: {e}")
+        return await getattr(self._local, method)(self.key, *args)
+
+    @asynccontextmanager
+    async def request(self, estimated_tokens: int) -> AsyncIterator[Reservation]:
+        """
+        Wait for the budget of a request and hold its reservation while it is sent.
+
+        Args:
+            estimated_tokens: Tokens the request is expected to use, see estimate_request_tokens
+
+        Yields:
+            Reservation: Reservation to record the response's usage on
+        """
+        reservation = Reservation(estimated_tokens)
+        if not self.enabled:
+            yield reservation
+            return
+
+        async with self._queue.turn(_current_user.get()):
+            wait = await self._call_store('reserve', 1, estimated_tokens, self.rpm, self.tpm)
+            if wait > 0:
+                log_operation(logger, 'debug', f"Waiting {wait:.1f}s for the rate limit of {self.key}")
+                await asyncio.sleep(wait)
+
+        yield reservation
+
+        if reservation.used_tokens is not None and self.tpm > 0:
+            difference = reservation.used_tokens - estimated_tokens
+            if difference:
+                await self._call_store('adjust', difference, self.tpm)
+
+@lru_cache()
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get the process-wide rate limiter of a provider account.
+
+    Args:
+        provider: Provider name, e.g. "OpenAI"
+
+    Returns:
+        RateLimiter: Limiter shared by all requests to the provider
+    """
+    settings = get_settings()
+    return RateLimiter(
+        provider,
+        requests_per_minute=settings.summarizer_rate_limit_rpm,
+        tokens_per_minute=settings.summarizer_rate_limit_tpm,
+        store=get_rate_limit_repository if settings.summarizer_rate_limit_store == RateLimitStore.MONGODB else None
+    )
@@ -12,21 +12,25 @@ from bson import ObjectId
 
 # Internal imports
 from app.utils.helpers import get_logger, log_operation, standardize_error_response
-from app.models import EmailSchema, SummarySchema
+from app.models import CachedSummary, EmailSchema, SummarySchema
 from app.services.database.repositories.summary_repository import SummaryRepository
-from app.services.database.factories import get_summary_repository, get_email_service
+from app.services.database.repositories.summary_cache_repository import SummaryCacheRepository
+from app.services.database.factories import get_summary_repository, get_summary_cache_repository, get_email_service
 from app.services.summarization.base import AdaptiveSummarizer
+from app.services.summarization.rate_limiter import rate_limit_user
 from app.services.summarization import (
     ProcessingStrategy, 
     OpenAIEmailSummarizer,
     GeminiEmailSummarizer
 )
+from app.utils.config import get_settings
 
 # -------------------------------------------------------------------------
 # Configuration
 # -------------------------------------------------------------------------
 
 logger = get_logger(__name__, 'service')
+settings = get_settings()
 
 class SummaryService:
     """
@@ -38,14 +42,20 @@ class SummaryService:
     - Managing summary metadata
     """
     
-    def __init__(self, summary_repository: SummaryRepository = None):
+    def __init__(
+        self,
+        summary_repository: SummaryRepository = None,
+        summary_cache_repository: SummaryCacheRepository = None
+    ):
         """
         Initialize the summary service.
         
         Args:
             summary_repository: Summary repository instance
+            summary_cache_repository: Repository of summaries shared by emails with the same content
         """
         self.summary_repository = summary_repository or get_summary_repository()
+        self.summary_cache_repository = summary_cache_repository or get_summary_cache_repository()
         self.email_service = get_email_service()
     
     async def initialize(self):
@@ -411,6 +421,86 @@ class SummaryService:
         except Exception as e:
             raise standardize_error_response(e, "get summaries by ids")
     
+    async def _summarize_with_cache(
+        self,
+        emails: List[EmailSchema],
+        summarizer: AdaptiveSummarizer[EmailSchema],
+        google_id: str,
+        strategy: ProcessingStrategy
+    ) -> List[SummarySchema]:
+        """
+        Summarize emails, reusing the summaries of emails with the same content.
+        
+        Emails whose content hash is in the summary cache get a copy of the
+        cached summary owned by the user. Of the rest, one email per content
+        hash is sent to the summarizer and its summary is added to the cache.
+        Cache failures only cost the savings, never the summaries.
+        
+        Args:
+            emails: Emails to summarize
+            summarizer: The summarizer implementation to use
+            google_id: Google ID of the user who owns the summaries
+            strategy: Processing strategy for the emails not in the cache
+            
+        Returns:
+            List[SummarySchema]: Summaries of the emails that could be summarized
+        """
+        if not settings.summary_cache_enabled:
+            with rate_limit_user(google_id):
+                return await summarizer.summarize(emails, strategy=strategy)
+        
+        hashes = {email.email_id: summarizer.content_hash(email) for email in emails}
+        try:
+            entries = await self.summary_cache_repository.find_by_hashes(list(set(hashes.values())))
+        except Exception as e:
+            log_operation(logger, 'warning', f"Summary cache lookup failed: {e}")
+            entries = {}
+        
+        uncached: Dict[str, EmailSchema] = {}
+        for email in emails:
+            if hashes[email.email_id] not in entries:
+                uncached.setdefault(hashes[email.email_id], email)
+        
+        generated: Dict[str, SummarySchema] = {}
+        if uncached:
+            with rate_limit_user(google_id):
+                summaries = await summarizer.summarize(list(uncached.values()), strategy=strategy)
+            generated = {summary.email_id: summary for summary in summaries}
+            new_entries = [
+                CachedSummary(
+                    content_hash=hashes[summary.email_id],
+                    summary_text=summary.summary_text,
+                    keywords=summary.keywords,
+                    model_info=summary.model_info
+                )
+                for summary in summaries
+            ]
+            try:
+                await self.summary_cache_repository.save_many(new_entries)
+            except Exception as e:
+                log_operation(logger, 'warning', f"Failed to add {len(new_entries)} summaries to the cache: {e}")
+            entries.update((entry.content_hash, entry) for entry in new_entries)
+        
+        results = []
+        for email in emails:
+            entry = entries.get(hashes[email.email_id])
+            if email.email_id in generated:
+                results.append(generated[email.email_id])
+            elif entry:
+                results.append(SummarySchema(
+                    google_id=google_id,
+                    email_id=email.email_id,
+                    summary_text=entry.summary_text,
+                    keywords=entry.keywords,
+                    model_info=entry.model_info
+                ))
+        
+        log_operation(logger, 'debug',
+            f"Summarized {len(emails)} emails: {len(generated)} by the model, "
+            f"{len(results) - len(generated)} from the summary cache"
+        )
+        return results
+    
     async def get_or_create_summary(
         self,
         email_id: str,
@@ -439,10 +529,15 @@ class SummaryService:
             if not email:
                 log_operation(logger, 'warning', f"Email {email_id} not found for user {google_id}")
                 return None
+            if not email.body_loaded:
+                log_operation(logger, 'warning', f"Body of email {email_id} could not be loaded, not summarizing")
+                return None
                 
             # Generate summary using EmailSchema directly
-            summaries = await summarizer.summarize(
+            summaries = await self._summarize_with_cache(
                 [email],
+                summarizer,
+                google_id,
                 strategy=ProcessingStrategy.SINGLE
             )
             
@@ -469,7 +564,8 @@ class SummaryService:
         email_ids: List[str],
         summarizer: AdaptiveSummarizer[EmailSchema],
         google_id: str,
-        batch_size: int = 50  # Process in smaller batches to avoid timeouts
+        batch_size: int = 50,  # Process in smaller batches to avoid timeouts
+        strategy: ProcessingStrategy = ProcessingStrategy.ADAPTIVE
     ) -> Dict[str, List[SummarySchema]]:
         """
         Get or create summaries for multiple email IDs in batch.
@@ -479,6 +575,7 @@ class SummaryService:
             summarizer: The summarizer implementation to use
             google_id: Google ID of the user requesting the summaries
             batch_size: Maximum number of emails to process in a single batch
+            strategy: Processing strategy for missing summaries, OFFLINE for backfills
             
         Returns:
             Dict[str, List[SummarySchema]]: Dictionary containing:
@@ -519,7 +616,10 @@ class SummaryService:
                         for email_id in missing_email_ids:
                             try:
                                 email = await self.email_service.get_email(email_id, google_id)
-                                if email:
+                                if email and not email.body_loaded:
+                                    failed_emails.append(email_id)
+                                    log_operation(logger, 'warning', f"Body of email {email_id} could not be loaded")
+                                elif email:
                                     missing_emails.append(email)
                                 else:
                                     failed_emails.append(email_id)
@@ -532,9 +632,11 @@ class SummaryService:
                             # Generate summaries for missing emails
                             try:
                                 log_operation(logger, 'info', f"Attempting to generate summaries for {len(missing_emails)} emails.")
-                                new_summaries = await summarizer.summarize(
+                                new_summaries = await self._summarize_with_cache(
                                     missing_emails,
-                                    strategy=ProcessingStrategy.ADAPTIVE
+                                    summarizer,
+                                    google_id,
+                                    strategy=strategy
                                 )
                                 
                                 # Save new summaries
@@ -13,6 +13,7 @@ class ProcessingStrategy(Enum):
     SINGLE = auto()
     BATCH = auto()
     ADAPTIVE = auto()
+    OFFLINE = auto()  # Provider Batch API: cheaper, but results may take up to a day
 
 @dataclass
 class SummaryMetrics:
@@ -44,4 +45,8 @@ class ModelBackend(Protocol):
     @property
     def model_info(self) -> Dict[str, str]:
         """Return information about the model being used."""
+        ...
+
+    async def aclose(self) -> None:
+        """Close the connections of the client."""
         ...
\ No newline at end of file
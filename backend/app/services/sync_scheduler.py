@@ -0,0 +1,209 @@
+"""
+Background mailbox sync for Email Essence.
+
+Keeps each user's mailbox in the database up to date on the user's
+fetch_frequency preference, so email requests only read MongoDB instead of
+waiting for IMAP. Synced accounts are also watched with IMAP IDLE, in which
+case polling only serves as a safety net.
+"""
+
+# Standard library imports
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+# Internal imports
+from app.utils.helpers import get_logger, log_operation
+from app.models import PreferencesSchema
+from app.services.database import UserRepository
+from app.services.idle_listener import MailboxIdleListener
+from app.utils.config import get_settings
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+settings = get_settings()
+
+class MailboxSyncScheduler:
+    """
+    Periodically syncs every user's mailbox from IMAP in the background.
+
+    Each user is synced every fetch_frequency seconds, with random jitter so
+    syncs do not line up. At most ``max_concurrency`` syncs run at once across
+    all users, and a user whose sync fails is retried with exponential backoff.
+    After a successful sync the account is handed to the IDLE listener; while
+    its IDLE connection is up, it is polled only every idle_poll_interval.
+    """
+
+    def __init__(self, email_service: 'EmailService', user_repository: UserRepository, # type: ignore
+                 max_concurrency: Optional[int] = None, jitter: Optional[float] = None,
+                 min_interval: Optional[int] = None, max_backoff: Optional[int] = None,
+                 scan_interval: Optional[int] = None, idle: Optional[bool] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            email_service: Email service used to sync mailboxes
+            user_repository: User repository to read users and their preferences from
+            max_concurrency: Mailboxes synced at once across all users
+            jitter: Fraction by which each sync interval is randomly stretched or shrunk
+            min_interval: Minimum seconds between two syncs of the same user
+            max_backoff: Maximum seconds between retries of a failing user
+            scan_interval: Seconds between re-reading the users and their preferences
+            idle: Whether to watch synced accounts with IMAP IDLE
+        """
+        self.email_service = email_service
+        self.user_repository = user_repository
+        self.max_concurrency = max_concurrency or settings.mailbox_sync_concurrency
+        self.jitter = settings.mailbox_sync_jitter if jitter is None else jitter
+        self.min_interval = settings.mailbox_sync_min_interval if min_interval is None else min_interval
+        self.max_backoff = max_backoff or settings.mailbox_sync_max_backoff
+        self.scan_interval = scan_interval or settings.mailbox_sync_scan_interval
+        self.idle = settings.imap_idle_enabled if idle is None else idle
+        self.idle_poll_interval = settings.imap_idle_poll_interval
+        self.idle_listener: Optional[MailboxIdleListener] = None
+
+        self._intervals: Dict[str, float] = {}  # google_id -> seconds between syncs
+        self._next_sync: Dict[str, float] = {}  # google_id -> monotonic time the next sync is due
+        self._last_sync: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop."""
+        if self.running:
+            return
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+        if self.idle:
+            self.idle_listener = MailboxIdleListener(self.email_service, sync_slots=self._slots)
+        self._task = asyncio.create_task(self._run())
+        log_operation(logger, 'info', f"Mailbox sync scheduler started with {self.max_concurrency} concurrent syncs")
+
+    async def stop(self) -> None:
+        """Stop the scheduler loop, close IDLE connections and cancel syncs that are still running."""
+        if self.idle_listener is not None:
+            await self.idle_listener.stop()
+        tasks = list(self._in_flight.values())
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._in_flight.clear()
+
+    def request_sync(self, google_id: str) -> None:
+        """
+        Ask for a user's mailbox to be synced soon, without waiting for it.
+
+        Requests are coalesced: the sync runs no earlier than min_interval after
+        the previous one, and a user in backoff keeps waiting for the retry.
+        """
+        if self._failures.get(google_id):
+            return
+        self._intervals.setdefault(google_id, self._parse_interval(None))
+        due = max(time.monotonic(), self._last_sync.get(google_id, 0.0) + self.min_interval)
+        self._next_sync[google_id] = min(self._next_sync.get(google_id, due), due)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _parse_interval(self, fetch_frequency: Optional[str]) -> float:
+        """Convert a fetch_frequency preference to seconds between syncs."""
+        try:
+            interval = float(fetch_frequency)
+        except (TypeError, ValueError):
+            interval = float(PreferencesSchema().fetch_frequency)
+        return max(interval, self.min_interval)
+
+    def _delay(self, seconds: float) -> float:
+        """Apply random jitter to a delay."""
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _load_users(self) -> None:
+        """Pick up new users and preference changes, and forget deleted users."""
+        try:
+            frequencies = await self.user_repository.find_fetch_frequencies()
+        except Exception as e:
+            log_operation(logger, 'error', f"Failed to load users for mailbox sync: {e}")
+            return
+
+        now = time.monotonic()
+        for google_id, fetch_frequency in frequencies.items():
+            interval = self._parse_interval(fetch_frequency)
+            if google_id not in self._next_sync:
+                # Spread the first syncs over one interval instead of starting them all at once
+                self._next_sync[google_id] = now + random.uniform(0, interval)
+            self._intervals[google_id] = interval
+
+        for google_id in set(self._intervals) - set(frequencies):
+            for state in (self._intervals, self._next_sync, self._last_sync, self._failures):
+                state.pop(google_id, None)
+            if self.idle_listener is not None:
+                self.idle_listener.unwatch(google_id)
+
+    async def _run(self) -> None:
+        """Start due syncs and sleep until the next one is due or a sync is requested."""
+        next_scan = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_scan:
+                await self._load_users()
+                next_scan = now + self.scan_interval
+
+            for google_id, due in list(self._next_sync.items()):
+                if due <= now and google_id not in self._in_flight:
+                    self._in_flight[google_id] = asyncio.create_task(self._sync_user(google_id))
+
+            waiting = [due for google_id, due in self._next_sync.items() if google_id not in self._in_flight]
+            timeout = max(0.0, min(waiting + [next_scan]) - time.monotonic())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _sync_user(self, google_id: str) -> None:
+        """Sync one user's mailbox and schedule the next sync."""
+        try:
+            async with self._slots:
+                try:
+                    debug_info = await self.email_service.refresh_mailboxes(google_id)
+                    error = debug_info.get("imap_error")
+                except Exception as e:
+                    error = str(e)
+
+            now = time.monotonic()
+            self._last_sync[google_id] = now
+            interval = self._intervals.get(google_id, self._parse_interval(None))
+            if error is None:
+                self._failures.pop(google_id, None)
+                delay = interval
+                if self.idle_listener is not None:
+                    if self.idle_listener.watching(google_id):
+                        delay = max(interval, self.idle_poll_interval)
+                    else:
+                        self.idle_listener.watch(google_id)
+            else:
+                failures = self._failures.get(google_id, 0) + 1
+                self._failures[google_id] = failures
+                delay = min(interval * 2 ** failures, self.max_backoff)
+                log_operation(logger, 'warning', f"Mailbox sync for {google_id} failed ({failures} in a row), retrying in {delay:.0f}s: {error}")
+
+            if google_id in self._intervals:
+                self._next_sync[google_id] = now + self._delay(delay)
+        finally:
+            self._in_flight.pop(google_id, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
@@ -0,0 +1,112 @@
+"""
+Tracker domain blocklist for Email Essence.
+
+Images served from a blocklisted domain, or any of its subdomains, are
+stripped from email bodies. Domains are kept in a suffix trie keyed by
+reversed host labels, so a lookup costs one step per label of the image host
+no matter how many domains are listed.
+"""
+
+# Standard library imports
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Internal imports
+from app.utils.helpers import get_logger, log_operation
+from app.utils.config import get_settings
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+
+logger = get_logger(__name__, 'service')
+settings = get_settings()
+
+DEFAULT_BLOCKLIST_PATH = Path(__file__).with_name("tracker_blocklist.txt")
+
+# Key under which a trie node stores the listed domain ending there; never a host label
+_DOMAIN = None
+
+class TrackerBlocklist:
+    """
+    Set of tracker domains matched by host suffix.
+
+    A listed domain matches itself and its subdomains: ``list-manage.com``
+    matches ``us1.list-manage.com`` but not ``notlist-manage.com``.
+    """
+
+    def __init__(self, domains: Iterable[str] = ()):
+        """
+        Initialize the blocklist.
+
+        Args:
+            domains: Domains to block
+        """
+        self._root: Dict[Optional[str], Any] = {}
+        self._size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TrackerBlocklist":
+        """
+        Load a blocklist with one domain per line.
+
+        Blank lines and ``#`` comments are ignored. Hosts-file lines such as
+        ``0.0.0.0 tracker.example`` are accepted, so common published
+        blocklists can be used as they are.
+        """
+        blocklist = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].split()
+                if line:
+                    blocklist.add(line[-1])
+        return blocklist
+
+    def add(self, domain: str) -> None:
+        """Block a domain and its subdomains."""
+        domain = domain.strip().strip(".").lower()
+        if not domain:
+            return
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        if _DOMAIN not in node:
+            node[_DOMAIN] = domain
+            self._size += 1
+
+    def match(self, host: str) -> Optional[str]:
+        """
+        Find the listed domain a host belongs to.
+
+        Args:
+            host: Lowercase host name, e.g. from an image URL
+
+        Returns:
+            Optional[str]: The shortest listed domain that is a suffix of the host, or None
+        """
+        node = self._root
+        for label in reversed(host.rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _DOMAIN in node:
+                return node[_DOMAIN]
+        return None
+
+@lru_cache()
+def get_tracker_blocklist() -> TrackerBlocklist:
+    """Load the configured tracker blocklist once per process."""
+    path = Path(settings.tracker_blocklist_path) if settings.tracker_blocklist_path else DEFAULT_BLOCKLIST_PATH
+    try:
+        blocklist = TrackerBlocklist.from_file(path)
+    except OSError as e:
+        log_operation(logger, 'error', f"Failed to load tracker blocklist {path}: {e}")
+        return TrackerBlocklist()
+    log_operation(logger, 'info', f"Loaded {len(blocklist)} tracker domains from {path}")
+    return blocklist
@@ -0,0 +1,41 @@
+"""
+Tests for the summaries API endpoints.
+
+The endpoint functions are called directly with mocked services, so no
+database or network access is required.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models import BodyPartRef, EmailSchema, UserSchema
+from app.routers.summaries_router import get_summaries
+
+def _email(email_id: str, body: str, body_loaded: bool = True) -> EmailSchema:
+    return EmailSchema(
+        google_id="user123", email_id=email_id, sender="alice@example.com", recipients=[],
+        subject=f"Email {email_id}", body=body, body_loaded=body_loaded,
+        body_ref=None if body_loaded else BodyPartRef(section="1")
+    )
+
+@pytest.mark.asyncio
+async def test_fetch_all_emails_loads_bodies_before_summarizing():
+    """Headers-only emails are summarized with their body, and skipped when it can't be loaded."""
+    stored = [_email("1", "Stored body"), _email("2", "", body_loaded=False), _email("3", "", body_loaded=False)]
+    email_service = MagicMock()
+    email_service.fetch_emails = AsyncMock(return_value=(stored, 3, {}))
+    email_service.load_email_bodies = AsyncMock(return_value=[
+        stored[0],
+        stored[1].model_copy(update={"body": "Loaded body", "body_loaded": True}),
+        stored[2],  # IMAP unreachable, still headers-only
+    ])
+    summarizer = MagicMock(summarize=AsyncMock(return_value=[]))
+    summary_service = MagicMock(get_summary=AsyncMock(return_value=None), save_summaries_batch=AsyncMock())
+    user = UserSchema(google_id="user123", email="user@example.com", name="User")
+
+    with patch("app.routers.summaries_router.get_email_service", return_value=email_service):
+        await get_summaries(refresh=False, auto_generate=True, skip=0, limit=20, sort_by="generated_at",
+                            sort_order="desc", summarizer=summarizer, summary_service=summary_service,
+                            user=user, fetch_all_emails=True)
+
+    summarized = summarizer.summarize.await_args.args[0]
+    assert [(email.email_id, email.body) for email in summarized] == [("1", "Stored body"), ("2", "Loaded body")]
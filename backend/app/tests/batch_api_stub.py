@@ -0,0 +1,155 @@
+"""
+Stub OpenAI Batch API server for testing purposes.
+
+This module provides an in-process server implementing the file and batch
+endpoints of the OpenAI API that Batch API summarization uses. Submitted
+jobs complete after a set number of status checks, answering every request
+with a chat completion built by a configurable function. Clients reach it
+through an ASGI transport, without network access.
+
+It can also be run standalone for local development:
+
+    python -m app.tests.batch_api_stub --port 8090
+
+and selected with OPENAI_BASE_URL=http://127.0.0.1:8090/v1.
+"""
+import argparse
+import json
+import time
+from itertools import count
+from typing import Any, Callable, Dict
+
+import httpx
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+from openai import AsyncOpenAI
+
+def summary_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Chat completion summarizing a request by the start of its user message."""
+    user_message = body["messages"][-1]["content"]
+    content = json.dumps({"summary": f"Summary of {user_message.splitlines()[-1][:40]}", "keywords": ["stub"]})
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    }
+
+class BatchApiStub:
+    """
+    In-memory OpenAI file and batch endpoints.
+
+    Attributes:
+        app: ASGI application serving the endpoints under /v1
+        files: Uploaded and generated files by ID
+        batches: Batch objects by ID
+        respond: Builds the response body of a request, or raises to fail the request
+        polls_until_complete: Status checks a job stays in progress for
+    """
+
+    def __init__(
+        self,
+        respond: Callable[[Dict[str, Any]], Dict[str, Any]] = summary_completion,
+        polls_until_complete: int = 1
+    ):
+        self.respond = respond
+        self.polls_until_complete = polls_until_complete
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._polls: Dict[str, int] = {}
+        self._ids = count(1)
+        self.app = self._create_app()
+
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client connected to the stub."""
+        return AsyncOpenAI(
+            api_key="test",
+            base_url="http://batch-api-stub/v1",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app)),
+            max_retries=0
+        )
+
+    def _file_object(self, file_id: str, filename: str, purpose: str) -> Dict[str, Any]:
+        return {
+            "id": file_id, "object": "file", "bytes": len(self.files[file_id]),
+            "created_at": int(time.time()), "filename": filename, "purpose": purpose, "status": "processed",
+        }
+
+    def _run(self, batch: Dict[str, Any]) -> None:
+        """Answer every request of a batch and attach the output file."""
+        lines = []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            request = json.loads(line)
+            try:
+                response = {"status_code": 200, "request_id": request["custom_id"], "body": self.respond(request["body"])}
+            except Exception as e:
+                response = {"status_code": 500, "request_id": request["custom_id"], "body": {"error": {"message": str(e)}}}
+            lines.append(json.dumps({"id": f"batch_req_{next(self._ids)}", "custom_id": request["custom_id"],
+                                     "response": response, "error": None}))
+        output_file_id = f"file-{next(self._ids)}"
+        self.files[output_file_id] = ("\n".join(lines) + "\n").encode()
+        batch.update(status="completed", output_file_id=output_file_id, completed_at=int(time.time()),
+                     request_counts={"total": len(lines), "completed": len(lines), "failed": 0})
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/v1/files")
+        async def create_file(file: UploadFile = File(...), purpose: str = Form(...)):
+            file_id = f"file-{next(self._ids)}"
+            self.files[file_id] = await file.read()
+            return self._file_object(file_id, file.filename, purpose)
+
+        @app.get("/v1/files/{file_id}/content")
+        async def file_content(file_id: str):
+            if file_id not in self.files:
+                raise HTTPException(status_code=404, detail="File not found")
+            return Response(content=self.files[file_id], media_type="application/jsonl")
+
+        @app.post("/v1/batches")
+        async def create_batch(body: Dict[str, Any]):
+            if body.get("input_file_id") not in self.files:
+                raise HTTPException(status_code=400, detail="Input file not found")
+            batch_id = f"batch_{next(self._ids)}"
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": body["endpoint"], "input_file_id": body["input_file_id"],
+                "completion_window": body["completion_window"], "status": "validating", "created_at": int(time.time()),
+                "output_file_id": None, "error_file_id": None,
+            }
+            self._polls[batch_id] = 0
+            return self.batches[batch_id]
+
+        @app.get("/v1/batches/{batch_id}")
+        async def retrieve_batch(batch_id: str):
+            batch = self._get_batch(batch_id)
+            if batch["status"] in ("validating", "in_progress"):
+                self._polls[batch_id] += 1
+                if self._polls[batch_id] >= self.polls_until_complete:
+                    self._run(batch)
+                else:
+                    batch["status"] = "in_progress"
+            return batch
+
+        @app.post("/v1/batches/{batch_id}/cancel")
+        async def cancel_batch(batch_id: str):
+            batch = self._get_batch(batch_id)
+            batch["status"] = "cancelled"
+            return batch
+
+        return app
+
+    def _get_batch(self, batch_id: str) -> Dict[str, Any]:
+        if batch_id not in self.batches:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        return self.batches[batch_id]
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a stub OpenAI Batch API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--polls", type=int, default=2, help="Status checks before a job completes")
+    args = parser.parse_args()
+    uvicorn.run(BatchApiStub(polls_until_complete=args.polls).app, host=args.host, port=args.port)
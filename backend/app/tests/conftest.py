@@ -35,6 +35,8 @@ from app.tests.database_mock import (
     mock_token_collection
 )
 
+from app.tests.imap_mock import mock_imap_server
+
 # Base application fixture
 @pytest.fixture(scope="session")
 def test_app() -> FastAPI:
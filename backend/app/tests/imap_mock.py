@@ -0,0 +1,389 @@
+"""
+Mock IMAP server for testing purposes.
+
+This module provides an in-process asyncio IMAP server that speaks enough
+IMAP4rev1 (plus XOAUTH2, ENABLE, CONDSTORE, QRESYNC and IDLE) for the email
+service's sync paths to run against it without network access. Both
+IMAPClient and AsyncIMAPClient can connect to it over plain TCP.
+
+It can also be run standalone for local development:
+
+    python -m app.tests.imap_mock --port 1143
+
+and selected with IMAP_HOST=127.0.0.1, IMAP_PORT=1143, IMAP_SSL=false.
+"""
+import argparse
+import asyncio
+import base64
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+import pytest_asyncio
+
+_FETCH = re.compile(rb'UID FETCH (?P<set>\S+) \((?P<items>[^)]*)\)(?: \((?P<modifiers>[^)]*)\))?$', re.IGNORECASE)
+_SECTION = re.compile(r'(?:BODY|BODY\.PEEK)\[(?P<section>[^\]]*)\]$')
+
+SAMPLE_MESSAGE = (
+    b'From: Alice <alice@example.com>\r\n'
+    b'To: bob@example.com\r\n'
+    b'Subject: Hello\r\n'
+    b'Date: Tue, 17 Mar 2023 12:30:45 +0000\r\n'
+    b'Content-Type: text/plain; charset="utf-8"\r\n'
+    b'\r\n'
+    b'Hello Bob\r\n'
+)
+
+@dataclass
+class MockMessage:
+    """A message stored in a MockMailbox."""
+    raw: bytes
+    flags: Set[bytes] = field(default_factory=set)
+    modseq: int = 1
+    internal_date: datetime = field(default_factory=lambda: datetime(2023, 3, 17, 12, 0, tzinfo=timezone.utc))
+
+@dataclass
+class MockMailbox:
+    """A folder on the MockIMAPServer."""
+    uidvalidity: int = 1
+    uidnext: int = 1
+    highest_modseq: int = 1
+    messages: Dict[int, MockMessage] = field(default_factory=dict)
+    vanished: Dict[int, int] = field(default_factory=dict)  # UID -> modseq of the expunge
+
+class MockIMAPServer:
+    """
+    In-process IMAP server backed by in-memory mailboxes.
+
+    Messages are added with add_message(); set_flags() and expunge() bump the
+    mailbox's mod-sequence so CONDSTORE/QRESYNC delta syncs can be tested.
+    Sessions idling on the folder are notified with EXISTS/EXPUNGE.
+    Every command received is recorded in ``commands``.
+    """
+
+    def __init__(self, accounts: Optional[Dict[str, str]] = None,
+                 capabilities: Optional[List[str]] = None):
+        """
+        Initialize the mock server.
+
+        Args:
+            accounts: Mapping of email address to the access token it accepts
+            capabilities: Advertised capabilities, by default including CONDSTORE, QRESYNC and IDLE
+        """
+        self.accounts = accounts or {"user@example.com": "token"}
+        self.capabilities = capabilities or ["IMAP4rev1", "AUTH=XOAUTH2", "ENABLE", "CONDSTORE", "QRESYNC", "IDLE"]
+        self.mailboxes: Dict[str, MockMailbox] = {"INBOX": MockMailbox()}
+        self.commands: List[str] = []
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.idling: Set["_Session"] = set()
+
+    # -------------------------------------------------------------------------
+    # Mailbox Manipulation
+    # -------------------------------------------------------------------------
+
+    def add_message(self, raw: bytes = SAMPLE_MESSAGE, folder: str = "INBOX",
+                    flags: Optional[Set[bytes]] = None) -> int:
+        """Append a message to a folder and return its UID."""
+        mailbox = self.mailboxes.setdefault(folder, MockMailbox())
+        uid = mailbox.uidnext
+        mailbox.uidnext += 1
+        mailbox.highest_modseq += 1
+        mailbox.messages[uid] = MockMessage(raw=raw, flags=set(flags or ()), modseq=mailbox.highest_modseq)
+        self._notify(mailbox, f'* {len(mailbox.messages)} EXISTS')
+        return uid
+
+    def set_flags(self, uid: int, flags: Set[bytes], folder: str = "INBOX") -> None:
+        """Replace the flags of a message, as another mail client would."""
+        mailbox = self.mailboxes[folder]
+        mailbox.highest_modseq += 1
+        message = mailbox.messages[uid]
+        message.flags = set(flags)
+        message.modseq = mailbox.highest_modseq
+
+    def expunge(self, uid: int, folder: str = "INBOX") -> None:
+        """Remove a message, as another mail client would."""
+        mailbox = self.mailboxes[folder]
+        mailbox.highest_modseq += 1
+        number = sorted(mailbox.messages).index(uid) + 1
+        del mailbox.messages[uid]
+        mailbox.vanished[uid] = mailbox.highest_modseq
+        self._notify(mailbox, f'* {number} EXPUNGE')
+
+    def _notify(self, mailbox: MockMailbox, response: str) -> None:
+        """Push an untagged response to the sessions idling on a mailbox."""
+        for session in self.idling:
+            if session.selected is mailbox:
+                session.send(response.encode())
+
+    # -------------------------------------------------------------------------
+    # Server Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "MockIMAPServer":
+        """Start listening; port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and drop any client connections still open."""
+        self._server.close()
+        for writer in list(self._writers):
+            writer.transport.abort()
+        await self._server.wait_closed()
+
+    # -------------------------------------------------------------------------
+    # Protocol Handling
+    # -------------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        session = _Session(self, reader, writer)
+        try:
+            await session.run()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+class _Session:
+    """State of one client connection to the MockIMAPServer."""
+
+    def __init__(self, server: MockIMAPServer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.user: Optional[str] = None
+        self.selected: Optional[MockMailbox] = None
+        self.enabled: Set[str] = set()
+
+    def send(self, line: bytes) -> None:
+        self.writer.write(line + b'\r\n')
+
+    async def run(self) -> None:
+        self.send(b'* OK Mock IMAP server ready')
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            tag, _, command = line.rstrip(b'\r\n').partition(b' ')
+            self.server.commands.append(command.decode())
+            name = command.split(b' ', 1)[0].upper()
+            handler = getattr(self, f"_cmd_{name.decode().lower()}", None)
+            try:
+                if handler is None:
+                    raise ValueError(f"unsupported command {name.decode()}")
+                if name not in (b'CAPABILITY', b'AUTHENTICATE', b'LOGOUT', b'NOOP') and self.user is None:
+                    raise ValueError("not authenticated")
+                status = await handler(command)
+                self.send(tag + b' ' + (status or b'OK done'))
+            except ValueError as e:
+                self.send(tag + b' BAD ' + str(e).encode())
+            await self.writer.drain()
+            if name == b'LOGOUT':
+                return
+
+    async def _cmd_capability(self, command: bytes) -> None:
+        self.send(b'* CAPABILITY ' + ' '.join(self.server.capabilities).encode())
+
+    async def _cmd_authenticate(self, command: bytes) -> bytes:
+        self.send(b'+ ')
+        await self.writer.drain()
+        response = base64.b64decode((await self.reader.readline()).strip())
+        fields = dict(part.split('=', 1) for part in response.decode().split('\1') if '=' in part)
+        user, token = fields.get('user'), fields.get('auth', '').removeprefix('Bearer ')
+        if self.server.accounts.get(user) != token:
+            self.send(b'+ ' + base64.b64encode(b'{"status":"401"}'))
+            await self.writer.drain()
+            await self.reader.readline()
+            return b'NO [AUTHENTICATIONFAILED] Invalid credentials'
+        self.user = user
+        return b'OK authenticated'
+
+    async def _cmd_enable(self, command: bytes) -> None:
+        if self.selected is not None:
+            # RFC 5161: ENABLE is only valid in the authenticated state
+            raise ValueError("ENABLE not allowed in selected state")
+        requested = [c.decode().upper() for c in command.split()[1:]]
+        enabled = [c for c in requested if c in self.server.capabilities]
+        self.enabled.update(enabled)
+        if 'QRESYNC' in enabled:
+            self.enabled.add('CONDSTORE')
+        self.send(b'* ENABLED ' + ' '.join(enabled).encode())
+
+    async def _cmd_select(self, command: bytes, readonly: bool = False) -> bytes:
+        folder = command.split(b' ', 1)[1].strip(b'"').decode()
+        if folder not in self.server.mailboxes:
+            self.selected = None
+            return b'NO no such mailbox'
+        mailbox = self.selected = self.server.mailboxes[folder]
+        self.send(f'* {len(mailbox.messages)} EXISTS'.encode())
+        self.send(b'* 0 RECENT')
+        self.send(b'* FLAGS (\\Seen \\Answered \\Flagged \\Deleted \\Draft)')
+        self.send(f'* OK [UIDVALIDITY {mailbox.uidvalidity}] UIDs valid'.encode())
+        self.send(f'* OK [UIDNEXT {mailbox.uidnext}] Predicted next UID'.encode())
+        if 'CONDSTORE' in self.server.capabilities:
+            self.send(f'* OK [HIGHESTMODSEQ {mailbox.highest_modseq}] Highest'.encode())
+        return b'OK [READ-ONLY] EXAMINE completed' if readonly else b'OK [READ-WRITE] SELECT completed'
+
+    async def _cmd_examine(self, command: bytes) -> bytes:
+        return await self._cmd_select(command, readonly=True)
+
+    async def _cmd_idle(self, command: bytes) -> bytes:
+        if self.selected is None:
+            raise ValueError("no mailbox selected")
+        self.send(b'+ idling')
+        await self.writer.drain()
+        self.server.idling.add(self)
+        try:
+            line = await self.reader.readline()
+        finally:
+            self.server.idling.discard(self)
+        if line.strip().upper() != b'DONE':
+            raise ValueError("expected DONE")
+        return b'OK IDLE terminated'
+
+    async def _cmd_noop(self, command: bytes) -> None:
+        return None
+
+    async def _cmd_logout(self, command: bytes) -> None:
+        self.send(b'* BYE logging out')
+
+    async def _cmd_uid(self, command: bytes) -> Optional[bytes]:
+        if self.selected is None:
+            raise ValueError("no mailbox selected")
+        sub_command = command.split(b' ', 2)[1].upper()
+        if sub_command == b'SEARCH':
+            return self._uid_search(command.split(b' ', 2)[2].decode())
+        if sub_command == b'FETCH':
+            return self._uid_fetch(command)
+        raise ValueError(f"unsupported UID command {sub_command.decode()}")
+
+    def _uid_set(self, uid_set: str) -> List[int]:
+        """Resolve a UID set against the selected mailbox, treating '*' as the highest UID."""
+        existing = sorted(self.selected.messages)
+        highest = existing[-1] if existing else 0
+        uids = set()
+        for part in uid_set.split(','):
+            bounds = [highest if n == '*' else int(n) for n in part.split(':')]
+            low, high = min(bounds), max(bounds)
+            uids.update(uid for uid in existing if low <= uid <= high)
+        return sorted(uids)
+
+    def _in_uid_set(self, uid: int, uid_set: str) -> bool:
+        """Check if a UID, existing or not, falls inside a UID set."""
+        for part in uid_set.split(','):
+            bounds = [self.selected.uidnext - 1 if n == '*' else int(n) for n in part.split(':')]
+            if min(bounds) <= uid <= max(bounds):
+                return True
+        return False
+
+    def _uid_search(self, criteria: str) -> None:
+        tokens = criteria.split()
+        if tokens[0].upper() == 'ALL':
+            uids = sorted(self.selected.messages)
+        elif tokens[0].upper() == 'UID':
+            uids = self._uid_set(tokens[1])
+        else:
+            raise ValueError(f"unsupported search criteria {criteria}")
+        self.send(b'* SEARCH' + b''.join(f' {uid}'.encode() for uid in uids))
+
+    def _uid_fetch(self, command: bytes) -> None:
+        match = _FETCH.match(command)
+        if not match:
+            raise ValueError("unparseable FETCH")
+        items = match.group('items').decode().upper().split()
+        modifiers = (match.group('modifiers') or b'').decode().upper().split()
+        changed_since = int(modifiers[modifiers.index('CHANGEDSINCE') + 1]) if 'CHANGEDSINCE' in modifiers else None
+        uid_set = match.group('set').decode()
+
+        if 'VANISHED' in modifiers and changed_since is not None:
+            vanished = sorted(
+                uid for uid, modseq in self.selected.vanished.items()
+                if modseq > changed_since and self._in_uid_set(uid, uid_set)
+            )
+            if vanished:
+                self.send(b'* VANISHED (EARLIER) ' + ','.join(str(uid) for uid in vanished).encode())
+
+        sequence_numbers = {uid: n for n, uid in enumerate(sorted(self.selected.messages), start=1)}
+        for uid in self._uid_set(uid_set):
+            message = self.selected.messages[uid]
+            if changed_since is not None and message.modseq <= changed_since:
+                continue
+            self._send_fetch(sequence_numbers[uid], uid, message, items, changed_since is not None)
+
+    def _send_fetch(self, number: int, uid: int, message: MockMessage, items: List[str], with_modseq: bool) -> None:
+        parts = [f'UID {uid}'.encode()]
+        literals = []
+        for item in items:
+            if item == 'UID':
+                continue
+            if item == 'FLAGS':
+                parts.append(b'FLAGS (' + b' '.join(sorted(message.flags)) + b')')
+            elif item == 'INTERNALDATE':
+                parts.append(message.internal_date.strftime('INTERNALDATE "%d-%b-%Y %H:%M:%S +0000"').encode())
+            elif item == 'RFC822.SIZE':
+                parts.append(f'RFC822.SIZE {len(message.raw)}'.encode())
+            elif item == 'MODSEQ':
+                with_modseq = True
+            elif item == 'RFC822' or _SECTION.match(item):
+                section = '' if item == 'RFC822' else _SECTION.match(item).group('section')
+                literals.append((section, self._section(message.raw, section)))
+                if '.PEEK' not in item:
+                    message.flags.add(b'\\Seen')
+            else:
+                raise ValueError(f"unsupported FETCH item {item}")
+        if with_modseq:
+            parts.append(f'MODSEQ ({message.modseq})'.encode())
+
+        line = f'* {number} FETCH ('.encode() + b' '.join(parts)
+        for section, content in literals:
+            line += f' BODY[{section}] {{{len(content)}}}'.encode()
+            self.writer.write(line + b'\r\n' + content)
+            line = b''
+        self.send(line + b')')
+
+    def _section(self, raw: bytes, section: str) -> bytes:
+        """Get a body section; only the whole message and the text of single-part messages are supported."""
+        if section == '':
+            return raw
+        if section in ('1', 'TEXT'):
+            return raw.split(b'\r\n\r\n', 1)[1] if b'\r\n\r\n' in raw else b''
+        raise ValueError(f"unsupported body section {section}")
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest_asyncio.fixture
+async def mock_imap_server():
+    """Running MockIMAPServer, closed after the test."""
+    server = await MockIMAPServer().start()
+    yield server
+    await server.close()
+
+# =============================================================================
+# Standalone
+# =============================================================================
+
+async def _serve(port: int, messages: int) -> None:
+    server = await MockIMAPServer().start(port=port)
+    for _ in range(messages):
+        server.add_message()
+    print(f"Mock IMAP server listening on 127.0.0.1:{server.port} (user@example.com / token)")
+    await server._server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the mock IMAP server")
+    parser.add_argument("--port", type=int, default=1143)
+    parser.add_argument("--messages", type=int, default=10, help="Number of sample messages in INBOX")
+    args = parser.parse_args()
+    asyncio.run(_serve(args.port, args.messages))
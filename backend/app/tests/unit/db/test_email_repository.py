@@ -3,8 +3,10 @@ Tests for the EmailRepository class.
 """
 import pytest
 from unittest.mock import AsyncMock
+from pymongo.errors import BulkWriteError
 
 from app.models.email_models import EmailSchema
+from app.services.database import BulkInsertResult
 
 @pytest.mark.asyncio
 async def test_find_by_email_id(mock_email_repository):
@@ -98,3 +100,39 @@ async def test_mark_as_read(mock_email_repository):
         {"$set": {"is_read": True}}
     )
     mock_email_repository.find_by_email_id.assert_called_with("test_1")
+
+
+@pytest.mark.asyncio
+async def test_delete_by_folder_scopes_to_folder(mock_email_repository):
+    """Only the given folder is deleted; INBOX also matches emails stored before folders were recorded."""
+    mock_email_repository.delete_many = AsyncMock(return_value=True)
+    
+    await mock_email_repository.delete_by_folder("user123", "Work")
+    mock_email_repository.delete_many.assert_called_with({"google_id": "user123", "folder": "Work"})
+    
+    await mock_email_repository.delete_by_folder("user123", "INBOX")
+    mock_email_repository.delete_many.assert_called_with(
+        {"google_id": "user123", "folder": {"$in": ["INBOX", None]}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_insert_many_if_absent_counts_skipped(mock_email_repository):
+    """Emails are upserted in one unordered bulk write; duplicate-key races count as skipped."""
+    emails = [
+        EmailSchema(email_id=str(n), google_id="user123", sender="test@example.com",
+                    recipients=["user@example.com"], subject="Subject", body="Body")
+        for n in range(3)
+    ]
+    mock_email_repository.collection.bulk_write = AsyncMock(side_effect=BulkWriteError({
+        "nUpserted": 1,
+        "writeErrors": [{"index": 1, "code": 11000}]
+    }))
+    
+    result = await mock_email_repository.insert_many_if_absent(emails)
+    
+    assert result == BulkInsertResult(inserted=1, skipped=2)
+    operations = mock_email_repository.collection.bulk_write.call_args.args[0]
+    assert mock_email_repository.collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert operations[0]._filter == {"email_id": "0", "google_id": "user123"}
+    assert operations[0]._doc["$setOnInsert"]["subject"] == "Subject"
@@ -0,0 +1,175 @@
+"""
+Tests for the asyncio IMAP transport.
+
+These tests run AsyncIMAPClient and the EmailService asyncio paths against
+the in-process MockIMAPServer, so no network access is required.
+"""
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from imapclient.exceptions import LoginError
+
+from app.services.email_service import EmailService
+from app.services.imap import AsyncIMAPClient
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _message(n: int) -> bytes:
+    return (
+        f'From: sender{n}@example.com\r\n'
+        f'To: user@example.com\r\n'
+        f'Subject: Message {n}\r\n'
+        f'Date: Tue, 17 Mar 2023 12:30:45 +0000\r\n'
+        f'Content-Type: text/plain; charset="utf-8"\r\n'
+        f'\r\n'
+        f'Body of message {n}\r\n'
+    ).encode()
+
+@pytest_asyncio.fixture
+async def async_service(mock_imap_server):
+    """EmailService using the asyncio transport against the mock server."""
+    service = EmailService(email_repository=MagicMock(), sync_state_repository=MagicMock())
+    service.imap_host, service.imap_port, service.imap_ssl = "127.0.0.1", mock_imap_server.port, False
+    service.use_async_imap = True
+    service.fetch_chunk_size = 2
+    yield service
+    await service.async_connection_pool.close_all()
+
+# =============================================================================
+# AsyncIMAPClient Tests
+# =============================================================================
+
+async def test_client_fetches_messages_with_literals(mock_imap_server):
+    """SELECT, UID SEARCH and UID FETCH round-trip through the imapclient parsers."""
+    uid = mock_imap_server.add_message(_message(1), flags={b'\\Seen'})
+    client = await AsyncIMAPClient.connect("127.0.0.1", mock_imap_server.port, ssl=False)
+    await client.oauth2_login("user@example.com", "token")
+
+    select_info = await client.select_folder("INBOX")
+    uids = await client.search(['ALL'])
+    response = await client.fetch(uids, ['BODY.PEEK[]', 'FLAGS'])
+    await client.logout()
+
+    assert select_info[b'UIDVALIDITY'] == 1
+    assert select_info[b'UIDNEXT'] == uid + 1
+    assert uids == [uid]
+    assert response[uid][b'BODY[]'] == _message(1)
+    assert response[uid][b'FLAGS'] == (b'\\Seen',)
+
+async def test_client_reads_response_lines_beyond_stream_default(mock_imap_server):
+    """UID SEARCH ALL on a large mailbox arrives as one line longer than asyncio's 64 KiB default."""
+    for _ in range(20000):
+        mock_imap_server.add_message()
+    client = await AsyncIMAPClient.connect("127.0.0.1", mock_imap_server.port, ssl=False)
+    await client.oauth2_login("user@example.com", "token")
+    await client.select_folder("INBOX")
+
+    uids = await client.search(['ALL'])
+    await client.logout()
+
+    assert len(uids) == 20000
+
+async def test_client_idle_reports_pushed_changes(mock_imap_server):
+    """While idling, EXISTS and EXPUNGE pushed by the server are returned by idle_check()."""
+    uid = mock_imap_server.add_message(_message(1))
+    client = await AsyncIMAPClient.connect("127.0.0.1", mock_imap_server.port, ssl=False)
+    await client.oauth2_login("user@example.com", "token")
+    await client.select_folder("INBOX", readonly=True)
+
+    await client.idle()
+    assert await client.idle_check(timeout=0.01) == []
+    mock_imap_server.add_message(_message(2))
+    assert await client.idle_check(timeout=1) == [(2, b'EXISTS')]
+    mock_imap_server.expunge(uid)
+    assert await client.idle_check(timeout=1) == [(1, b'EXPUNGE')]
+    await client.idle_done()
+    await client.logout()
+
+    assert mock_imap_server.commands[-2:] == ["IDLE", "LOGOUT"]
+
+async def test_client_rejects_invalid_token(mock_imap_server):
+    """A refused XOAUTH2 login raises LoginError."""
+    client = await AsyncIMAPClient.connect("127.0.0.1", mock_imap_server.port, ssl=False)
+
+    with pytest.raises(LoginError):
+        await client.oauth2_login("user@example.com", "expired")
+    client.shutdown()
+
+# =============================================================================
+# EmailService Asyncio Transport Tests
+# =============================================================================
+
+async def test_fetch_from_imap_uses_asyncio_transport(async_service, mock_imap_server, monkeypatch):
+    """fetch_from_imap keeps its signature and result shape without touching the threadpool."""
+    for n in range(1, 4):
+        mock_imap_server.add_message(_message(n))
+    threadpool = AsyncMock()
+    monkeypatch.setattr("app.services.email_service.run_in_threadpool", threadpool)
+
+    emails = await async_service.fetch_from_imap("token", "user@example.com", google_id="user123", limit=2)
+
+    threadpool.assert_not_called()
+    assert [e["email_id"] for e in emails] == ["2", "3"]
+    assert emails[0]["subject"] == "Message 2"
+    assert emails[0]["body"].strip() == "Body of message 2"
+
+async def test_sync_mailbox_applies_deltas_over_pooled_connection(async_service, mock_imap_server, monkeypatch):
+    """A second sync reuses the connection and only picks up new mail, flag changes and expunges."""
+    summary_repository = MagicMock(delete_by_email_ids=AsyncMock(), delete_by_google_id=AsyncMock())
+    monkeypatch.setattr("app.services.email_service.get_summary_repository", lambda: summary_repository)
+    saved_states = []
+    async_service.sync_state_repository.find_state = AsyncMock(side_effect=lambda *_: saved_states[-1] if saved_states else None)
+    async_service.sync_state_repository.save_state = AsyncMock(side_effect=saved_states.append)
+    async_service.email_repository.bulk_update_read_state = AsyncMock()
+    async_service.email_repository.delete_by_email_ids = AsyncMock()
+    async_service.save_emails_to_db = AsyncMock()
+    for n in range(1, 4):
+        mock_imap_server.add_message(_message(n))
+
+    first = await async_service.sync_mailbox("token", "user@example.com", "user123")
+    mock_imap_server.set_flags(1, {b'\\Seen'})
+    mock_imap_server.expunge(2)
+    mock_imap_server.add_message(_message(4))
+    second = await async_service.sync_mailbox("token", "user@example.com", "user123")
+
+    saved = [e["email_id"] for call in async_service.save_emails_to_db.await_args_list for e in call.args[0]]
+    assert saved == ["1", "2", "3", "4"]
+    assert (first.email_count, second.email_count) == (3, 1)
+    assert second.read_states == {1: True}
+    assert second.vanished_uids == [2]
+    assert second.state.last_uid == 4
+    async_service.email_repository.bulk_update_read_state.assert_awaited_once_with({"1": True}, "user123")
+    assert mock_imap_server.connections == 1
+
+async def test_accounts_are_multiplexed_on_the_event_loop(async_service, mock_imap_server):
+    """Refreshes for many accounts run concurrently on the event loop."""
+    accounts = {f"user{n}@example.com": f"token{n}" for n in range(10)}
+    mock_imap_server.accounts.update(accounts)
+    mock_imap_server.add_message(_message(1))
+
+    results = await asyncio.gather(*(
+        async_service.fetch_from_imap(token, account, google_id=account) for account, token in accounts.items()
+    ))
+
+    assert all(len(emails) == 1 for emails in results)
+    assert mock_imap_server.connections == len(accounts)
+
+async def test_sync_mailboxes_merges_folders(async_service, mock_imap_server):
+    """Folders sync over separate pooled connections and keep their folder metadata."""
+    async_service.email_repository.bulk_update_read_state = AsyncMock()
+    async_service.sync_state_repository.find_state = AsyncMock(return_value=None)
+    async_service.sync_state_repository.save_state = AsyncMock()
+    async_service.save_emails_to_db = AsyncMock()
+    mock_imap_server.add_message(_message(1))
+    mock_imap_server.add_message(_message(2), folder="Work")
+
+    results = await async_service.sync_mailboxes("token", "user@example.com", "user123", folders=["INBOX", "Work"])
+
+    saved = [e for call in async_service.save_emails_to_db.await_args_list for e in call.args[0]]
+    assert sorted((e["email_id"], e["folder"]) for e in saved) == [("1", "INBOX"), ("Work:1", "Work")]
+    assert {folder: result.state.folder for folder, result in results.items()} == {"INBOX": "INBOX", "Work": "Work"}
+    assert mock_imap_server.connections == 2
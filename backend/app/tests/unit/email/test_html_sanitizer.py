@@ -0,0 +1,139 @@
+"""
+Tests for HTML sanitization in the EmailService class.
+
+The single-scan sanitizer is checked against the chained re.sub passes it
+replaced, on a corpus of snippets and a generated marketing email.
+"""
+import random
+import re
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.email_service import EmailService
+from app.services.tracker_blocklist import TrackerBlocklist
+
+# =============================================================================
+# Reference Implementation
+# =============================================================================
+
+def _legacy_minimal(html: str) -> str:
+    """The former _remove_scripts followed by _remove_tracking_pixels."""
+    if not html:
+        return html
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
+    html = re.sub(r'(<[^>]*) on\w+="[^"]*"([^>]*>)', r'\1\2', html)
+    html = re.sub(r'(<[^>]*) on\w+=\'[^\']*\'([^>]*>)', r'\1\2', html)
+    html = re.sub(r'(<[^>]*\s+(?:href|src|action)=[\'\"])javascript:.*?([\'\"][^>]*>)',
+                  r'\1#\2', html, flags=re.IGNORECASE | re.DOTALL)
+    html = re.sub(r'<img[^>]*(?:width=["\']?1["\']?[^>]*height=["\']?1["\']?|'
+                  r'height=["\']?1["\']?[^>]*width=["\']?1["\']?)[^>]*>',
+                  '', html, flags=re.IGNORECASE)
+    for domain in (r'track\.', r'pixel\.', r'analytics\.', r'beacon\.',
+                   r'tracker\.', r'metrics\.', r'telemetry\.', r'logger\.'):
+        html = re.sub(fr'<img[^>]*src=["\']https?://[^"\']*{domain}[^"\']*["\'][^>]*>',
+                      '', html, flags=re.IGNORECASE)
+    return html
+
+def _legacy_full(html: str) -> str:
+    """The former _full_email_sanitization."""
+    if not html:
+        return html
+    html = _legacy_minimal(html)
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL)
+    return re.sub(r'(<[^>]*) style=["\'][^"\']*["\']([^>]*>)', r'\1\2', html)
+
+def _marketing_email(seed: int, size: int = 50_000) -> str:
+    """A table-heavy newsletter with inline styles, tracking and scripts."""
+    blocks = [
+        '<table role="presentation" width="100%" style="border:0;"><tr><td align="center" style="padding:20px 0;">',
+        '<a href="https://shop.example.com/p/{n}?utm_source=mail" style="color:#0a0;" target="_blank">Product {n}</a>',
+        '<img src="https://cdn.example.com/img/{n}.jpg" width="600" height="300" alt="Item {n}" style="display:block;">',
+        '<p style="margin:0 0 10px;font-family:\'Arial\'">Offer {n} ends soon &amp; more.</p>',
+        '</td></tr></table>',
+        '<div onclick="track({n})">Click</div>',
+        '<img src="https://track.example.com/open/{n}.gif" width="1" height="1" alt="">',
+        '<IMG SRC="https://Pixel.example.com/{n}.gif">',
+        '<a href="javascript:void({n})">x</a>',
+    ]
+    rng = random.Random(seed)
+    parts = ['<html><head><style>body{margin:0}</style><script>window.a=1</script></head><body>']
+    while sum(map(len, parts)) < size:
+        parts.append(rng.choice(blocks).format(n=len(parts)))
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+CORPUS = [
+    '',
+    'plain text only',
+    '<p>Hello</p>',
+    '<div onclick="steal()">x</div><a href="javascript:alert(1)">y</a>',
+    "<img src='https://cdn.example.com/a.png' onload='x()' width='600'>",
+    '<script type="text/javascript">var a = "<b>";</script><p>after</p>',
+    '<script>one</script>mid<script src="x.js"></script>end',
+    '<script>unterminated <p>text</p>',
+    '<img src="https://track.example.com/o.gif" width="1" height="1">',
+    '<img height=1 width=1 src="x">',
+    '<img width="120" height="150" src="hero.jpg">',
+    '<img src="https://example.com/analytics.js/p.png" alt="a">',
+    '<img src="https://mail.beacon.io/b.gif"><img src="http://telemetry.x/t"><img src="https://logger.x/l">',
+    '<style>p{color:red}</style><p style="color:blue" class="c">t</p>',
+    '<style type="text/css">\n.a{}\n</style><td style=\'padding:0\'>x</td>',
+    '<form action="JavaScript:void(0)"><input onfocus="a()" onblur=\'b()\'></form>',
+    '<a href="https://example.com/?q=javascript:1">safe</a>',
+    'a < b and <b onmouseover="x">bold</b>',
+    '<!--[if mso]><style>v\\:*{}</style><![endif]--><table width="100%" height="1"><tr><td>x</td></tr></table>',
+] + [_marketing_email(seed) for seed in range(3)]
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def email_service():
+    """EmailService with mocked repositories."""
+    return EmailService(email_repository=MagicMock(), sync_state_repository=MagicMock())
+
+# =============================================================================
+# Sanitization Tests
+# =============================================================================
+
+@pytest.mark.parametrize("html", CORPUS)
+def test_minimal_sanitization_matches_chained_passes(email_service, html):
+    """Minimal sanitization output is unchanged by the single-scan sanitizer."""
+    assert email_service._minimal_email_sanitization(html) == _legacy_minimal(html)
+
+@pytest.mark.parametrize("html", CORPUS)
+def test_full_sanitization_matches_chained_passes(email_service, html):
+    """Reader view sanitization output is unchanged by the single-scan sanitizer."""
+    assert email_service._full_email_sanitization(html) == _legacy_full(html)
+
+def test_every_event_handler_is_removed(email_service):
+    """All handlers of a tag are removed, where the chained passes kept all but the last."""
+    html = '<div onclick="a()" onmouseover="b()" class="c">x</div>'
+
+    assert email_service._minimal_email_sanitization(html) == '<div class="c">x</div>'
+
+def test_blocklisted_image_hosts_are_removed_and_reported(email_service):
+    """Images from a blocklisted domain or its subdomains are removed and their hosts reported."""
+    email_service.tracker_blocklist = TrackerBlocklist(["mailtrk.example"])
+    html = ('<p>Hi</p><img src="https://o.mailtrk.example/open?id=1" width="600">'
+            '<img src="https://notmailtrk.example/logo.png"><img src="https://cdn.example.com/x" width=1 height=1>')
+    removed = []
+
+    sanitized = email_service._minimal_email_sanitization(html, removed_trackers=removed)
+
+    assert sanitized == '<p>Hi</p><img src="https://notmailtrk.example/logo.png">'
+    assert removed == ["o.mailtrk.example", "cdn.example.com"]
+
+def test_blocklist_file_matches_domain_suffixes(tmp_path):
+    """Blocklist files accept comments and hosts-file lines; domains match on label boundaries."""
+    path = tmp_path / "blocklist.txt"
+    path.write_text("# trackers\nlist-manage.com\n0.0.0.0 Pixel.Example  # hosts format\n\n")
+
+    blocklist = TrackerBlocklist.from_file(path)
+
+    assert len(blocklist) == 2
+    assert blocklist.match("us1.list-manage.com") == "list-manage.com"
+    assert blocklist.match("pixel.example") == "pixel.example"
+    assert blocklist.match("notlist-manage.com") is None
+    assert blocklist.match("com") is None
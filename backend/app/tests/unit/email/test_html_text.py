@@ -0,0 +1,88 @@
+"""
+Tests for HTML to text conversion.
+
+The reader view produced by the tokenizer is checked against the chained
+regex conversion it replaced, on a corpus of emails.
+"""
+import html
+import re
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.email_service import EmailService
+from app.services.html_text import html_to_reader_text, html_to_text
+
+# =============================================================================
+# Reference Implementation
+# =============================================================================
+
+def _legacy_reader_text(email_service: EmailService, content: str) -> str:
+    """The former _convert_html_to_readable_text."""
+    content = email_service._full_email_sanitization(content)
+    for tag in ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'tr', 'section', 'article']:
+        content = re.sub(f'</{tag}>', f'</{tag}>\n\n', content, flags=re.IGNORECASE)
+    content = re.sub(r'<li[^>]*>', '• ', content, flags=re.IGNORECASE)
+    for i in range(1, 7):
+        content = re.sub(f'<h{i}[^>]*>(.*?)</h{i}>', lambda m: f"\n\n{m.group(1).upper()}\n\n",
+                         content, flags=re.IGNORECASE | re.DOTALL)
+    content = re.sub(r'<[^>]+>', ' ', content)
+    content = html.unescape(content)
+    content = re.sub(r' {2,}', ' ', content)
+    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = re.sub(r'(?i)(-+\s*Forwarded message\s*-+\s*)?'
+                     r'From:.*?(?=To:|Subject:|Date:|$).*?\n', '', content)
+    for header in ('Date', 'To', 'Subject', 'Cc'):
+        content = re.sub(fr'(?i){header}:\s*.*?\n', '', content)
+    content = re.sub(r'(?i)(-+\s*Forwarded message\s*-+\s*)', '', content)
+    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = re.sub(r'([_\-=]{3,})\s*', '\n\n----------\n\n', content)
+    content = re.sub(r'(https?://\S+)', r'\n\1\n', content)
+    content = re.sub(r'(•\s+.*?)(\n•\s+)', r'\1\n\2', content)
+    content = re.sub(r'([^\n])\n([^\n])', r'\1\n\n\2', content)
+    content = re.sub(r'\n{3,}', '\n\n', content)
+    return content.strip()
+
+CORPUS = [
+    '<html><body><h1>Weekly &amp; News</h1><p>Hello <b>there</b>,</p><p>See https://example.com/x now.</p>'
+    '<ul><li>One</li><li class="a">Two</li></ul></body></html>',
+    '<div>---------- Forwarded message ---------<br>From: Alice &lt;a@x.com&gt;<br>Date: Mon<br>'
+    'Subject: Hi<br>To: Bob<br></div><div>Body text here</div>',
+    '<table><tr><td>Cell 1</td><td>Cell 2</td></tr><tr><td>Row 2</td></tr></table>',
+    '<p>Line one<br/>Line two</p><hr><p>____</p><p>after sep</p>',
+    '<div><h2 style="x">Big <i>Title</i></h2><p>Para</p>'
+    '<img src="https://track.example.com/p.gif" width=1 height=1>Tail</div>',
+    '<p>a&nbsp;b &copy; 2024 &#8217;quoted&#8217;</p>',
+    '<!DOCTYPE html><html><head><title>T</title><style>p{}</style></head><body>'
+    '<script>var x="<p>";</script><section><article><p>Art</p></article></section></body></html>',
+    '<p>One</p>\n\n\n<p>Two</p>',
+    '<script>unterminated <p>text</p>',
+    '<div onclick="go()"><a href="javascript:x()">Link</a> and <img src="https://cdn.example.com/a.png"></div>',
+]
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def email_service():
+    """EmailService with mocked repositories."""
+    return EmailService(email_repository=MagicMock(), sync_state_repository=MagicMock())
+
+# =============================================================================
+# Conversion Tests
+# =============================================================================
+
+@pytest.mark.parametrize("content", CORPUS)
+def test_reader_text_matches_regex_conversion(email_service, content):
+    """The tokenizer produces the same reader view as the chained regex passes."""
+    assert email_service._convert_html_to_readable_text(content) == _legacy_reader_text(email_service, content)
+
+def test_uppercase_script_is_skipped():
+    """Scripts are skipped regardless of case, where the regex passes showed their code."""
+    assert html_to_reader_text('<SCRIPT>alert(1)</SCRIPT><p>Hi</p>') == 'Hi'
+
+def test_compact_text_has_one_line_per_paragraph():
+    """Compact text collapses whitespace and drops blank lines."""
+    content = '<h1>Sale</h1>\n<p>Up to   50% off</p><br><ul><li>Shoes</li><li>Bags</li></ul><style>p{}</style>'
+
+    assert html_to_text(content) == 'SALE\nUp to 50% off\n• Shoes\n• Bags'
@@ -0,0 +1,77 @@
+"""
+Tests for the MailboxIdleListener.
+
+The listener holds its IDLE connection against the in-process
+MockIMAPServer; syncing is mocked, so no database is required.
+"""
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.email_service import MailboxSyncResult
+from app.services.idle_listener import MailboxIdleListener
+from app.tests.imap_mock import MockIMAPServer
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def email_service(mock_imap_server):
+    """Email service pointing at the mock server, with syncing mocked."""
+    service = MagicMock(imap_host="127.0.0.1", imap_port=mock_imap_server.port, imap_ssl=False)
+    service.get_imap_credentials = AsyncMock(return_value=("token", "user@example.com"))
+    service.sync_mailbox = AsyncMock(return_value=MailboxSyncResult(emails=[], state=None, full_resync=False))
+    return service
+
+@pytest_asyncio.fixture
+async def listener(email_service):
+    """Listener that is stopped after the test."""
+    listener = MailboxIdleListener(email_service, folder="INBOX", max_connections=1,
+                                   renew_interval=60, max_failures=2)
+    yield listener
+    await listener.stop()
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+# =============================================================================
+# Listener Tests
+# =============================================================================
+
+async def test_new_mail_triggers_sync(listener, email_service, mock_imap_server):
+    """After catching up on connect, each pushed EXISTS syncs the watched folder."""
+    assert listener.watch("user123")
+    await _wait_for(lambda: listener.watching("user123") and "IDLE" in mock_imap_server.commands)
+    assert email_service.sync_mailbox.await_count == 1
+
+    mock_imap_server.add_message()
+
+    await _wait_for(lambda: email_service.sync_mailbox.await_count == 2)
+    email_service.sync_mailbox.assert_awaited_with("token", "user@example.com", "user123", folder="INBOX")
+
+async def test_connection_cap_leaves_accounts_to_polling(listener):
+    """Accounts over max_connections are not watched."""
+    assert listener.watch("user1")
+    assert not listener.watch("user2")
+
+async def test_server_without_idle_falls_back_to_polling(email_service):
+    """An account whose server lacks IDLE is given up without retrying."""
+    server = await MockIMAPServer(capabilities=["IMAP4rev1", "AUTH=XOAUTH2"]).start()
+    email_service.imap_port = server.port
+    listener = MailboxIdleListener(email_service, folder="INBOX", max_connections=5)
+    try:
+        listener.watch("user123")
+        await _wait_for(lambda: "user123" not in listener._watchers)
+
+        assert not listener.watching("user123")
+        assert not listener.watch("user123")
+        assert server.connections == 1
+    finally:
+        await listener.stop()
+        await server.close()
@@ -0,0 +1,67 @@
+"""
+Tests for the bounded stage pipeline used by IMAP ingestion.
+"""
+import asyncio
+import threading
+import pytest
+
+from app.services.imap import PipelineAborted, StageQueue, run_pipeline
+
+# =============================================================================
+# StageQueue Tests
+# =============================================================================
+
+async def test_queue_applies_backpressure():
+    """A producer blocks once maxsize items are waiting for the consumer."""
+    queue = StageQueue(maxsize=1)
+    await queue.put(1)
+
+    blocked = asyncio.ensure_future(queue.put(2))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    queue.abort()
+    with pytest.raises(PipelineAborted):
+        await blocked
+
+async def test_put_threadsafe_from_worker_thread():
+    """A producer in a worker thread hands items over in order."""
+    queue = StageQueue(maxsize=1)
+
+    def produce():
+        for n in range(5):
+            queue.put_threadsafe(n)
+
+    async def producer():
+        await asyncio.to_thread(produce)
+        await queue.close()
+
+    async def consumer():
+        return [item async for item in queue]
+
+    _, items = await run_pipeline([producer(), consumer()], [queue])
+    assert items == [0, 1, 2, 3, 4]
+
+# =============================================================================
+# run_pipeline Tests
+# =============================================================================
+
+async def test_failing_consumer_stops_producer():
+    """When a consumer fails, the blocked producer is released and the error is raised."""
+    queue = StageQueue(maxsize=1)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for n in range(100):
+                queue.put_threadsafe(n)
+        except PipelineAborted:
+            stopped.set()
+
+    async def consumer():
+        async for _ in queue:
+            raise ValueError("parse failed")
+
+    with pytest.raises(ValueError):
+        await run_pipeline([asyncio.to_thread(produce), consumer()], [queue])
+    assert await asyncio.to_thread(stopped.wait, 1)
@@ -0,0 +1,148 @@
+"""
+Tests for the IMAPConnectionPool class.
+
+These tests use mocked IMAPClient connections, so no network access is
+required.
+"""
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.imap import IMAPConnectionPool, PoolExhaustedError
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def connect():
+    """Connection factory that returns a new mocked client per login."""
+    return MagicMock(side_effect=lambda email_account, token: MagicMock(name=f"{email_account}:{token}"))
+
+@pytest.fixture
+def pool(connect):
+    """Pool with a small per-account cap and no waiting for free connections."""
+    return IMAPConnectionPool(connect, max_per_account=2, acquire_timeout=0)
+
+# =============================================================================
+# Reuse Tests
+# =============================================================================
+
+def test_connection_is_reused(pool, connect):
+    """A released connection is handed out again without a new login."""
+    with pool.connection("user@example.com", "token") as first:
+        pass
+    with pool.connection("user@example.com", "token") as second:
+        pass
+
+    assert first is second
+    connect.assert_called_once_with("user@example.com", "token")
+    first.logout.assert_not_called()
+
+def test_connections_are_separate_per_account(pool, connect):
+    """Accounts never share connections."""
+    with pool.connection("a@example.com", "token") as first:
+        pass
+    with pool.connection("b@example.com", "token") as second:
+        pass
+
+    assert first is not second
+    assert connect.call_count == 2
+
+def test_failed_block_discards_connection(pool, connect):
+    """A connection whose block raised is logged out instead of being reused."""
+    with pytest.raises(RuntimeError):
+        with pool.connection("user@example.com", "token") as client:
+            raise RuntimeError("connection reset")
+
+    client.logout.assert_called_once()
+    with pool.connection("user@example.com", "token") as fresh:
+        assert fresh is not client
+
+# =============================================================================
+# Token Rotation Tests
+# =============================================================================
+
+def test_rotated_token_logs_in_again(pool, connect):
+    """A new token never reuses a session authenticated with the old one."""
+    with pool.connection("user@example.com", "old") as old:
+        pass
+    with pool.connection("user@example.com", "new") as new:
+        pass
+
+    assert old is not new
+    connect.assert_called_with("user@example.com", "new")
+
+def test_rotated_token_replaces_stale_connection_at_cap(pool, connect):
+    """At the cap, an idle connection with an old token is replaced rather than waited for."""
+    with pool.connection("user@example.com", "old") as first, \
+         pool.connection("user@example.com", "old") as second:
+        pass
+    with pool.connection("user@example.com", "new"):
+        pass
+
+    assert first.logout.call_count + second.logout.call_count == 1
+    assert pool.stats()["user@example.com"] == {"open": 2, "idle": 2}
+
+# =============================================================================
+# Limit, Eviction and Health Check Tests
+# =============================================================================
+
+def test_cap_limits_connections_per_account(pool):
+    """Borrowing more than max_per_account connections fails once the wait times out."""
+    with pool.connection("user@example.com", "token"), pool.connection("user@example.com", "token"):
+        with pytest.raises(PoolExhaustedError):
+            with pool.connection("user@example.com", "token"):
+                pass
+
+def test_waiter_gets_released_connection(connect):
+    """A borrower at the cap receives the next connection that is released."""
+    pool = IMAPConnectionPool(connect, max_per_account=1, acquire_timeout=5)
+    borrowed = []
+
+    with pool.connection("user@example.com", "token") as first:
+        waiter = threading.Thread(target=lambda: borrowed.append(
+            pool.connection("user@example.com", "token").__enter__()
+        ))
+        waiter.start()
+    waiter.join(timeout=5)
+
+    assert borrowed == [first]
+    assert connect.call_count == 1
+
+def test_idle_connections_are_evicted(connect):
+    """Connections idle for longer than idle_timeout are logged out."""
+    pool = IMAPConnectionPool(connect, idle_timeout=0)
+    with pool.connection("user@example.com", "token") as client:
+        pass
+
+    assert pool.evict_idle() == 1
+    client.logout.assert_called_once()
+    assert pool.stats() == {}
+
+def test_unhealthy_connection_is_replaced(connect):
+    """A connection failing NOOP is discarded and a fresh one is opened."""
+    pool = IMAPConnectionPool(connect, health_check_interval=0)
+    with pool.connection("user@example.com", "token") as stale:
+        pass
+    stale.noop.side_effect = OSError("socket closed")
+
+    with pool.connection("user@example.com", "token") as fresh:
+        pass
+
+    assert fresh is not stale
+    stale.logout.assert_called_once()
+    assert connect.call_count == 2
+
+def test_close_all_logs_out_idle_connections(pool):
+    """close_all() logs out every idle connection."""
+    with pool.connection("a@example.com", "token") as first:
+        pass
+    with pool.connection("b@example.com", "token") as second:
+        pass
+
+    pool.close_all()
+
+    first.logout.assert_called_once()
+    second.logout.assert_called_once()
+    assert pool.stats() == {}
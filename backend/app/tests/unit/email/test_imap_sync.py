@@ -0,0 +1,439 @@
+"""
+Tests for IMAP synchronization in the EmailService class.
+
+These tests drive the synchronous IMAP code paths against a mocked
+IMAPClient connection, so no network access is required.
+"""
+import asyncio
+import base64
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timezone
+
+from imapclient.response_parser import parse_fetch_response
+from starlette.concurrency import run_in_threadpool
+
+from app.models import BodyPartRef, EmailSchema, MailboxSyncState
+from app.services.email_service import EmailService
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _raw_email(uid: int) -> bytes:
+    """Build a minimal RFC822 message for the given UID."""
+    return (
+        f'From: sender{uid}@example.com\r\n'
+        f'To: recipient@example.com\r\n'
+        f'Subject: Message {uid}\r\n'
+        f'Date: Tue, 17 Mar 2023 12:30:45 +0000\r\n'
+        f'Content-Type: text/plain; charset="utf-8"\r\n'
+        f'\r\n'
+        f'Body of message {uid}\r\n'
+    ).encode()
+
+def _fetch_response(uids):
+    """Build an IMAPClient-style FETCH response for the given UIDs."""
+    return {
+        uid: {
+            b'BODY[]': _raw_email(uid),
+            b'FLAGS': (b'\\Seen',) if uid % 2 == 0 else (),
+            b'INTERNALDATE': datetime(2023, 3, 17, 12, 0, 0, tzinfo=timezone.utc),
+            b'SEQ': uid,
+        }
+        for uid in uids
+    }
+
+@pytest.fixture
+def imap_service():
+    """EmailService with a mocked repository and a small fetch chunk size."""
+    service = EmailService(email_repository=MagicMock(), sync_state_repository=MagicMock())
+    service.fetch_chunk_size = 2
+    return service
+
+@pytest.fixture
+def mock_server():
+    """Mocked IMAPClient connection that serves any requested UIDs."""
+    server = MagicMock()
+    server.fetch.side_effect = lambda uids, data_items: _fetch_response(uids)
+    server.select_folder.return_value = {b'UIDVALIDITY': 7, b'UIDNEXT': 11}
+    server.has_capability.return_value = False
+    server.__enter__.return_value = server
+    server.__exit__.return_value = None
+    return server
+
+# =============================================================================
+# Chunked FETCH Tests
+# =============================================================================
+
+def test_fetch_uses_chunked_multi_uid_commands(imap_service, mock_server):
+    """Five UIDs with a chunk size of two should take three FETCH round trips."""
+    mock_server.search.return_value = [1, 2, 3, 4, 5]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    emails = imap_service._fetch_from_imap_sync("token", "user@example.com", google_id="user123")
+
+    assert [e["email_id"] for e in emails] == ["1", "2", "3", "4", "5"]
+    assert [call.args[0] for call in mock_server.fetch.call_args_list] == [[1, 2], [3, 4], [5]]
+    assert [e["is_read"] for e in emails] == [False, True, False, True, False]
+
+def test_fetch_isolates_failing_message(imap_service, mock_server):
+    """A chunk that fails is retried per UID, so only the bad message is dropped."""
+    def fetch(uids, data_items):
+        if 2 in uids:
+            raise Exception("bad message")
+        return _fetch_response(uids)
+
+    mock_server.fetch.side_effect = fetch
+    mock_server.search.return_value = [1, 2, 3]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    emails = imap_service._fetch_from_imap_sync("token", "user@example.com", google_id="user123")
+
+    assert [e["email_id"] for e in emails] == ["1", "3"]
+
+def test_fetch_skips_expunged_messages(imap_service, mock_server):
+    """UIDs missing from the FETCH response are skipped without error."""
+    mock_server.fetch.side_effect = lambda uids, data_items: _fetch_response([u for u in uids if u != 3])
+    mock_server.search.return_value = [1, 2, 3, 4]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    emails = imap_service._fetch_from_imap_sync("token", "user@example.com", google_id="user123")
+
+    assert [e["email_id"] for e in emails] == ["1", "2", "4"]
+
+# =============================================================================
+# Incremental Sync Tests
+# =============================================================================
+
+def _state(uidvalidity=7, last_uid=8, highest_modseq=None):
+    return MailboxSyncState(google_id="user123", folder="INBOX", uidvalidity=uidvalidity,
+                            last_uid=last_uid, highest_modseq=highest_modseq)
+
+def test_sync_without_state_does_full_resync(imap_service, mock_server):
+    """The first sync searches ALL and keeps only the newest messages."""
+    mock_server.search.return_value = list(range(1, 11))
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    result = imap_service._sync_mailbox_sync("token", "user@example.com", "user123", "INBOX", None, limit=3)
+
+    assert result.full_resync is True
+    mock_server.search.assert_called_once_with(['ALL'])
+    assert [e["email_id"] for e in result.emails] == ["8", "9", "10"]
+    assert result.state.uidvalidity == 7
+    assert result.state.last_uid == 10
+
+def test_sync_fetches_only_new_uids(imap_service, mock_server):
+    """With a matching UIDVALIDITY only UIDs above the high-water mark are fetched."""
+    mock_server.search.return_value = [8, 9, 10]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    result = imap_service._sync_mailbox_sync("token", "user@example.com", "user123", "INBOX", _state(), limit=50)
+
+    assert result.full_resync is False
+    mock_server.search.assert_called_once_with(['UID', '9:*'])
+    assert [e["email_id"] for e in result.emails] == ["9", "10"]
+    assert result.state.last_uid == 10
+
+def test_sync_skips_search_when_uidnext_unchanged(imap_service, mock_server):
+    """When UIDNEXT shows no new mail, neither SEARCH nor FETCH is issued."""
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    result = imap_service._sync_mailbox_sync("token", "user@example.com", "user123", "INBOX", _state(last_uid=10), limit=50)
+
+    mock_server.search.assert_not_called()
+    mock_server.fetch.assert_not_called()
+    assert result.emails == []
+    assert result.state.last_uid == 10
+
+def test_sync_uidvalidity_change_triggers_full_resync(imap_service, mock_server):
+    """A different UIDVALIDITY invalidates the stored high-water mark."""
+    mock_server.search.return_value = [1, 2]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    result = imap_service._sync_mailbox_sync("token", "user@example.com", "user123", "INBOX", _state(uidvalidity=3), limit=50)
+
+    assert result.full_resync is True
+    mock_server.search.assert_called_once_with(['ALL'])
+    assert result.state.uidvalidity == 7
+    assert result.state.last_uid == 2
+
+def test_sync_does_not_advance_past_unfetched_uids(imap_service, mock_server):
+    """UIDs the server failed to return hold back the high-water mark."""
+    def fetch(uids, data_items):
+        if 10 in uids:
+            raise Exception("connection reset")
+        return _fetch_response(uids)
+
+    mock_server.fetch.side_effect = fetch
+    mock_server.search.return_value = [9, 10]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    result = imap_service._sync_mailbox_sync("token", "user@example.com", "user123", "INBOX", _state(), limit=50)
+
+    assert result.state.last_uid == 9
+
+@pytest.mark.asyncio
+async def test_sync_mailbox_persists_state_after_saving(imap_service, mock_server):
+    """The new state is stored once the fetched emails are saved."""
+    mock_server.search.return_value = [9, 10]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+    imap_service.sync_state_repository.find_state = AsyncMock(return_value=_state())
+    imap_service.sync_state_repository.save_state = AsyncMock(return_value=True)
+    imap_service.save_emails_to_db = AsyncMock()
+
+    result = await imap_service.sync_mailbox("token", "user@example.com", "user123")
+
+    [batch] = [call.args[0] for call in imap_service.save_emails_to_db.await_args_list]
+    assert [e["email_id"] for e in batch] == ["9", "10"]
+    imap_service.sync_state_repository.save_state.assert_awaited_once_with(result.state)
+
+@pytest.mark.asyncio
+async def test_sync_mailbox_uidvalidity_change_purges_only_that_folder(imap_service, mock_server, monkeypatch):
+    """A UIDVALIDITY change drops the folder's emails and summaries, not the rest of the user's mail."""
+    summary_repository = MagicMock(delete_by_email_ids=AsyncMock(return_value=True))
+    monkeypatch.setattr("app.services.email_service.get_summary_repository", lambda: summary_repository)
+    mock_server.search.return_value = [1, 2]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+    imap_service.sync_state_repository.find_state = AsyncMock(return_value=_state(uidvalidity=3))
+    imap_service.sync_state_repository.save_state = AsyncMock(return_value=True)
+    imap_service.email_repository.find_email_ids_by_folder = AsyncMock(return_value=["4", "5"])
+    imap_service.email_repository.delete_by_folder = AsyncMock(return_value=True)
+    imap_service.email_repository.delete_by_google_id = AsyncMock()
+    imap_service.save_emails_to_db = AsyncMock()
+
+    await imap_service.sync_mailbox("token", "user@example.com", "user123", folder="INBOX")
+
+    imap_service.email_repository.delete_by_folder.assert_awaited_once_with("user123", "INBOX")
+    summary_repository.delete_by_email_ids.assert_awaited_once_with(["4", "5"], "user123")
+    imap_service.email_repository.delete_by_google_id.assert_not_called()
+
+# =============================================================================
+# Multi-folder Sync Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+async def test_sync_mailboxes_caps_concurrent_folders(imap_service):
+    """Folders sync concurrently, never more than folder_concurrency at once per account."""
+    imap_service.folder_concurrency = 2
+    running, peak = 0, 0
+
+    async def sync_mailbox(token, email_account, google_id, folder, limit):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return MagicMock(emails=[{"email_id": f"{folder}:1"}])
+
+    imap_service.sync_mailbox = sync_mailbox
+    results = await imap_service.sync_mailboxes("token", "user@example.com", "user123",
+                                                folders=["INBOX", "Work", "Receipts", "Travel"])
+
+    assert list(results) == ["INBOX", "Work", "Receipts", "Travel"]
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_sync_mailboxes_isolates_failing_folder(imap_service):
+    """A folder that can't be synced doesn't stop the others."""
+    async def sync_mailbox(token, email_account, google_id, folder, limit):
+        if folder == "Missing":
+            raise Exception("SELECT failed: no such mailbox")
+        return MagicMock(emails=[])
+
+    imap_service.sync_mailbox = sync_mailbox
+    results = await imap_service.sync_mailboxes("token", "user@example.com", "user123", folders=["INBOX", "Missing"])
+
+    assert list(results) == ["INBOX"]
+
+def test_non_inbox_email_ids_are_scoped_by_folder(imap_service, mock_server):
+    """UIDs are per folder, so emails from other folders get folder-qualified IDs."""
+    mock_server.search.return_value = [1, 2]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    emails = imap_service._fetch_from_imap_sync("token", "user@example.com", google_id="user123", folder="Work")
+
+    assert [e["email_id"] for e in emails] == ["Work:1", "Work:2"]
+    assert {e["folder"] for e in emails} == {"Work"}
+    assert imap_service._uid_from_email_id("Work:2") == 2
+
+# =============================================================================
+# Flag Delta Sync Tests
+# =============================================================================
+
+@pytest.fixture
+def qresync_server(mock_server):
+    """Mocked connection advertising QRESYNC with a raised HIGHESTMODSEQ."""
+    mock_server.has_capability.side_effect = lambda name: name in ('ENABLE', 'QRESYNC', 'CONDSTORE')
+    mock_server.enable.return_value = [b'QRESYNC']
+    mock_server.select_folder.return_value = {b'UIDVALIDITY': 7, b'UIDNEXT': 11, b'HIGHESTMODSEQ': 120}
+    mock_server._imap.uid.return_value = ('OK', [
+        b'3 (UID 3 FLAGS (\\Seen) MODSEQ (118))',
+        b'5 (UID 5 FLAGS () MODSEQ (119))',
+    ])
+    mock_server._imap.untagged_responses = {'VANISHED': [b'(EARLIER) 6:7']}
+    return mock_server
+
+def test_flag_sync_uses_changedsince_and_vanished(imap_service, qresync_server):
+    """Flag changes and expunges arrive in one FETCH without downloading bodies."""
+    imap_service._get_imap_connection = MagicMock(return_value=qresync_server)
+
+    result = imap_service._sync_mailbox_sync(
+        "token", "user@example.com", "user123", "INBOX", _state(last_uid=10, highest_modseq=100), limit=50
+    )
+
+    qresync_server.enable.assert_called_once_with('QRESYNC')
+    qresync_server._imap.uid.assert_called_once_with('FETCH', '1:10', '(FLAGS)', '(CHANGEDSINCE 100 VANISHED)')
+    qresync_server.fetch.assert_not_called()
+    assert result.read_states == {3: True, 5: False}
+    assert result.vanished_uids == [6, 7]
+    assert result.state.highest_modseq == 120
+
+def test_flag_sync_skipped_when_modseq_unchanged(imap_service, qresync_server):
+    """An unchanged HIGHESTMODSEQ means no flag FETCH is needed."""
+    imap_service._get_imap_connection = MagicMock(return_value=qresync_server)
+
+    result = imap_service._sync_mailbox_sync(
+        "token", "user@example.com", "user123", "INBOX", _state(last_uid=10, highest_modseq=120), limit=50
+    )
+
+    qresync_server._imap.uid.assert_not_called()
+    assert result.read_states == {}
+    assert result.vanished_uids == []
+
+@pytest.mark.asyncio
+async def test_sync_mailbox_applies_flag_changes_in_bulk(imap_service, qresync_server, monkeypatch):
+    """Read states are written in one bulk update and vanished emails are removed."""
+    summary_repository = MagicMock()
+    summary_repository.delete_by_email_ids = AsyncMock(return_value=True)
+    monkeypatch.setattr("app.services.email_service.get_summary_repository", lambda: summary_repository)
+    imap_service._get_imap_connection = MagicMock(return_value=qresync_server)
+    imap_service.sync_state_repository.find_state = AsyncMock(return_value=_state(last_uid=10, highest_modseq=100))
+    imap_service.sync_state_repository.save_state = AsyncMock(return_value=True)
+    imap_service.email_repository.bulk_update_read_state = AsyncMock(return_value=2)
+    imap_service.email_repository.delete_by_email_ids = AsyncMock(return_value=True)
+
+    await imap_service.sync_mailbox("token", "user@example.com", "user123")
+
+    imap_service.email_repository.bulk_update_read_state.assert_awaited_once_with({"3": True, "5": False}, "user123")
+    imap_service.email_repository.delete_by_email_ids.assert_awaited_once_with(["6", "7"], "user123")
+    summary_repository.delete_by_email_ids.assert_awaited_once_with(["6", "7"], "user123")
+
+@pytest.mark.asyncio
+async def test_flag_sync_survives_pooled_connection_reuse(imap_service, mock_imap_server, monkeypatch):
+    """CONDSTORE/QRESYNC stays enabled when a later sync reuses a connection that already selected a folder."""
+    monkeypatch.setattr("app.services.email_service.get_summary_repository",
+                        lambda: MagicMock(delete_by_email_ids=AsyncMock()))
+    saved_states = []
+    imap_service.imap_host, imap_service.imap_port, imap_service.imap_ssl = "127.0.0.1", mock_imap_server.port, False
+    imap_service.sync_state_repository.find_state = AsyncMock(side_effect=lambda *_: saved_states[-1] if saved_states else None)
+    imap_service.sync_state_repository.save_state = AsyncMock(side_effect=saved_states.append)
+    imap_service.email_repository.bulk_update_read_state = AsyncMock()
+    imap_service.email_repository.delete_by_email_ids = AsyncMock()
+    imap_service.save_emails_to_db = AsyncMock()
+    for uid in range(1, 4):
+        mock_imap_server.add_message(_raw_email(uid))
+
+    try:
+        await imap_service.sync_mailbox("token", "user@example.com", "user123")
+        mock_imap_server.set_flags(1, {b'\\Seen'})
+        second = await imap_service.sync_mailbox("token", "user@example.com", "user123")
+        mock_imap_server.expunge(2)
+        third = await imap_service.sync_mailbox("token", "user@example.com", "user123")
+    finally:
+        # Blocking LOGOUTs must not run on the loop serving the mock server
+        await run_in_threadpool(imap_service.connection_pool.close_all)
+
+    assert mock_imap_server.connections == 1
+    assert second.read_states == {1: True}
+    assert third.vanished_uids == [2]
+    assert third.state.highest_modseq == mock_imap_server.mailboxes["INBOX"].highest_modseq
+
+# =============================================================================
+# Headers-only Ingestion Tests
+# =============================================================================
+
+_HEADERS_ONLY_RESPONSE = (
+    b'1 (UID 5 RFC822.SIZE 5120 FLAGS (\\Seen) INTERNALDATE "17-Mar-2023 12:00:00 +0000" '
+    b'ENVELOPE ("Tue, 17 Mar 2023 12:30:45 +0000" "=?utf-8?q?Quarterly_report?=" '
+    b'(("Alice" NIL "alice" "example.com")) (("Alice" NIL "alice" "example.com")) '
+    b'(("Alice" NIL "alice" "example.com")) (("Bob" NIL "bob" "example.com")(NIL NIL "carol" "example.com")) '
+    b'NIL NIL NIL "<id@example.com>") '
+    b'BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "QUOTED-PRINTABLE" 20 1 NIL NIL NIL)'
+    b'("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "BASE64" 40 1 NIL NIL NIL) "ALTERNATIVE" ("BOUNDARY" "b1") NIL NIL)'
+    b'("APPLICATION" "PDF" ("NAME" "big.pdf") NIL NIL "BASE64" 5000000 NIL ("ATTACHMENT" ("FILENAME" "big.pdf")) NIL) '
+    b'"MIXED" ("BOUNDARY" "b0") NIL NIL))'
+)
+
+def test_headers_only_fetch_skips_bodies(imap_service, mock_server):
+    """Headers-only mode never requests message bodies and records the body part to load later."""
+    imap_service.headers_only = True
+    mock_server.fetch.side_effect = lambda uids, data_items: parse_fetch_response([_HEADERS_ONLY_RESPONSE])
+    mock_server.search.return_value = [5]
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+
+    emails = imap_service._fetch_from_imap_sync("token", "user@example.com", google_id="user123")
+
+    data_items = mock_server.fetch.call_args.args[1]
+    assert not any(item.startswith(('BODY[', 'BODY.PEEK[', 'RFC822')) and item != 'RFC822.SIZE' for item in data_items)
+    assert emails[0]["subject"] == "Quarterly report"
+    assert emails[0]["sender"] == "Alice <alice@example.com>"
+    assert emails[0]["recipients"] == ["Bob <bob@example.com>", "carol@example.com"]
+    assert emails[0]["is_read"] is True
+    assert emails[0]["size"] == 5120
+    assert emails[0]["body_loaded"] is False
+    assert emails[0]["body_ref"] == BodyPartRef(section="1.2", content_type="text/html", encoding="base64",
+                                                folder="INBOX", uidvalidity=7)
+
+@pytest.mark.asyncio
+async def test_load_email_body_fetches_single_part(imap_service, mock_server):
+    """The stored body part is fetched with BODY.PEEK, decoded and saved."""
+    html = b'<p>Revenue is up</p>'
+    mock_server.fetch.side_effect = lambda uids, data_items: {5: {b'BODY[1.2]': base64.b64encode(html)}}
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+    imap_service.get_imap_credentials = AsyncMock(return_value=("token", "user@example.com"))
+    imap_service.email_repository.update_by_email_and_google_id = AsyncMock(return_value=True)
+    headers_only = EmailSchema(
+        google_id="user123", email_id="5", sender="alice@example.com", recipients=[], subject="Report", body="",
+        body_loaded=False, body_ref=BodyPartRef(section="1.2", content_type="text/html", encoding="base64")
+    )
+
+    loaded = await imap_service.load_email_body(headers_only)
+
+    mock_server.fetch.assert_called_once_with([5], ['BODY.PEEK[1.2]'])
+    assert loaded.body == html.decode()
+    assert loaded.body_loaded is True
+    imap_service.email_repository.update_by_email_and_google_id.assert_awaited_once_with(
+        "5", "user123", {"body": html.decode(), "body_loaded": True, "removed_trackers": []}
+    )
+
+@pytest.mark.asyncio
+async def test_load_email_body_skips_stale_uidvalidity(imap_service, mock_server):
+    """A body reference from before a UIDVALIDITY change is never used to fetch another message's part."""
+    imap_service._get_imap_connection = MagicMock(return_value=mock_server)
+    imap_service.get_imap_credentials = AsyncMock(return_value=("token", "user@example.com"))
+    headers_only = EmailSchema(
+        google_id="user123", email_id="5", sender="alice@example.com", recipients=[], subject="Report", body="",
+        body_loaded=False, body_ref=BodyPartRef(section="1", uidvalidity=6)
+    )
+
+    loaded = await imap_service.load_email_body(headers_only)
+
+    mock_server.select_folder.assert_called_once_with("INBOX", readonly=True)
+    mock_server.fetch.assert_not_called()
+    assert loaded.body_loaded is False
+
+@pytest.mark.asyncio
+async def test_get_email_falls_back_to_headers_when_imap_fails(imap_service):
+    """An unreachable mailbox still lets the stored headers-only email be returned."""
+    headers_only = EmailSchema(
+        google_id="user123", email_id="5", sender="alice@example.com", recipients=[], subject="Report", body="",
+        body_loaded=False, body_ref=BodyPartRef(section="1")
+    )
+    imap_service.email_repository.find_by_email_and_google_id = AsyncMock(return_value=headers_only)
+    imap_service.get_imap_credentials = AsyncMock(side_effect=Exception("No token found for user user123"))
+
+    email = await imap_service.get_email("5", "user123")
+
+    assert email.subject == "Report"
+    assert email.body_loaded is False
@@ -0,0 +1,92 @@
+"""
+Tests for MIME body extraction in the EmailService class.
+"""
+import email
+import pytest
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from unittest.mock import MagicMock
+
+from app.services.email_service import EmailService, ParsedBody
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def email_service():
+    """EmailService with mocked repositories."""
+    return EmailService(email_repository=MagicMock(), sync_state_repository=MagicMock())
+
+def _multipart(html: str = "<p>Hello <b>Bob</b></p>") -> bytes:
+    message = MIMEMultipart("mixed")
+    alternative = MIMEMultipart("alternative")
+    alternative.attach(MIMEText("Hello Bob", "plain", "utf-8"))
+    alternative.attach(MIMEText(html, "html", "iso-8859-1"))
+    message.attach(alternative)
+    attachment = MIMEApplication(b"%PDF-1.4", Name="report.pdf")
+    attachment["Content-Disposition"] = 'attachment; filename="report.pdf"'
+    message.attach(attachment)
+    message["Subject"] = "Hello"
+    message["From"] = "alice@example.com"
+    message["Date"] = "Tue, 17 Mar 2023 12:30:45 +0000"
+    return message.as_bytes()
+
+# =============================================================================
+# Body Extraction Tests
+# =============================================================================
+
+def test_html_part_is_decoded_with_its_charset(email_service):
+    """HTML is preferred, attachments are skipped and the part's charset is honoured."""
+    message = email.message_from_bytes(_multipart("<p>Café</p>"))
+
+    assert email_service._extract_email_body(message) == ParsedBody(content="<p>Café</p>", is_html=True)
+
+def test_fetched_message_is_sanitized_once(email_service, monkeypatch):
+    """Parsing a fetched message walks, decodes and sanitizes the body a single time."""
+    sanitize = MagicMock(side_effect=lambda html, **kwargs: html)
+    decode = MagicMock(side_effect=email_service._decode_part)
+    monkeypatch.setattr(email_service, "_minimal_email_sanitization", sanitize)
+    monkeypatch.setattr(email_service, "_decode_part", decode)
+
+    email_data = email_service._parse_fetched_message(1, {b'BODY[]': _multipart(), b'FLAGS': ()}, "user123")
+
+    assert email_data["body"] == "<p>Hello <b>Bob</b></p>"
+    assert email_data["is_html"] is True
+    assert sanitize.call_count == 1
+    assert decode.call_count == 1
+
+# =============================================================================
+# Parse Worker Tests
+# =============================================================================
+
+async def test_process_pool_matches_in_process_parsing(email_service):
+    """Messages parsed by worker processes come back exactly as parsed in-process."""
+    fetched = [(uid, {b'BODY[]': _multipart(f"<p>Message {uid}</p>"), b'FLAGS': ()}) for uid in range(1, 6)]
+    email_service.parse_processes, email_service.parse_task_size = 2, 2
+    try:
+        emails = await email_service._parse_fetched_messages_async(fetched, "user123", "Work", 7)
+    finally:
+        email_service.close_parse_pool()
+
+    assert emails == email_service._parse_fetched_messages(fetched, "user123", "Work", 7)
+    assert [e["email_id"] for e in emails] == ["Work:1", "Work:2", "Work:3", "Work:4", "Work:5"]
+
+async def test_broken_process_pool_falls_back_to_in_process(email_service, monkeypatch):
+    """When the workers die, the chunk is parsed in-process and the pool is no longer used."""
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenPool:
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+        def shutdown(self, **kwargs):
+            pass
+
+    email_service.parse_processes, email_service._parse_pool = 1, BrokenPool()
+    fetched = [(1, {b'BODY[]': _multipart(), b'FLAGS': ()})]
+
+    emails = await email_service._parse_fetched_messages_async(fetched, "user123")
+
+    assert [e["email_id"] for e in emails] == ["1"]
+    assert email_service.parse_processes == 0 and email_service._parse_pool is None
@@ -0,0 +1,74 @@
+"""
+Tests for the stored reader view in the EmailService class.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models import EmailSchema
+from app.services.email_service import READER_VIEW_VERSION, EmailService
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+EMAIL = EmailSchema(
+    google_id="user123", email_id="42", sender="alice@example.com", recipients=["bob@example.com"],
+    subject="Quarterly numbers", body="<div><p>Revenue is up</p><style>p{}</style></div>"
+)
+
+@pytest.fixture
+def email_repository():
+    """Email repository holding EMAIL, without a stored reader view."""
+    repository = MagicMock()
+    repository.find_reader_view = AsyncMock(return_value={"email_id": "42", "subject": EMAIL.subject})
+    repository.find_by_email_and_google_id = AsyncMock(return_value=EMAIL)
+    repository.update_by_email_and_google_id = AsyncMock(return_value=True)
+    return repository
+
+@pytest.fixture
+def email_service(email_repository):
+    """EmailService with a mocked email repository."""
+    return EmailService(email_repository=email_repository, sync_state_repository=MagicMock())
+
+# =============================================================================
+# Reader View Tests
+# =============================================================================
+
+@pytest.mark.parametrize("stored", [None, {"content": "stale", "content_type": "html", "original_length": 1, "version": 0}])
+async def test_reader_view_is_computed_and_stored(email_service, email_repository, stored):
+    """A missing or outdated reader view is converted from the body and stored with the email."""
+    if stored:
+        email_repository.find_reader_view.return_value["reader_view"] = stored
+
+    response = await email_service.get_email_reader_view("42", "user123")
+
+    assert response.content_type == "html"
+    assert "Revenue is up" in response.reader_content
+    assert response.original_length == len(EMAIL.body)
+    email_repository.update_by_email_and_google_id.assert_awaited_once()
+    email_id, google_id, update = email_repository.update_by_email_and_google_id.await_args.args
+    assert (email_id, google_id) == ("42", "user123")
+    assert update["reader_view"]["content"] == response.reader_content
+    assert update["reader_view"]["version"] == READER_VIEW_VERSION
+
+async def test_stored_reader_view_is_a_single_read(email_service, email_repository, monkeypatch):
+    """A reader view stored by the current converter is returned without loading or converting the body."""
+    email_repository.find_reader_view.return_value["reader_view"] = {
+        "content": "Revenue is up", "content_type": "html", "original_length": 64, "version": READER_VIEW_VERSION
+    }
+    convert = MagicMock()
+    monkeypatch.setattr(email_service, "_convert_html_to_readable_text", convert)
+
+    response = await email_service.get_email_reader_view("42", "user123")
+
+    assert response.reader_content == "Revenue is up"
+    assert response.processed_length == len("Revenue is up")
+    email_repository.find_by_email_and_google_id.assert_not_awaited()
+    email_repository.update_by_email_and_google_id.assert_not_awaited()
+    convert.assert_not_called()
+
+async def test_missing_email_has_no_reader_view(email_service, email_repository):
+    """An email that does not exist has no reader view."""
+    email_repository.find_reader_view.return_value = None
+
+    assert await email_service.get_email_reader_view("7", "user123") is None
@@ -0,0 +1,104 @@
+"""
+Tests for the background MailboxSyncScheduler.
+
+The email service and user repository are mocked, so no database or IMAP
+server is required.
+"""
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.sync_scheduler import MailboxSyncScheduler
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def email_service():
+    """Email service whose refreshes succeed immediately."""
+    return MagicMock(refresh_mailboxes=AsyncMock(return_value={"timing": {}}))
+
+@pytest.fixture
+def user_repository():
+    """User repository with three users polling every 60 seconds."""
+    return MagicMock(find_fetch_frequencies=AsyncMock(return_value={"u1": "60", "u2": "60", "u3": None}))
+
+@pytest_asyncio.fixture
+async def scheduler(email_service, user_repository):
+    """Scheduler without jitter; stopped after the test."""
+    scheduler = MailboxSyncScheduler(email_service, user_repository, max_concurrency=2, jitter=0,
+                                     min_interval=30, max_backoff=300, scan_interval=3600, idle=False)
+    yield scheduler
+    await scheduler.stop()
+
+# =============================================================================
+# Scheduling Tests
+# =============================================================================
+
+async def test_loads_users_with_fetch_frequency(scheduler):
+    """Each user is synced on their fetch_frequency, with the default for unset preferences."""
+    await scheduler._load_users()
+
+    assert scheduler._intervals == {"u1": 60, "u2": 60, "u3": 120}
+    assert all(due <= time.monotonic() + 120 for due in scheduler._next_sync.values())
+
+async def test_concurrency_is_limited(scheduler, email_service):
+    """Requested syncs run in the background, never more than max_concurrency at once."""
+    active = peak = 0
+
+    async def refresh(google_id):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {}
+
+    email_service.refresh_mailboxes.side_effect = refresh
+    scheduler.start()
+    await asyncio.sleep(0)
+    for google_id in ("u1", "u2", "u3"):
+        scheduler.request_sync(google_id)
+
+    for _ in range(100):
+        if email_service.refresh_mailboxes.await_count == 3 and not scheduler._in_flight:
+            break
+        await asyncio.sleep(0.01)
+
+    assert email_service.refresh_mailboxes.await_count == 3
+    assert peak == 2
+
+async def test_failures_back_off_exponentially(scheduler, email_service):
+    """Failed syncs double the delay up to max_backoff; a success resets it."""
+    await scheduler._load_users()
+    scheduler._slots = asyncio.Semaphore(1)
+    email_service.refresh_mailboxes.side_effect = Exception("auth failed")
+
+    delays = []
+    for _ in range(4):
+        await scheduler._sync_user("u1")
+        delays.append(round(scheduler._next_sync["u1"] - scheduler._last_sync["u1"]))
+    assert delays == [120, 240, 300, 300]
+
+    email_service.refresh_mailboxes.side_effect = None
+    email_service.refresh_mailboxes.return_value = {"imap_error": "No token found for user"}
+    await scheduler._sync_user("u1")
+    assert scheduler._failures["u1"] == 5
+
+    email_service.refresh_mailboxes.return_value = {}
+    await scheduler._sync_user("u1")
+    assert "u1" not in scheduler._failures
+    assert round(scheduler._next_sync["u1"] - scheduler._last_sync["u1"]) == 60
+
+async def test_requests_are_coalesced(scheduler):
+    """A request right after a sync waits for min_interval instead of syncing again."""
+    await scheduler._load_users()
+    scheduler._slots = asyncio.Semaphore(1)
+    await scheduler._sync_user("u1")
+
+    scheduler.request_sync("u1")
+
+    assert scheduler._next_sync["u1"] == pytest.approx(scheduler._last_sync["u1"] + 30, abs=0.1)
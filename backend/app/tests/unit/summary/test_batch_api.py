@@ -0,0 +1,76 @@
+"""
+Tests for Batch API summarization against the stub Batch API server.
+"""
+import asyncio
+import pytest
+
+from app.models import EmailSchema
+from app.services.summarization.batch_api import run_batch_job
+from app.services.summarization.providers.openai.openai import OpenAIEmailSummarizer
+from app.services.summarization.types import ProcessingStrategy
+from app.tests.batch_api_stub import BatchApiStub, summary_completion
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def stub():
+    """Batch API stub whose jobs complete on the second status check."""
+    return BatchApiStub(polls_until_complete=2)
+
+def _request(text: str) -> dict:
+    """Chat completion request body with a user message."""
+    return {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": text}]}
+
+# =============================================================================
+# Batch Job Tests
+# =============================================================================
+
+async def test_batch_job_returns_responses_in_request_order(stub):
+    """Responses are matched to requests by custom_id; failed requests give None."""
+    def respond(body):
+        if body["messages"][-1]["content"] == "fail":
+            raise RuntimeError("model error")
+        return summary_completion(body)
+    stub.respond = respond
+
+    responses = await run_batch_job(stub.client(), [_request("one"), _request("fail"), _request("three")], poll_interval=0)
+
+    assert responses[1] is None
+    assert "Summary of one" in responses[0]["choices"][0]["message"]["content"]
+    assert "Summary of three" in responses[2]["choices"][0]["message"]["content"]
+    (batch,) = stub.batches.values()
+    assert batch["status"] == "completed" and batch["completion_window"] == "24h"
+
+async def test_cancelled_job_is_cancelled_at_provider():
+    """Cancelling the caller while polling cancels the batch."""
+    stub = BatchApiStub(polls_until_complete=1000)
+    task = asyncio.create_task(run_batch_job(stub.client(), [_request("one")], poll_interval=0.01))
+    await asyncio.sleep(0.1)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    (batch,) = stub.batches.values()
+    assert batch["status"] == "cancelled"
+
+async def test_offline_strategy_summarizes_through_batch_api(stub):
+    """Summaries of the OFFLINE strategy come from one Batch API job."""
+    summarizer = OpenAIEmailSummarizer(api_key="test_api_key")
+    summarizer._backend.client = stub.client()
+    summarizer._backend.batch_poll_interval = 0
+    emails = [
+        EmailSchema(google_id="user123", email_id=str(i), sender="a@example.com", recipients=["b@example.com"],
+                    subject=f"Subject {i}", body=f"Body {i}")
+        for i in range(3)
+    ]
+
+    summaries = await summarizer.summarize(emails, strategy=ProcessingStrategy.OFFLINE)
+
+    assert [s.email_id for s in summaries] == ["0", "1", "2"]
+    assert [s.summary_text for s in summaries] == ["Summary of Body 0", "Summary of Body 1", "Summary of Body 2"]
+    assert all(s.google_id == "user123" and s.keywords == ["stub"] for s in summaries)
+    assert len(stub.batches) == 1
+    assert summarizer.metrics[-1].batch_size == 3
@@ -0,0 +1,136 @@
+"""
+Tests for the adaptive concurrency limiter of LLM provider requests.
+"""
+import asyncio
+import pytest
+import httpx
+from openai import APITimeoutError, BadRequestError, RateLimitError
+from tenacity import RetryCallState, wait_fixed
+
+from app.services.summarization.concurrency import AdaptiveConcurrencyLimiter, retry_after, wait_retry_after
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _error(cls, status: int, headers=None):
+    """A provider error with the given response status and headers."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return cls("error", response=httpx.Response(status, headers=headers or {}, request=request), body=None)
+
+async def _run(limiter: AdaptiveConcurrencyLimiter, error=None):
+    """Send one request through the limiter, optionally failing with an error."""
+    try:
+        async with limiter.slot():
+            if error:
+                raise error
+    except Exception:
+        pass
+
+# =============================================================================
+# Limit Tests
+# =============================================================================
+
+async def test_requests_in_flight_are_limited():
+    """No more requests than the limit run at once; the rest wait for a slot."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=2, max_limit=2)
+    running = peak = 0
+
+    async def request():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[request() for _ in range(6)])
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+async def test_limit_grows_while_healthy():
+    """Successes with steady latency raise the limit additively, up to the maximum."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=2, max_limit=4)
+
+    for _ in range(4):
+        limiter.on_success(1.0)
+    assert 2 < limiter.limit < 4
+
+    for _ in range(50):
+        limiter.on_success(1.0)
+    assert limiter.limit == 4
+
+async def test_rate_limit_backs_off_once_per_burst():
+    """A rate limit halves the limit; further failures of the same burst do not."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+    limiter.on_success(10.0)
+
+    await _run(limiter, _error(RateLimitError, 429))
+    await _run(limiter, _error(RateLimitError, 429))
+
+    assert limiter.limit == 4
+
+async def test_overload_backs_off_and_client_errors_do_not():
+    """Timeouts and server errors lower the limit; invalid requests leave it alone."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+
+    await _run(limiter, _error(BadRequestError, 400))
+    assert limiter.limit == 8
+
+    await _run(limiter, APITimeoutError(request=httpx.Request("POST", "https://api.openai.com")))
+    assert limiter.limit == 4
+
+async def test_rising_latency_backs_off():
+    """Latency well above its long-term level counts as congestion."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+    for _ in range(10):
+        limiter.on_success(0.01)
+
+    for _ in range(10):
+        limiter.on_success(0.2)
+
+    assert limiter.limit < 8
+
+async def test_retry_after_pauses_requests():
+    """Requests wait out the Retry-After of a rate limit before being sent."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4)
+    await _run(limiter, _error(RateLimitError, 429, {"retry-after-ms": "50"}))
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await _run(limiter)
+
+    assert loop.time() - start >= 0.04
+
+# =============================================================================
+# Retry-After Tests
+# =============================================================================
+
+@pytest.mark.parametrize("headers,expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "3"}, 3.0),
+    ({"retry-after": "3600"}, 120.0),
+    ({"retry-after": "soon"}, None),
+    ({}, None),
+])
+def test_retry_after_is_read_from_headers(headers, expected):
+    """Retry-After is read in milliseconds or seconds and capped."""
+    assert retry_after(_error(RateLimitError, 429, headers)) == expected
+
+def test_retry_after_accepts_http_dates():
+    """Retry-After given as an HTTP date is converted to a delay."""
+    delay = retry_after(_error(RateLimitError, 429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+
+    assert delay == 0.0
+
+def test_retry_wait_prefers_retry_after():
+    """The retry wait follows Retry-After and otherwise falls back."""
+    wait = wait_retry_after(wait_fixed(7))
+    state = RetryCallState(None, None, (), {})
+
+    state.set_exception((RateLimitError, _error(RateLimitError, 429, {"retry-after": "2"}), None))
+    assert wait(state) == 2.0
+
+    state.set_exception((RateLimitError, _error(RateLimitError, 429), None))
+    assert wait(state) == 7
@@ -0,0 +1,70 @@
+"""
+Tests for summarizer content preparation.
+"""
+import pytest
+
+from app.services.summarization import content
+from app.services.summarization.content import (
+    TRUNCATION_MARKER,
+    TokenCounter,
+    prepare_body,
+    strip_quoted_history,
+    strip_signature,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def estimating_counter(monkeypatch):
+    """Token counter that estimates from the text length, as without tiktoken."""
+    monkeypatch.setattr(content, "tiktoken", None)
+    content._get_encoding.cache_clear()
+    yield TokenCounter("gpt-4o-mini")
+    content._get_encoding.cache_clear()
+
+# =============================================================================
+# Stripping Tests
+# =============================================================================
+
+@pytest.mark.parametrize("reply", [
+    "Sounds good, see you then.\n\nOn Mon, Jan 6, 2025 at 9:14 AM Alice Smith <alice@example.com> wrote:\n> Lunch at noon?\n",
+    "Sounds good, see you then.\n\nOn Mon, Jan 6, 2025 at 9:14 AM Alice Smith\n<alice@example.com> wrote:\n\nLunch at noon?",
+    "Sounds good, see you then.\n\n-----Original Message-----\nFrom: Alice\nSent: Monday\nLunch at noon?",
+    "Sounds good, see you then.\n\nFrom: Alice Smith <alice@example.com>\nSent: Monday, January 6, 2025\nLunch at noon?",
+    "Sounds good,\n> Lunch at noon?\nsee you then.",
+])
+def test_quoted_history_is_removed(reply):
+    """Reply headers of common clients start the quoted history, and quoted lines are dropped."""
+    assert strip_quoted_history(reply).split() == "Sounds good, see you then.".split()
+
+def test_quote_only_message_is_kept():
+    """A body that is only quoted text is left as is."""
+    assert strip_quoted_history("> Lunch at noon?") == "> Lunch at noon?"
+
+def test_signature_is_removed():
+    """Text after a signature delimiter and mobile sign-offs are dropped."""
+    body = "Report attached.\n\nSent from my iPhone\n-- \nBob Jones\nHead of Sales"
+
+    assert strip_signature(body).strip() == "Report attached."
+
+# =============================================================================
+# Budget Tests
+# =============================================================================
+
+def test_body_within_budget_is_unchanged(estimating_counter):
+    """Bodies within the budget are only cleaned up."""
+    assert prepare_body("<div><p>Hello</p><p>team</p></div>", estimating_counter, 100) == "Hello\nteam"
+
+def test_truncation_is_deterministic_and_within_budget(estimating_counter):
+    """Long bodies keep their beginning, end with the marker and fit the budget."""
+    body = " ".join(f"word{i}" for i in range(2000))
+
+    first = prepare_body(body, estimating_counter, 50)
+
+    assert first == prepare_body(body, estimating_counter, 50)
+    assert first.startswith("word0 word1 ")
+    assert first.endswith(TRUNCATION_MARKER)
+    assert estimating_counter.count(first) <= 50
+    assert not first[:-len(TRUNCATION_MARKER)].endswith("word")
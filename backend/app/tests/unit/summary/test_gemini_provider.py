@@ -0,0 +1,98 @@
+"""
+Tests for the Gemini summarization provider.
+"""
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from google.genai import errors
+from tenacity import wait_none
+
+from app.services.summarization.concurrency import AdaptiveConcurrencyLimiter
+from app.services.summarization.providers.google.google import GeminiBackend, GeminiEmailSummarizer
+from app.services.summarization.providers.google.prompts import GeminiPromptManager
+from app.services.summarization.rate_limiter import RateLimiter
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _response(summary: str = "Summary") -> SimpleNamespace:
+    """A Gemini response holding a JSON summary."""
+    return SimpleNamespace(
+        text=json.dumps({"summary": summary, "keywords": ["k"]}),
+        usage_metadata=SimpleNamespace(total_token_count=50)
+    )
+
+@pytest.fixture
+def backend(monkeypatch):
+    """GeminiBackend with a mocked client, its own limiters and no retry waits."""
+    monkeypatch.setattr(GeminiBackend.generate_summary.retry, "wait", wait_none())
+    with patch("app.services.summarization.providers.google.google.create_genai_client"):
+        backend = GeminiBackend(api_key="test", prompt_manager=GeminiPromptManager())
+    backend._limiter = AdaptiveConcurrencyLimiter("Google/test", initial_limit=3, max_limit=3)
+    backend._rate_limiter = RateLimiter("Google", 0, 0)
+    return backend
+
+# =============================================================================
+# Backend Tests
+# =============================================================================
+
+async def test_batch_runs_concurrently_within_limit(backend):
+    """A batch is summarized concurrently, never with more calls in flight than the limit."""
+    running = peak = 0
+
+    async def generate_content(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return _response(kwargs["contents"].splitlines()[-1])
+
+    backend.async_client.models.generate_content = generate_content
+
+    results = await backend.batch_generate_summaries([f"email {i}" for i in range(8)])
+
+    assert peak == 3
+    assert [summary for summary, _ in results] == [f"email {i}" for i in range(8)]
+
+async def test_transient_errors_are_retried(backend):
+    """Server errors are retried and the call succeeds once the API recovers."""
+    calls = MagicMock(side_effect=[errors.ServerError(503, {"error": {"message": "overloaded"}}), _response()])
+
+    async def generate_content(**kwargs):
+        return calls()
+
+    backend.async_client.models.generate_content = generate_content
+
+    assert await backend.generate_summary("content") == ("Summary", ["k"])
+    assert calls.call_count == 2
+
+async def test_client_errors_are_not_retried(backend):
+    """Invalid requests fail at once instead of being retried."""
+    calls = MagicMock(side_effect=errors.ClientError(400, {"error": {"message": "bad request"}}))
+
+    async def generate_content(**kwargs):
+        return calls()
+
+    backend.async_client.models.generate_content = generate_content
+
+    with pytest.raises(errors.ClientError):
+        await backend.generate_summary("content")
+    assert calls.call_count == 1
+
+# =============================================================================
+# Summarizer Tests
+# =============================================================================
+
+def test_summaries_belong_to_the_user():
+    """Summaries created by the Gemini summarizer carry the user's Google ID."""
+    with patch("app.services.summarization.providers.google.google.create_genai_client"):
+        summarizer = GeminiEmailSummarizer(api_key="test")
+
+    summary = summarizer.create_summary("email-1", "Summary", ["k"], "google-1")
+
+    assert summary.google_id == "google-1"
+    assert summary.model_info["provider"] == "Google"
@@ -1,8 +1,10 @@
 import pytest
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.models import EmailSchema
+from app.services.summarization import close_summarizers, get_summarizer
 from app.services.summarization.providers.openrouter.openrouter import OpenRouterEmailSummarizer, OpenRouterBackend
 from app.services.summarization.providers.openrouter.prompts import OpenRouterPromptManager
 from app.utils.config import PromptVersion
@@ -34,12 +36,19 @@ async def test_summarizer_prepare_content(summarizer: OpenRouterEmailSummarizer,
     assert "Body:\nThis is a test email body." in content
 
 @pytest.mark.asyncio
-@patch('app.services.summarization.providers.openrouter.openrouter.AsyncOpenAI')
-async def test_backend_generate_summary_success(mock_async_openai, email_schema_fixture: EmailSchema):
+async def test_summarizer_prepare_content_converts_html(summarizer: OpenRouterEmailSummarizer, email_schema_fixture: EmailSchema):
+    """Test that HTML bodies are sent as compact plain text."""
+    email = email_schema_fixture.model_copy(update={"body": '<div style="x"><p>Hello&nbsp;<b>team</b></p>\n\n<p>Agenda</p></div>'})
+    content = await summarizer.prepare_content(email)
+    assert content.endswith("Body:\nHello team\nAgenda")
+
+@pytest.mark.asyncio
+@patch('app.services.summarization.providers.openrouter.openrouter.create_openai_client')
+async def test_backend_generate_summary_success(mock_create_client, email_schema_fixture: EmailSchema):
     """Test successful summary generation with valid JSON response."""
     # Mock the OpenAI client
     mock_client = MagicMock()
-    mock_async_openai.return_value = mock_client
+    mock_create_client.return_value = mock_client
 
     # Mock the response from chat.completions.create
     mock_completion = MagicMock()
@@ -65,12 +74,12 @@ async def test_backend_generate_summary_success(mock_async_openai, email_schema_
 
 
 @pytest.mark.asyncio
-@patch('app.services.summarization.providers.openrouter.openrouter.AsyncOpenAI')
-async def test_backend_generate_summary_json_error(mock_async_openai):
+@patch('app.services.summarization.providers.openrouter.openrouter.create_openai_client')
+async def test_backend_generate_summary_json_error(mock_create_client):
     """Test summary generation with a non-JSON response."""
     # Mock the OpenAI client
     mock_client = MagicMock()
-    mock_async_openai.return_value = mock_client
+    mock_create_client.return_value = mock_client
 
     # Mock a non-JSON response
     mock_completion = MagicMock()
@@ -89,4 +98,21 @@ async def test_backend_generate_summary_json_error(mock_async_openai):
     # Assertions for fallback behavior
     assert summary == "This is just a plain text summary."
     assert keywords == []
-    mock_client.chat.completions.create.assert_called_once() 
\ No newline at end of file
+    mock_client.chat.completions.create.assert_called_once() 
+@pytest.mark.asyncio
+async def test_get_summarizer_reuses_summarizer_until_closed():
+    """Requests with the same settings share one summarizer and client until shutdown."""
+    settings = SimpleNamespace(
+        summarizer_provider="openrouter", summarizer_model=None, summarizer_prompt_version=PromptVersion.V1,
+        summarizer_batch_threshold=10, summarizer_input_token_budget=2000, summarizer_pack_token_budget=6000, summarizer_batch_poll_interval=60.0,
+        openai_api_key=None, google_api_key=None, openrouter_api_key="test_api_key"
+    )
+
+    first = await get_summarizer(settings)
+    assert await get_summarizer(settings) is first
+    assert await get_summarizer(SimpleNamespace(**{**vars(settings), "summarizer_batch_threshold": 5})) is not first
+
+    await close_summarizers()
+    assert first._backend.client.is_closed()
+    assert await get_summarizer(settings) is not first
+    await close_summarizers()
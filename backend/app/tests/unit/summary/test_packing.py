@@ -0,0 +1,97 @@
+"""
+Tests for packed batch summarization.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.summarization import content
+from app.services.summarization.content import TokenCounter
+from app.services.summarization.packing import pack_contents, parse_packed_response, summarize_packed
+from app.services.summarization.providers.openrouter.openrouter import OpenRouterBackend
+from app.services.summarization.providers.openrouter.prompts import OpenRouterPromptManager
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def token_counter(monkeypatch):
+    """Token counter that estimates from the text length, as without tiktoken."""
+    monkeypatch.setattr(content, "tiktoken", None)
+    content._get_encoding.cache_clear()
+    yield TokenCounter("gpt-4o-mini")
+    content._get_encoding.cache_clear()
+
+def _response(*items) -> str:
+    """A packed response holding the given items."""
+    return json.dumps({"summaries": [
+        {"id": position, "summary": f"Summary {position}", "keywords": ["k"]} for position in items
+    ]})
+
+# =============================================================================
+# Packing Tests
+# =============================================================================
+
+def test_contents_are_packed_within_budget(token_counter):
+    """Consecutive contents share a pack up to the budget; oversized contents are packed alone."""
+    contents = ["a" * 400, "b" * 400, "c" * 400, "d" * 4000, "e" * 40]
+
+    assert pack_contents(contents, token_counter, 250) == [[0, 1], [2], [3], [4]]
+    assert pack_contents(contents, token_counter, 0) == [[0], [1], [2], [3], [4]]
+
+def test_invalid_items_are_dropped_from_packed_response():
+    """Items with an unknown id, a duplicate id, no summary or bad keywords are not returned."""
+    text = json.dumps({"summaries": [
+        {"id": 1, "summary": " First ", "keywords": ["a"]},
+        {"id": "2", "summary": "Second", "keywords": ["b"]},
+        {"id": 2, "summary": "Duplicate", "keywords": []},
+        {"id": 3, "summary": "", "keywords": []},
+        {"id": 4, "summary": "Fourth", "keywords": "d"},
+        {"id": 9, "summary": "Unknown", "keywords": []},
+        "noise",
+    ]})
+
+    assert parse_packed_response(text, 4) == {0: ("First", ["a"]), 1: ("Second", ["b"])}
+    assert parse_packed_response("not json", 4) == {}
+    assert parse_packed_response('{"summaries": {}}', 4) == {}
+
+async def test_only_failed_items_are_rerun(token_counter):
+    """Items missing from a packed response are summarized on their own; the rest keep the pack result."""
+    generate_pack = AsyncMock(return_value=_response(1, 3))
+    generate_single = AsyncMock(side_effect=lambda text: (f"Single {text}", []))
+
+    results = await summarize_packed(["one", "two", "three"], generate_pack, generate_single, token_counter, 1000)
+
+    generate_pack.assert_awaited_once_with(["one", "two", "three"])
+    generate_single.assert_awaited_once_with("two")
+    assert results == [("Summary 1", ["k"]), ("Single two", []), ("Summary 3", ["k"])]
+
+async def test_failed_pack_request_falls_back_to_single_requests(token_counter):
+    """A packed request that fails is summarized email by email."""
+    generate_pack = AsyncMock(side_effect=RuntimeError("context length exceeded"))
+    generate_single = AsyncMock(side_effect=lambda text: (f"Single {text}", []))
+
+    results = await summarize_packed(["one", "two"], generate_pack, generate_single, token_counter, 1000)
+
+    assert results == [("Single one", []), ("Single two", [])]
+
+@patch('app.services.summarization.providers.openrouter.openrouter.create_openai_client')
+async def test_backend_sends_one_request_per_pack(mock_create_client, token_counter):
+    """The backend sends the system prompt once for a pack of emails."""
+    completion = MagicMock()
+    completion.choices = [MagicMock()]
+    completion.choices[0].message.content = _response(1, 2, 3)
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=completion)
+    mock_create_client.return_value = mock_client
+    backend = OpenRouterBackend(api_key="test_key", prompt_manager=OpenRouterPromptManager())
+    backend._token_counter = token_counter
+
+    results = await backend.batch_generate_summaries(["one", "two", "three"])
+
+    assert [summary for summary, _ in results] == ["Summary 1", "Summary 2", "Summary 3"]
+    mock_client.chat.completions.create.assert_awaited_once()
+    kwargs = mock_client.chat.completions.create.await_args.kwargs
+    assert kwargs["max_tokens"] == 3 * backend.max_tokens
+    assert '<email id="3">\nthree\n</email>' in kwargs["messages"][1]["content"]
@@ -0,0 +1,145 @@
+"""
+Tests for the RPM and TPM rate limiter of LLM provider requests.
+"""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.summarization.rate_limiter import (
+    FairQueue,
+    InMemoryRateLimitStore,
+    RateLimiter,
+    rate_limit_user
+)
+
+# =============================================================================
+# Bucket Tests
+# =============================================================================
+
+async def test_budget_of_a_minute_is_available_at_once():
+    """A minute's requests are reserved without waiting; the next one waits its share of a minute."""
+    store = InMemoryRateLimitStore()
+
+    waits = [await store.reserve("OpenAI", 1, 0, 60, 0) for _ in range(60)]
+    assert waits == [0.0] * 60
+
+    assert await store.reserve("OpenAI", 1, 0, 60, 0) == pytest.approx(1.0, abs=0.1)
+
+async def test_token_budget_is_limited_and_refunded():
+    """Tokens over the TPM budget wait; returning unused tokens frees the budget again."""
+    store = InMemoryRateLimitStore()
+
+    assert await store.reserve("OpenAI", 1, 1000, 0, 1000) == 0.0
+    await store.adjust("OpenAI", -500, 1000)
+    assert await store.reserve("OpenAI", 1, 500, 0, 1000) == 0.0
+    assert await store.reserve("OpenAI", 1, 500, 0, 1000) == pytest.approx(30.0, abs=0.1)
+
+async def test_keys_have_separate_buckets():
+    """Each provider has its own budget."""
+    store = InMemoryRateLimitStore()
+    await store.reserve("OpenAI", 10, 0, 10, 0)
+
+    assert await store.reserve("OpenRouter", 1, 0, 10, 0) == 0.0
+
+# =============================================================================
+# Limiter Tests
+# =============================================================================
+
+async def test_estimate_is_reconciled_with_usage():
+    """The difference between the estimated and the reported tokens is settled afterwards."""
+    store = MagicMock(reserve=AsyncMock(return_value=0.0), adjust=AsyncMock())
+    limiter = RateLimiter("OpenAI", 500, 10000, store=lambda: store)
+
+    async with limiter.request(300) as reservation:
+        reservation.record_usage(SimpleNamespace(total_tokens=120))
+
+    store.reserve.assert_awaited_once_with("OpenAI", 1, 300, 500, 10000)
+    store.adjust.assert_awaited_once_with("OpenAI", -180, 10000)
+
+async def test_request_waits_for_budget():
+    """A request is sent only after the wait returned by the store."""
+    store = MagicMock(reserve=AsyncMock(return_value=0.05), adjust=AsyncMock())
+    limiter = RateLimiter("OpenAI", 500, 0, store=lambda: store)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with limiter.request(100):
+        pass
+
+    assert loop.time() - start >= 0.04
+
+async def test_failing_shared_store_falls_back_to_local_buckets():
+    """Requests still go out, limited per process, when the shared store is unavailable."""
+    def unavailable():
+        raise RuntimeError("Database not connected")
+    limiter = RateLimiter("OpenAI", 500, 10000, store=unavailable)
+
+    async with limiter.request(100) as reservation:
+        reservation.record_usage(SimpleNamespace(total_tokens=100))
+
+    assert "OpenAI" in limiter._local._buckets
+
+async def test_disabled_limits_skip_the_store():
+    """Without RPM and TPM limits no budget is reserved."""
+    store = MagicMock(reserve=AsyncMock(return_value=0.0), adjust=AsyncMock())
+    limiter = RateLimiter("OpenAI", 0, 0, store=lambda: store)
+
+    async with limiter.request(100):
+        pass
+
+    store.reserve.assert_not_awaited()
+
+async def test_requests_are_admitted_round_robin_across_users():
+    """A user's batch does not hold back another user's request queued behind it."""
+    admitted = []
+    release_first = asyncio.Event()
+
+    async def reserve(key, requests, tokens, rpm, tpm):
+        admitted.append(tokens)
+        if len(admitted) == 1:
+            await release_first.wait()
+        return 0.0
+
+    store = MagicMock(reserve=reserve, adjust=AsyncMock())
+    limiter = RateLimiter("OpenAI", 500, 0, store=lambda: store)
+
+    async def request(user, tokens):
+        with rate_limit_user(user):
+            async with limiter.request(tokens):
+                pass
+
+    tasks = [asyncio.create_task(request("alice", 1))]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(request("alice", tokens)) for tokens in (2, 3, 4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("bob", 10)))
+    await asyncio.sleep(0)
+    release_first.set()
+    await asyncio.gather(*tasks)
+
+    assert admitted == [1, 2, 10, 3, 4]
+
+async def test_cancelled_waiter_does_not_block_the_queue():
+    """A request cancelled while queued is skipped when turns are handed out."""
+    queue = FairQueue()
+    order = []
+    release_first = asyncio.Event()
+
+    async def take_turn(user):
+        async with queue.turn(user):
+            order.append(user)
+            if user == "alice":
+                await release_first.wait()
+
+    first = asyncio.create_task(take_turn("alice"))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(take_turn("bob"))
+    last = asyncio.create_task(take_turn("carol"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    release_first.set()
+    await asyncio.gather(first, last, cancelled, return_exceptions=True)
+
+    assert order == ["alice", "carol"]
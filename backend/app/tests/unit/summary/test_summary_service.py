@@ -0,0 +1,99 @@
+"""
+Tests for the SummaryService class.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models import EmailSchema, SummarySchema
+from app.services.summarization import summary_service as summary_service_module
+from app.services.summarization.providers.openrouter.openrouter import OpenRouterEmailSummarizer
+from app.services.summarization.summary_service import SummaryService
+from app.services.summarization.types import ProcessingStrategy
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+NEWSLETTER = "<div><p>This week: three new features.</p><a href='https://x.example/c?u={user}'>Read</a></div>"
+
+def _email(email_id: str, google_id: str, body: str = NEWSLETTER) -> EmailSchema:
+    """A loaded email of the newsletter sent to a user."""
+    return EmailSchema(
+        google_id=google_id, email_id=email_id, sender="news@example.com", recipients=[f"{google_id}@example.com"],
+        subject="Weekly update", body=body.format(user=google_id)
+    )
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    """OpenRouter summarizer whose model returns a summary per email."""
+    summarizer = OpenRouterEmailSummarizer(api_key="test_api_key")
+    async def summarize(emails, strategy=ProcessingStrategy.ADAPTIVE):
+        return [summarizer.create_summary(e.email_id, f"Summary of {e.email_id}", ["features"], e.google_id) for e in emails]
+    monkeypatch.setattr(summarizer, "summarize", AsyncMock(side_effect=summarize))
+    return summarizer
+
+@pytest.fixture
+def cache_repository():
+    """Summary cache repository backed by a dict."""
+    entries = {}
+    repository = MagicMock()
+    repository.entries = entries
+    repository.find_by_hashes = AsyncMock(side_effect=lambda hashes: {h: entries[h] for h in hashes if h in entries})
+    repository.save_many = AsyncMock(side_effect=lambda new: entries.update((e.content_hash, e) for e in new))
+    return repository
+
+@pytest.fixture
+def summary_service(monkeypatch, cache_repository):
+    """SummaryService with mocked repositories."""
+    monkeypatch.setattr(summary_service_module, "get_email_service", MagicMock())
+    return SummaryService(summary_repository=MagicMock(), summary_cache_repository=cache_repository)
+
+# =============================================================================
+# Summary Cache Tests
+# =============================================================================
+
+async def test_identical_content_is_summarized_once_across_users(summary_service, summarizer, cache_repository):
+    """The same newsletter is summarized by the model once, and each user owns a copy of its summary."""
+    first = await summary_service._summarize_with_cache(
+        [_email("a1", "alice")], summarizer, "alice", ProcessingStrategy.SINGLE
+    )
+    second = await summary_service._summarize_with_cache(
+        [_email("b1", "bob"), _email("b2", "bob")], summarizer, "bob", ProcessingStrategy.ADAPTIVE
+    )
+
+    summarizer.summarize.assert_awaited_once()
+    assert len(cache_repository.entries) == 1
+    assert [(s.email_id, s.google_id, s.summary_text) for s in first + second] == [
+        ("a1", "alice", "Summary of a1"), ("b1", "bob", "Summary of a1"), ("b2", "bob", "Summary of a1")
+    ]
+    assert all(isinstance(s, SummarySchema) for s in second)
+
+async def test_duplicates_in_a_batch_are_sent_once(summary_service, summarizer):
+    """Emails with the same content in one batch share one model summary."""
+    emails = [_email("b1", "bob"), _email("b2", "bob"), _email("b3", "bob", body="<p>Invoice attached</p>")]
+
+    summaries = await summary_service._summarize_with_cache(emails, summarizer, "bob", ProcessingStrategy.ADAPTIVE)
+
+    sent = summarizer.summarize.await_args.args[0]
+    assert [e.email_id for e in sent] == ["b1", "b3"]
+    assert [s.summary_text for s in summaries] == ["Summary of b1", "Summary of b1", "Summary of b3"]
+
+def test_cache_key_depends_on_prompt_version_and_model(summarizer):
+    """Summaries are only shared between the same sender, prompt version and model."""
+    email = _email("a1", "alice")
+    key = summarizer.content_hash(email)
+
+    summarizer._prompt_manager.prompt_version = "v0"
+    assert summarizer.content_hash(email) != key
+    assert summarizer.content_hash(_email("b1", "bob").model_copy(update={"sender": "other@example.com"})) != key
+
+async def test_cache_failure_falls_back_to_the_model(summary_service, summarizer, cache_repository):
+    """An unavailable cache does not prevent summarizing."""
+    cache_repository.find_by_hashes.side_effect = RuntimeError("cache down")
+    cache_repository.save_many.side_effect = RuntimeError("cache down")
+
+    summaries = await summary_service._summarize_with_cache(
+        [_email("a1", "alice")], summarizer, "alice", ProcessingStrategy.SINGLE
+    )
+
+    assert [s.summary_text for s in summaries] == ["Summary of a1"]
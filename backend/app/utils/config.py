@@ -54,6 +54,14 @@ class ProviderModel(str, Enum):
             cls.OR_GEMINI_2_5_FLASH,
         ]
 
+class IMAPTransport(str, Enum):
+    THREADED = "threaded" # Blocking IMAPClient sessions in the threadpool
+    ASYNCIO = "asyncio" # AsyncIMAPClient sessions on the event loop
+
+class RateLimitStore(str, Enum):
+    MONGODB = "mongodb" # Buckets shared by all workers in the rate_limits collection
+    MEMORY = "memory" # Buckets local to the process, for development and tests
+
 class PromptVersion(str, Enum):
     V1 = "v1"
     V2 = "v2"
@@ -70,7 +78,42 @@ class Settings(BaseSettings):
     
     # Email
     email_account: str
-    
+
+    # IMAP
+    imap_host: str = "imap.gmail.com"
+    imap_port: int = 993
+    imap_ssl: bool = True
+    imap_transport: IMAPTransport = IMAPTransport.THREADED
+    imap_fetch_chunk_size: int = 25 # UIDs per multi-message FETCH command
+    imap_headers_only: bool = False # Ingest ENVELOPE/BODYSTRUCTURE only and fetch bodies on first read
+    imap_flag_sync: bool = True # Sync read state and deletions via CONDSTORE/QRESYNC when supported
+    imap_pool_max_per_account: int = 5 # Gmail allows 15 concurrent IMAP connections per account
+    imap_pool_idle_timeout: int = 300 # Seconds before an unused pooled connection is closed
+    imap_sync_folders: List[str] = ["INBOX"] # Folders/labels synced on refresh, e.g. '["INBOX", "Work"]'
+    imap_folder_concurrency: int = 3 # Folders synced at once per account, each on its own pooled connection
+    imap_pipeline_depth: int = 2 # Chunks buffered between the fetch, parse and persist stages of a sync
+    imap_parse_processes: int = 0 # Worker processes parsing synced messages; 0 parses in a thread of the API process
+    imap_parse_task_size: int = 10 # Messages per task handed to a parse worker process
+
+    # Background mailbox sync
+    mailbox_sync_enabled: bool = True # Sync mailboxes in the background instead of inside GET /emails?refresh=true
+    mailbox_sync_concurrency: int = 10 # Mailboxes synced at once across all users
+    mailbox_sync_jitter: float = 0.1 # Each sync interval is randomly stretched or shrunk by up to this fraction
+    mailbox_sync_min_interval: int = 30 # Minimum seconds between two syncs of a user, also on request
+    mailbox_sync_max_backoff: int = 3600 # Maximum seconds between retries of a user whose sync keeps failing
+    mailbox_sync_scan_interval: int = 60 # Seconds between re-reading users and their fetch_frequency
+
+    # IMAP IDLE push
+    imap_idle_enabled: bool = True # Hold an IDLE connection per synced account to ingest new mail as it arrives
+    imap_idle_folder: str = "INBOX" # Folder watched with IDLE; other folders are only polled
+    imap_idle_max_connections: int = 100 # IDLE connections across all accounts; accounts over the cap are only polled
+    imap_idle_renew_interval: int = 1500 # Seconds before IDLE is re-issued, as servers may drop it after 30 minutes
+    imap_idle_max_failures: int = 5 # Connection failures in a row before an account falls back to polling
+    imap_idle_poll_interval: int = 1800 # Seconds between safety-net polls of accounts with a live IDLE connection
+
+    # Email content
+    tracker_blocklist_path: Optional[str] = None # File of tracker domains whose images are stripped; defaults to the bundled list
+
     # Database
     mongo_uri: str
     
@@ -93,6 +136,18 @@ class Settings(BaseSettings):
     summarizer_model: ProviderModel = ProviderModel.default_for_provider(summarizer_provider)
     summarizer_batch_threshold: int = 10
     summarizer_prompt_version: PromptVersion = PromptVersion.latest()
+    summarizer_input_token_budget: int = 2000 # Tokens of email body sent per summary, counted with the model's tokenizer
+    summarizer_pack_token_budget: int = 6000 # Tokens of email content summarized in one batch request; 0 sends one request per email
+    summarizer_batch_poll_interval: float = 60.0 # Seconds between status checks of Batch API jobs for backfills
+    summarizer_max_connections: int = 20 # Connections to the LLM provider per process, kept open between requests
+    summarizer_keepalive_expiry: float = 60.0 # Seconds an idle connection to the LLM provider is kept open
+    summarizer_initial_concurrency: int = 5 # Requests in flight per provider model before the adaptive limit has feedback
+    summarizer_max_concurrency: int = 50 # Upper bound of the adaptive limit of requests in flight per provider model
+    summarizer_rate_limit_rpm: int = 500 # Requests per minute allowed by the provider account; 0 disables the limit
+    summarizer_rate_limit_tpm: int = 200000 # Tokens per minute allowed by the provider account; 0 disables the limit
+    summarizer_rate_limit_store: RateLimitStore = RateLimitStore.MONGODB # Where the rate limit buckets are kept
+    summary_cache_enabled: bool = True # Reuse summaries of identical email bodies across users and re-sends
+    summary_cache_ttl: int = 2592000 # Seconds a cached summary is kept after it was last used (30 days)
     
     model_config = ConfigDict(env_file=".env", use_enum_values=True)
     
@@ -9,6 +9,7 @@ import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 # Internal imports
 from app.routers import emails_router, summaries_router, auth_router, user_router
@@ -57,10 +58,54 @@ async def shutdown_db_client():
     except Exception as e:
         raise RuntimeError("Failed to close database connection") from e
 
+# -------------------------------------------------------------------------
+# Background Mailbox Sync
+# -------------------------------------------------------------------------
+
+def start_mailbox_sync():
+    """
+    Starts syncing users' mailboxes in the background.
+    """
+    from app.utils.config import get_settings
+    if get_settings().mailbox_sync_enabled:
+        from app.services.database.factories import get_mailbox_sync_scheduler
+        get_mailbox_sync_scheduler().start()
+
+async def stop_mailbox_sync():
+    """
+    Stops the background mailbox sync, cancelling syncs in progress.
+    """
+    from app.services.database.factories import get_mailbox_sync_scheduler
+    if get_mailbox_sync_scheduler.cache_info().currsize:
+        await get_mailbox_sync_scheduler().stop()
+
+async def shutdown_imap_pool():
+    """
+    Logs out pooled IMAP connections and stops parse worker processes on shutdown.
+    """
+    from app.services.database.factories import get_email_service
+    if get_email_service.cache_info().currsize:
+        email_service = get_email_service()
+        # IMAPClient LOGOUTs block, so keep them off the event loop
+        await run_in_threadpool(email_service.connection_pool.close_all)
+        await email_service.async_connection_pool.close_all()
+        email_service.close_parse_pool()
+
+async def shutdown_summarizers():
+    """
+    Closes the connections of LLM provider clients on shutdown.
+    """
+    from app.services.summarization import close_summarizers
+    await close_summarizers()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await startup_db_client()
+    start_mailbox_sync()
     yield
+    await stop_mailbox_sync()
+    await shutdown_imap_pool()
+    await shutdown_summarizers()
     await shutdown_db_client()
 
 # -------------------------------------------------------------------------